@@ -0,0 +1,507 @@
+# benchmarks/fake_services.py
+# Deterministic local stand-ins for the OpenAI embeddings API and a Qdrant cluster
+
+import base64
+import hashlib
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+class FakeEmbedder:
+    """
+    Deterministic bag-of-words embedder.
+
+    Each token maps to a fixed pseudo-random unit vector (seeded by its hash)
+    and a text embeds to the normalized sum of its token vectors, so texts
+    that share words score as similar, much like a real embedding model.
+    """
+
+    def __init__(self, dim=1536):
+        self.dim = dim
+        self._tokens = {}
+        self._lock = threading.Lock()
+
+    def _token_vector(self, token):
+        with self._lock:
+            vector = self._tokens.get(token)
+            if vector is None:
+                seed = int.from_bytes(hashlib.sha256(token.encode("utf-8")).digest()[:8], "little")
+                vector = np.random.default_rng(seed).standard_normal(self.dim).astype(np.float32)
+                self._tokens[token] = vector
+            return vector
+
+    def embed(self, text, dim=None):
+        dim = dim or self.dim
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for token in TOKEN_PATTERN.findall(text.lower()):
+            vector += self._token_vector(token)
+        vector = vector[:dim]
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+class _FakeServer:
+    """Base class running a ThreadingHTTPServer on a free localhost port."""
+
+    def __init__(self, latency_ms=0.0):
+        self.latency = latency_ms / 1000.0
+        self.requests = 0
+        self._count_lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def handle(self, method, path, query, body):
+        """Return (status, payload) for a request. Implemented by subclasses."""
+        raise NotImplementedError
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _dispatch(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                body = json.loads(raw) if raw else {}
+                parsed = urlparse(self.path)
+
+                with server._count_lock:
+                    server.requests += 1
+                if server.latency:
+                    time.sleep(server.latency)
+
+                try:
+                    status, payload = server.handle(self.command, parsed.path, parse_qs(parsed.query), body)
+                except Exception as e:
+                    status, payload = 500, {"status": {"error": str(e)}}
+
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_PUT = do_DELETE = do_PATCH = _dispatch
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+class FakeOpenAIServer(_FakeServer):
+    """Serves POST /v1/embeddings with deterministic vectors."""
+
+    def __init__(self, latency_ms=0.0, dim=1536, embedder=None):
+        self.embedder = embedder or FakeEmbedder(dim)
+        super().__init__(latency_ms)
+
+    @property
+    def base_url(self):
+        return f"{self.url}/v1"
+
+    def handle(self, method, path, query, body):
+        if method != "POST" or path != "/v1/embeddings":
+            return 404, {"error": {"message": f"Unknown endpoint {method} {path}"}}
+
+        inputs = body["input"] if isinstance(body["input"], list) else [body["input"]]
+        if any(not isinstance(text, str) or not text for text in inputs):
+            return 400, {"error": {"message": "'input' must be non-empty strings", "type": "invalid_request_error"}}
+
+        data = []
+        for i, text in enumerate(inputs):
+            vector = self.embedder.embed(text, body.get("dimensions"))
+            if body.get("encoding_format") == "base64":
+                embedding = base64.b64encode(vector.astype("<f4").tobytes()).decode("ascii")
+            else:
+                embedding = vector.tolist()
+            data.append({"object": "embedding", "index": i, "embedding": embedding})
+
+        tokens = sum(len(text.split()) for text in inputs)
+        return 200, {
+            "object": "list",
+            "data": data,
+            "model": body.get("model"),
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+        }
+
+
+def _matches(payload, condition, point_id=None):
+    """Evaluate a Qdrant filter (or field or has_id condition) against a point."""
+    if "must" in condition or "should" in condition or "must_not" in condition:
+        must = condition.get("must") or []
+        should = condition.get("should") or []
+        must_not = condition.get("must_not") or []
+        return (
+            all(_matches(payload, c, point_id) for c in must)
+            and (not should or any(_matches(payload, c, point_id) for c in should))
+            and not any(_matches(payload, c, point_id) for c in must_not)
+        )
+    if "has_id" in condition:
+        return point_id in condition["has_id"]
+    if "is_empty" in condition:
+        return payload.get(condition["is_empty"]["key"]) in (None, "", [])
+    if "key" in condition:
+        value = payload.get(condition["key"])
+        match = condition.get("match") or {}
+        if "value" in match:
+            return value == match["value"]
+        if "any" in match:
+            return value in match["any"]
+        if "except" in match:
+            return value not in match["except"]
+    return True
+
+
+def _project(payload, with_payload):
+    if with_payload is True:
+        return payload
+    if not with_payload:
+        return None
+    if isinstance(with_payload, list):
+        return {k: v for k, v in payload.items() if k in with_payload}
+    if "include" in with_payload:
+        return {k: v for k, v in payload.items() if k in with_payload["include"]}
+    if "exclude" in with_payload:
+        return {k: v for k, v in payload.items() if k not in with_payload["exclude"]}
+    return payload
+
+
+class _Collection:
+    def __init__(self, config):
+        self.config = config
+        self.points = {}  # id -> (vectors dict, payload)
+        self._matrices = {}
+
+    def upsert(self, points):
+        for point in points:
+            vector = point.get("vector")
+            vectors = vector if isinstance(vector, dict) else {"": vector}
+            self.points[point["id"]] = ({k: np.asarray(v, dtype=np.float32) for k, v in vectors.items()},
+                                        point.get("payload") or {})
+        self._matrices = {}
+
+    def delete(self, ids):
+        for point_id in ids:
+            self.points.pop(point_id, None)
+        self._matrices = {}
+
+    def matrix(self, name):
+        if name not in self._matrices:
+            ids = [pid for pid, (vectors, _) in self.points.items() if name in vectors]
+            if ids:
+                matrix = np.stack([self.points[pid][0][name] for pid in ids])
+                norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+                norms[norms == 0] = 1.0
+                matrix = matrix / norms
+            else:
+                matrix = np.zeros((0, 0), dtype=np.float32)
+            self._matrices[name] = (ids, matrix)
+        return self._matrices[name]
+
+    def record(self, point_id, with_payload=True, with_vector=False, score=None):
+        vectors, payload = self.points[point_id]
+        record = {"id": point_id, "payload": _project(payload, with_payload)}
+        if with_vector:
+            if isinstance(with_vector, list):
+                record["vector"] = {k: vectors[k].tolist() for k in with_vector if k in vectors}
+            elif list(vectors) == [""]:
+                record["vector"] = vectors[""].tolist()
+            else:
+                record["vector"] = {k: v.tolist() for k, v in vectors.items()}
+        else:
+            record["vector"] = None
+        if score is not None:
+            record["version"] = 0
+            record["score"] = score
+        return record
+
+    def search(self, request):
+        query = request["vector"]
+        name = ""
+        if isinstance(query, dict):
+            name, query = query["name"], query["vector"]
+        ids, matrix = self.matrix(name)
+        if not ids:
+            return []
+
+        candidates = np.arange(len(ids))
+        query_filter = request.get("filter")
+        if query_filter:
+            candidates = np.array([i for i in candidates
+                                   if _matches(self.points[ids[i]][1], query_filter, ids[i])],
+                                  dtype=np.int64)
+            if not len(candidates):
+                return []
+
+        vector = np.asarray(query, dtype=np.float32)
+        vector = vector / (np.linalg.norm(vector) or 1.0)
+        scores = matrix[candidates] @ vector
+        limit = request.get("limit", 10)
+        offset = request.get("offset") or 0
+        order = np.argsort(-scores)[offset:offset + limit]
+        threshold = request.get("score_threshold")
+
+        return [
+            self.record(ids[candidates[i]], request.get("with_payload", False),
+                        request.get("with_vector", False), float(scores[i]))
+            for i in order
+            if threshold is None or scores[i] >= threshold
+        ]
+
+
+class FakeQdrantServer(_FakeServer):
+    """
+    In-memory subset of the Qdrant REST API used by this project.
+
+    Supports collection create/delete/exists/list/info, aliases, payload
+    indexes, upsert, set payload, delete, count, scroll, search and batch
+    search with exact cosine scoring and simple payload filters.
+    """
+
+    def __init__(self, latency_ms=0.0):
+        self.collections = {}
+        self.aliases = {}
+        self._lock = threading.Lock()
+        super().__init__(latency_ms)
+
+    def _ok(self, result):
+        return 200, {"result": result, "status": "ok", "time": 0.0}
+
+    def _not_found(self, name):
+        return 404, {"status": {"error": f"Not found: Collection `{name}` doesn't exist!"}, "time": 0.0}
+
+    def _collection_info(self, collection):
+        count = len(collection.points)
+        return {
+            "status": "green",
+            "optimizer_status": "ok",
+            "vectors_count": count,
+            "indexed_vectors_count": count,
+            "points_count": count,
+            "segments_count": 1,
+            "config": {
+                "params": {
+                    "vectors": collection.config.get("vectors"),
+                    "shard_number": 1,
+                    "replication_factor": 1,
+                    "write_consistency_factor": 1,
+                    "on_disk_payload": True,
+                },
+                "hnsw_config": {
+                    "m": 16, "ef_construct": 100, "full_scan_threshold": 10000,
+                    "max_indexing_threads": 0, "on_disk": False,
+                    **(collection.config.get("hnsw_config") or {}),
+                },
+                "optimizer_config": {
+                    "deleted_threshold": 0.2, "vacuum_min_vector_number": 1000,
+                    "default_segment_number": 0, "max_segment_size": None, "memmap_threshold": None,
+                    "indexing_threshold": 20000, "flush_interval_sec": 5,
+                    "max_optimization_threads": None,
+                    **(collection.config.get("optimizers_config") or {}),
+                },
+                "wal_config": {"wal_capacity_mb": 32, "wal_segments_ahead": 0},
+                "quantization_config": collection.config.get("quantization_config"),
+            },
+            "payload_schema": collection.config.get("payload_schema", {}),
+        }
+
+    def handle(self, method, path, query, body):
+        parts = [p for p in path.split("/") if p]
+
+        with self._lock:
+            if parts == ["collections"] and method == "GET":
+                names = list(self.collections) + list(self.aliases)
+                return self._ok({"collections": [{"name": n} for n in names]})
+
+            if parts == ["collections", "aliases"] and method == "POST":
+                for action in body.get("actions", []):
+                    if "create_alias" in action:
+                        spec = action["create_alias"]
+                        self.aliases[spec["alias_name"]] = spec["collection_name"]
+                    elif "delete_alias" in action:
+                        self.aliases.pop(action["delete_alias"]["alias_name"], None)
+                    elif "rename_alias" in action:
+                        spec = action["rename_alias"]
+                        self.aliases[spec["new_alias_name"]] = self.aliases.pop(spec["old_alias_name"])
+                return self._ok(True)
+
+            if parts == ["aliases"] and method == "GET":
+                return self._ok({"aliases": [
+                    {"alias_name": a, "collection_name": c} for a, c in self.aliases.items()
+                ]})
+
+            if len(parts) < 2 or parts[0] != "collections":
+                return 404, {"status": {"error": f"Unknown endpoint {method} {path}"}}
+
+            name = self.aliases.get(parts[1], parts[1])
+            rest = parts[2:]
+
+            if not rest:
+                if method == "PUT":
+                    self.collections[name] = _Collection(body)
+                    return self._ok(True)
+                if method == "DELETE":
+                    existed = self.collections.pop(name, None) is not None
+                    self.aliases = {a: c for a, c in self.aliases.items() if c != name}
+                    return self._ok(existed)
+                if method == "PATCH":
+                    if name not in self.collections:
+                        return self._not_found(name)
+                    for key, value in body.items():
+                        if isinstance(value, dict):
+                            self.collections[name].config.setdefault(key, {}).update(value)
+                    return self._ok(True)
+                if method == "GET":
+                    if name not in self.collections:
+                        return self._not_found(name)
+                    return self._ok(self._collection_info(self.collections[name]))
+
+            if rest == ["exists"]:
+                return self._ok({"exists": name in self.collections})
+
+            if name not in self.collections:
+                return self._not_found(name)
+            collection = self.collections[name]
+
+            if rest == ["index"] and method == "PUT":
+                schema = collection.config.setdefault("payload_schema", {})
+                schema[body["field_name"]] = {"data_type": body.get("field_schema", "keyword"), "points": 0}
+                return self._ok({"operation_id": 0, "status": "completed"})
+
+            if rest == ["points"] and method == "PUT":
+                collection.upsert(body.get("points", []))
+                return self._ok({"operation_id": 0, "status": "completed"})
+
+            if rest == ["points"] and method == "POST":
+                ids = [pid for pid in body.get("ids", []) if pid in collection.points]
+                return self._ok([
+                    collection.record(pid, body.get("with_payload", True), body.get("with_vector", False))
+                    for pid in ids
+                ])
+
+            if rest == ["points", "payload"] and method == "POST":
+                for pid in body.get("points", []):
+                    if pid in collection.points:
+                        collection.points[pid][1].update(body.get("payload") or {})
+                return self._ok({"operation_id": 0, "status": "completed"})
+
+            if rest == ["points", "delete"]:
+                if "points" in body:
+                    collection.delete(body["points"])
+                elif "filter" in body:
+                    collection.delete([pid for pid, (_, payload) in collection.points.items()
+                                       if _matches(payload, body["filter"], pid)])
+                return self._ok({"operation_id": 0, "status": "completed"})
+
+            if rest == ["points", "count"]:
+                query_filter = body.get("filter")
+                count = sum(1 for pid, (_, payload) in collection.points.items()
+                            if not query_filter or _matches(payload, query_filter, pid))
+                return self._ok({"count": count})
+
+            if rest == ["points", "scroll"]:
+                query_filter = body.get("filter")
+                ids = sorted((pid for pid, (_, payload) in collection.points.items()
+                              if not query_filter or _matches(payload, query_filter, pid)), key=str)
+                start = 0
+                if body.get("offset") is not None:
+                    keys = [str(pid) for pid in ids]
+                    start = keys.index(str(body["offset"])) if str(body["offset"]) in keys else len(ids)
+                limit = body.get("limit", 10)
+                page = ids[start:start + limit]
+                next_offset = ids[start + limit] if start + limit < len(ids) else None
+                return self._ok({
+                    "points": [collection.record(pid, body.get("with_payload", True),
+                                                 body.get("with_vector", False)) for pid in page],
+                    "next_page_offset": next_offset,
+                })
+
+            if rest == ["points", "search"]:
+                return self._ok(collection.search(body))
+
+            if rest == ["points", "search", "batch"]:
+                return self._ok([collection.search(request) for request in body.get("searches", [])])
+
+        return 404, {"status": {"error": f"Unknown endpoint {method} {path}"}}
+
+
+def _serve(conn, embed_latency_ms, search_latency_ms, dim):
+    with FakeOpenAIServer(embed_latency_ms, dim) as openai_server, FakeQdrantServer(search_latency_ms) as qdrant:
+        conn.send((openai_server.base_url, qdrant.url))
+        while True:
+            command = conn.recv()
+            if command == "stats":
+                conn.send({"embedding_requests": openai_server.requests, "qdrant_requests": qdrant.requests})
+            elif command == "stop":
+                break
+
+
+class FakeServices:
+    """
+    Run FakeOpenAIServer and FakeQdrantServer in a child process.
+
+    Keeping the fakes out of the benchmarked process means they neither
+    compete for its GIL nor show up in its memory measurements.
+    """
+
+    def __init__(self, embed_latency_ms=0.0, search_latency_ms=0.0, dim=1536):
+        import multiprocessing
+
+        self._conn, child_conn = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(
+            target=_serve, args=(child_conn, embed_latency_ms, search_latency_ms, dim), daemon=True
+        )
+        self.openai_base_url = None
+        self.qdrant_url = None
+
+    def start(self):
+        self._process.start()
+        self.openai_base_url, self.qdrant_url = self._conn.recv()
+        return self
+
+    def stats(self):
+        """Return cumulative request counters from both fake servers."""
+        self._conn.send("stats")
+        return self._conn.recv()
+
+    def stop(self):
+        if self._process.is_alive():
+            self._conn.send("stop")
+            self._process.join(timeout=5)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,83 @@
+# benchmarks/import_time.py
+# Startup-time budget for the command-line entry points
+#
+# Usage:
+#   python -m benchmarks.import_time
+#   python -m benchmarks.import_time --budget-ms 500 --repeat 10   # exit 1 if any entry point is over budget
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Commands that only parse arguments; anything they spend is import and setup cost
+ENTRY_POINTS = {
+    "run_pipeline --help": ["run_pipeline.py", "--help"],
+    "rebuild_qdrant_db --help": ["-m", "scripts.rebuild_qdrant_db", "--help"],
+    "draft_log_report --help": ["-m", "scripts.draft_log_report", "--help"],
+}
+
+# Modules the headless entry points must not import before they need them
+DEFERRED_MODULES = ("streamlit", "openai", "qdrant_client")
+
+HEADLESS_MODULES = ("run_pipeline", "core.config", "core.search", "core.generate", "core.embed",
+                    "core.draft_cache", "core.jobs", "scripts.rebuild_qdrant_db", "scripts.draft_log_report")
+
+
+def eagerly_imported(modules=HEADLESS_MODULES, deferred=DEFERRED_MODULES) -> list[str]:
+    """Import `modules` in a fresh interpreter and return which of `deferred` got imported."""
+    code = (
+        "import importlib, sys\n"
+        f"for name in {list(modules)!r}:\n"
+        "    importlib.import_module(name)\n"
+        f"print(','.join(m for m in {list(deferred)!r} if m in sys.modules))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    ).stdout.strip()
+    return output.split(",") if output else []
+
+
+def time_command(args, repeat) -> list[float]:
+    """Run `python <args>` `repeat` times and return wall times in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=REPO_ROOT, capture_output=True, check=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure CLI startup time against a budget.")
+    parser.add_argument("--budget-ms", type=float, default=500.0,
+                        help="Maximum median wall time per entry point (default: 500)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per entry point (default: 5)")
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'entry point':<28} {'p50 ms':>8} {'min ms':>8}")
+    for name, command in ENTRY_POINTS.items():
+        timings = time_command(command, args.repeat)
+        p50 = statistics.median(timings)
+        over = p50 > args.budget_ms
+        failed |= over
+        print(f"{name:<28} {p50:>8.0f} {min(timings):>8.0f}{'  OVER BUDGET' if over else ''}")
+
+    eager = eagerly_imported()
+    if eager:
+        failed = True
+        print(f"[ERROR] Imported at startup: {', '.join(eager)}")
+
+    if failed:
+        print(f"[ERROR] Startup budget of {args.budget_ms:.0f} ms exceeded.")
+        sys.exit(1)
+    print(f"[INFO] All entry points within {args.budget_ms:.0f} ms.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+# benchmarks/quantization_recall.py
+# Memory and latency versus recall@k for quantized and compact-dimension vector search
+#
+# Usage:
+#   python -m benchmarks.quantization_recall                          # synthetic archive of 5000 answers
+#   python -m benchmarks.quantization_recall --source local           # vectors from scripts/build_local_index.py
+#   python -m benchmarks.quantization_recall --source qdrant --k 5 --oversampling 1,2,4,8 --json quant.json
+#
+# Quantized search is reproduced in-process the way Qdrant does it: int8 scalar codes with the
+# 0.99 quantile range, or one sign bit per dimension compared by Hamming distance, then the top
+# k * oversampling candidates are optionally rescored with the original float32 vectors. Held-out
+# archive vectors are used as queries and recall@k is measured against exact float32 search.
+# Latencies are for this NumPy scan and show relative rescoring cost; Qdrant's SIMD scan of the
+# quantized vectors is faster than its float32 scan. Compact cases search the first N dimensions
+# of each embedding and rescore with the full vector, as SEARCH_COMPACT_DIMENSIONS does.
+
+import argparse
+import json
+import math
+import statistics
+import time
+
+import numpy as np
+
+POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+MB = 1024 * 1024
+
+
+def _normalize(matrix):
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def load_vectors(source, size, seed=0):
+    """
+    Return the archive's answer vectors as a normalized float32 matrix.
+
+    Args:
+        source: "synthetic" (fake embeddings of generated answers), "local"
+            (the local index) or "qdrant" (the configured collection)
+        size: Number of answers to generate for the synthetic source
+    """
+    if source == "synthetic":
+        from benchmarks.fake_services import FakeEmbedder
+        from benchmarks.synthetic import make_qa_pairs
+
+        embedder = FakeEmbedder()
+        return _normalize([embedder.embed(answer) for _, answer in make_qa_pairs(size, seed)])
+
+    if source == "local":
+        from core.config import LOCAL_INDEX_DIR
+        from core.local_index import LocalVectorIndex
+
+        return _normalize(LocalVectorIndex(LOCAL_INDEX_DIR).matrix)
+
+    if source == "qdrant":
+        from core.config import get_settings
+        from core.search import FULL_VECTOR, answers_only_filter, get_qdrant_client
+
+        client = get_qdrant_client()
+        if client is None:
+            raise RuntimeError("Qdrant client is not available.")
+        # Only the points searches can return, with their full vectors when compact ones are stored too
+        answers_only = answers_only_filter()
+        vectors = []
+        offset = None
+        while True:
+            records, offset = client.scroll(
+                collection_name=get_settings().collection_name, scroll_filter=answers_only, limit=256,
+                offset=offset, with_payload=False, with_vectors=True
+            )
+            vectors.extend(
+                record.vector[FULL_VECTOR] if isinstance(record.vector, dict) else record.vector
+                for record in records
+            )
+            if offset is None:
+                break
+        return _normalize(vectors)
+
+    raise ValueError(f"Unknown source '{source}'")
+
+
+class ScalarQuantizer:
+    """int8 scalar quantization over the [q, 1 - q] quantile range of all vector values."""
+
+    name = "scalar"
+
+    def __init__(self, matrix, quantile=0.99):
+        self.low, self.high = np.quantile(matrix, [1 - quantile, quantile])
+        self.step = (self.high - self.low) / 255
+        self.codes = np.clip(np.rint((matrix - self.low) / self.step), 0, 255).astype(np.uint8)
+
+    def bytes_per_vector(self):
+        return self.codes.shape[1]
+
+    def scores(self, query):
+        # dot(query, low + step * code) without materializing the dequantized matrix
+        return self.low * query.sum() + self.step * (self.codes @ query)
+
+
+class BinaryQuantizer:
+    """One sign bit per dimension; similarity is the number of agreeing bits."""
+
+    name = "binary"
+
+    def __init__(self, matrix):
+        self.dim = matrix.shape[1]
+        self.codes = np.packbits(matrix > 0, axis=1)
+
+    def bytes_per_vector(self):
+        return self.codes.shape[1]
+
+    def scores(self, query):
+        differing = POPCOUNT[np.bitwise_xor(self.codes, np.packbits(query > 0))].sum(axis=1, dtype=np.int32)
+        return self.dim - 2 * differing
+
+
+class CompactVectors:
+    """The first `dimensions` values of each vector, renormalized, as stored for two-stage search."""
+
+    def __init__(self, matrix, dimensions):
+        self.name = f"compact-{dimensions}"
+        self.dimensions = dimensions
+        self.vectors = _normalize(matrix[:, :dimensions])
+
+    def bytes_per_vector(self):
+        return self.dimensions * 4
+
+    def scores(self, query):
+        return self.vectors @ query[:self.dimensions]
+
+
+def top_k(scores, k):
+    k = min(k, len(scores))
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+def run_case(matrix, queries, truth, k, quantizer=None, oversampling=1.0, rescore=False):
+    """Search every query and return recall@k and per-query latency percentiles."""
+    timings = []
+    hits = 0
+    for query, expected in zip(queries, truth):
+        start = time.perf_counter()
+        if quantizer is None:
+            found = top_k(matrix @ query, k)
+        elif rescore:
+            candidates = top_k(quantizer.scores(query), math.ceil(k * oversampling))
+            found = candidates[top_k(matrix[candidates] @ query, k)]
+        else:
+            found = top_k(quantizer.scores(query), k)
+        timings.append((time.perf_counter() - start) * 1000)
+        hits += len(set(found.tolist()) & expected)
+
+    ordered = sorted(timings)
+    return {
+        "recall": hits / (len(truth) * k),
+        "p50_ms": statistics.median(timings),
+        "p95_ms": ordered[min(len(ordered) - 1, round(0.95 * (len(ordered) - 1)))],
+    }
+
+
+def footprint(count, dim, quantizer):
+    """Vector memory in MB: RAM with originals on disk, and RAM with originals in memory."""
+    original = count * dim * 4 / MB
+    if quantizer is None:
+        return {"ram_mb_on_disk": original, "ram_mb_in_memory": original}
+    quantized = count * quantizer.bytes_per_vector() / MB
+    return {"ram_mb_on_disk": quantized, "ram_mb_in_memory": quantized + original}
+
+
+def benchmark(vectors, k=5, query_count=200, oversampling=(1, 2, 4), compact=(256, 512), seed=0):
+    """
+    Hold out `query_count` vectors as queries and compare each configuration with exact search.
+
+    Args:
+        compact: Compact vector sizes to try; sizes not below the full size are skipped
+
+    Returns:
+        List of result dicts, one per (quantization, oversampling, rescore) case
+    """
+    rng = np.random.default_rng(seed)
+    order = rng.permutation(len(vectors))
+    query_count = min(query_count, len(vectors) // 2)
+    queries = vectors[order[:query_count]]
+    matrix = np.ascontiguousarray(vectors[order[query_count:]])
+    count, dim = matrix.shape
+    truth = [set(top_k(matrix @ query, k).tolist()) for query in queries]
+
+    results = [{"quantization": "none", "oversampling": None, "rescore": False,
+                **run_case(matrix, queries, truth, k), **footprint(count, dim, None)}]
+
+    quantizers = [ScalarQuantizer(matrix), BinaryQuantizer(matrix)]
+    quantizers += [CompactVectors(matrix, dimensions) for dimensions in compact if dimensions < dim]
+    for quantizer in quantizers:
+        cases = [(1.0, False)] + [(float(factor), True) for factor in oversampling]
+        for factor, rescore in cases:
+            results.append({
+                "quantization": quantizer.name,
+                "oversampling": factor if rescore else None,
+                "rescore": rescore,
+                **run_case(matrix, queries, truth, k, quantizer, factor, rescore),
+                **footprint(count, dim, quantizer),
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure recall@k, latency and memory of quantized search.")
+    parser.add_argument("--source", choices=("synthetic", "local", "qdrant"), default="synthetic",
+                        help="Where to read archive vectors from (default: synthetic)")
+    parser.add_argument("--size", type=int, default=5000, help="Synthetic archive size (default: 5000)")
+    parser.add_argument("--k", type=int, default=5, help="Results per query, as in search_qdrant (default: 5)")
+    parser.add_argument("--queries", type=int, default=200, help="Held-out query vectors (default: 200)")
+    parser.add_argument("--oversampling", default="1,2,4",
+                        help="Comma-separated oversampling factors to rescore with (default: 1,2,4)")
+    parser.add_argument("--compact", default="256,512",
+                        help="Comma-separated compact vector sizes for two-stage search (default: 256,512)")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    vectors = load_vectors(args.source, args.size)
+    factors = [float(f) for f in args.oversampling.split(",") if f]
+    compact = [int(d) for d in args.compact.split(",") if d]
+    results = benchmark(vectors, k=args.k, query_count=args.queries, oversampling=factors, compact=compact)
+
+    print(f"{len(vectors)} vectors of {vectors.shape[1]} dimensions from '{args.source}', recall@{args.k}")
+    print(f"{'quantization':<14}{'oversample':>11}{'rescore':>9}{'recall':>9}{'p50 ms':>9}{'p95 ms':>9}"
+          f"{'RAM MB':>9}{'RAM MB*':>9}")
+    for r in results:
+        oversample = f"{r['oversampling']:g}" if r["oversampling"] else "-"
+        print(f"{r['quantization']:<14}{oversample:>11}{'yes' if r['rescore'] else 'no':>9}{r['recall']:>9.3f}"
+              f"{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}{r['ram_mb_on_disk']:>9.1f}{r['ram_mb_in_memory']:>9.1f}")
+    print("RAM MB: vectors held in memory with QDRANT_VECTORS_ON_DISK=1; RAM MB*: with originals in memory. "
+          "HNSW graph and payloads are not included.")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"source": args.source, "count": len(vectors), "k": args.k, "results": results}, f, indent=2)
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
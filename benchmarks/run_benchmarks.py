@@ -0,0 +1,265 @@
+# benchmarks/run_benchmarks.py
+# End-to-end performance benchmarks against local fake OpenAI and Qdrant services
+#
+# Usage:
+#   python -m benchmarks.run_benchmarks
+#   python -m benchmarks.run_benchmarks --sizes 10,100 --embed-latency-ms 80 --json bench.json
+#   python -m benchmarks.run_benchmarks --baseline bench.json   # exit 1 on regressions
+
+import argparse
+import contextlib
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.fake_services import FakeServices
+from benchmarks.synthetic import make_qa_pairs, make_questions, write_archive, write_rfp
+from core.timing import percentile
+
+ARCHIVE_SIZE = 500  # Q&A pairs seeded into the fake collection before retrieval benchmarks
+
+
+def configure_environment(workdir, services):
+    """
+    Point the application at the fake services and isolate all of its files in `workdir`.
+
+    Settings are provided both as environment variables and as a
+    .streamlit/secrets.toml in the working directory, so that they take
+    precedence over any secrets.toml in the user's home directory.
+    """
+    os.makedirs(os.path.join(workdir, ".streamlit"), exist_ok=True)
+    settings = {
+        "OPENAI_API_KEY": "benchmark",
+        "OPENAI_BASE_URL": services.openai_base_url,
+        "QDRANT_CLUSTER_URL": services.qdrant_url,
+        "QDRANT_API_KEY": "",
+    }
+    with open(os.path.join(workdir, ".streamlit", "secrets.toml"), "w", encoding="utf-8") as f:
+        for key, value in settings.items():
+            f.write(f'{key} = "{value}"\n')
+
+    os.environ.update(settings)
+    os.environ["EMBEDDING_CACHE_ENABLED"] = "0"  # Every run should pay for its embeddings
+    os.environ["DRAFT_CACHE_ENABLED"] = "0"  # ... and for its searches
+    os.environ["QUESTION_INDEX_ENABLED"] = "0"  # ... with no exact-match shortcuts
+    os.chdir(workdir)
+    sys.path.insert(0, REPO_ROOT)
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure(name, size, run, services, setup=None, repeat=5):
+    """
+    Time `run` `repeat` times, then run it once more under tracemalloc for peak memory.
+
+    Application output is discarded so console I/O does not dominate timings.
+    """
+    timings = []
+    calls_before = services.stats()
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(repeat):
+            if setup:
+                setup()
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+
+        calls_after = services.stats()
+
+        if setup:
+            setup()
+        tracemalloc.start()
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    p50 = statistics.median(timings)
+    return {
+        "case": name,
+        "size": size,
+        "p50_ms": p50 * 1000,
+        "p95_ms": percentile(timings, 95) * 1000,
+        "throughput_per_s": size / p50 if p50 else float("inf"),
+        "peak_mb": peak / (1024 * 1024),
+        "embedding_calls": (calls_after["embedding_requests"] - calls_before["embedding_requests"]) / repeat,
+        "qdrant_calls": (calls_after["qdrant_requests"] - calls_before["qdrant_requests"]) / repeat,
+    }
+
+
+def run_suite(sizes, repeat, workers, services, only=None):
+    # Core modules read their configuration at import time, so import them only now
+    from core.config import SEARCH_BATCH_SIZE
+    from core.embed import embed_final_rfp, embed_rfp_archive, ensure_correct_collection, extract_qa_from_docx
+    from core.extract import extract_questions_from_docx
+    from core.generate import generate_draft_answer, get_embeddings
+    from core.search import search_qdrant_batch
+    from docx import Document
+    import run_pipeline
+
+    results = []
+
+    def wanted(case):
+        return not only or case in only
+
+    def record(result):
+        results.append(result)
+        print(format_row(result), flush=True)
+
+    print(format_header(), flush=True)
+
+    # --- Ingestion: parse, embed and upload an archived questionnaire ---
+    for size in sizes:
+        archive_path = f"archive_{size}.docx"
+        write_archive(archive_path, make_qa_pairs(size, seed=size))
+
+        if wanted("extract_qa"):
+            record(measure("extract_qa", size, lambda: extract_qa_from_docx(archive_path), services, repeat=repeat))
+        if wanted("embed_final_rfp"):
+            with contextlib.redirect_stdout(open(os.devnull, "w")):
+                ensure_correct_collection()
+            record(measure("embed_final_rfp", size, lambda: embed_final_rfp(archive_path), services,
+                           setup=ensure_correct_collection, repeat=repeat))
+
+    # --- Seed the collection used by the retrieval benchmarks ---
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        ensure_correct_collection()
+        seed_paths = []
+        for i in range(5):
+            path = f"seed_{i}.docx"
+            write_archive(path, make_qa_pairs(ARCHIVE_SIZE // 5, seed=1000 + i))
+            seed_paths.append(path)
+        embed_rfp_archive(seed_paths)
+
+    # --- Retrieval and drafting on new RFPs ---
+    for size in sizes:
+        rfp_path = f"rfp_{size}.docx"
+        questions = make_questions(size, seed=size)
+        write_rfp(rfp_path, questions)
+
+        if wanted("extract_questions"):
+            record(measure("extract_questions", size, lambda: extract_questions_from_docx(rfp_path), services,
+                           repeat=repeat))
+
+        if wanted("embed_questions"):
+            record(measure("embed_questions", size, lambda: get_embeddings(questions), services, repeat=repeat))
+
+        with contextlib.redirect_stdout(open(os.devnull, "w")):
+            vectors = get_embeddings(questions)
+
+        def search_all():
+            found = []
+            for start in range(0, len(vectors), SEARCH_BATCH_SIZE):
+                found.extend(search_qdrant_batch(vectors[start:start + SEARCH_BATCH_SIZE]))
+            return found
+
+        if wanted("search"):
+            record(measure("search", size, search_all, services, repeat=repeat))
+
+        with contextlib.redirect_stdout(open(os.devnull, "w")):
+            search_results = search_all()
+
+        if wanted("draft_assembly"):
+            record(measure("draft_assembly", size, lambda: [
+                generate_draft_answer(q, r) for q, r in zip(questions, search_results)
+            ], services, repeat=repeat))
+
+        drafts = [generate_draft_answer(q, r) for q, r in zip(questions, search_results)]
+
+        def write_docx():
+            doc = Document()
+            doc.add_heading("RFP Draft Responses", level=1)
+            for i, (question, draft) in enumerate(zip(questions, drafts), 1):
+                run_pipeline._add_answer(doc, i, question, draft)
+            doc.save(f"draft_{size}.docx")
+
+        if wanted("docx_write"):
+            record(measure("docx_write", size, write_docx, services, repeat=repeat))
+
+        if wanted("run_pipeline"):
+            record(measure("run_pipeline", size, lambda: run_pipeline.run_pipeline(rfp_path, workers=workers),
+                           services, repeat=repeat))
+
+    return results
+
+
+def format_header():
+    return (f"{'case':<18}{'size':>6}{'p50 ms':>11}{'p95 ms':>11}{'items/s':>11}"
+            f"{'peak MB':>9}{'embed calls':>13}{'qdrant calls':>14}")
+
+
+def format_row(r):
+    return (f"{r['case']:<18}{r['size']:>6}{r['p50_ms']:>11.1f}{r['p95_ms']:>11.1f}"
+            f"{r['throughput_per_s']:>11.1f}{r['peak_mb']:>9.1f}{r['embedding_calls']:>13.1f}"
+            f"{r['qdrant_calls']:>14.1f}")
+
+
+def compare(results, baseline_path, tolerance):
+    """Print cases whose p50 regressed beyond `tolerance`; return True if any did."""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {(r["case"], r["size"]): r for r in json.load(f)["results"]}
+
+    regressed = False
+    for r in results:
+        base = baseline.get((r["case"], r["size"]))
+        if base and r["p50_ms"] > base["p50_ms"] * (1 + tolerance):
+            regressed = True
+            print(f"[REGRESSION] {r['case']} (size {r['size']}): "
+                  f"{base['p50_ms']:.1f} ms -> {r['p50_ms']:.1f} ms")
+    if not regressed:
+        print(f"No regressions beyond {tolerance:.0%} against {baseline_path}.")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the RFP pipeline against local fake services.")
+    parser.add_argument("--sizes", default="10,100,1000",
+                        help="Comma-separated synthetic document sizes, in questions (default: 10,100,1000)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case (default: 5)")
+    parser.add_argument("--workers", type=int, default=4, help="run_pipeline worker count (default: 4)")
+    parser.add_argument("--embed-latency-ms", type=float, default=50.0,
+                        help="Simulated latency per embeddings request (default: 50)")
+    parser.add_argument("--search-latency-ms", type=float, default=20.0,
+                        help="Simulated latency per Qdrant request (default: 20)")
+    parser.add_argument("--only", help="Comma-separated case names to run")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    parser.add_argument("--baseline", help="Compare against a previous --json file and exit 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed p50 slowdown against the baseline (default: 0.2)")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    only = set(args.only.split(",")) if args.only else None
+    json_path = os.path.abspath(args.json) if args.json else None
+    baseline_path = os.path.abspath(args.baseline) if args.baseline else None
+
+    with FakeServices(args.embed_latency_ms, args.search_latency_ms) as services, \
+            tempfile.TemporaryDirectory(prefix="rfp_bench_") as workdir:
+        configure_environment(workdir, services)
+        results = run_suite(sizes, args.repeat, args.workers, services, only)
+        os.chdir(REPO_ROOT)
+
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "settings": {
+                    "sizes": sizes, "repeat": args.repeat, "workers": args.workers,
+                    "embed_latency_ms": args.embed_latency_ms, "search_latency_ms": args.search_latency_ms,
+                },
+                "results": results,
+            }, f, indent=2)
+        print(f"\nResults written to {json_path}")
+
+    if baseline_path and compare(results, baseline_path, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# benchmarks/synthetic.py
+# Deterministic synthetic RFPs and archived questionnaires for benchmarking
+
+import random
+
+from docx import Document
+
+TOPICS = [
+    "cybersecurity policies", "business continuity plan", "disaster recovery testing",
+    "data retention policy", "client onboarding process", "pricing structure",
+    "service level agreements", "data sources and vendors", "quality assurance process",
+    "staff turnover", "ownership structure", "regulatory examinations",
+    "insurance coverage", "incident management program", "software release cycle",
+    "reporting capabilities", "consultant database coverage", "client references",
+    "complaints handling", "conflicts of interest policy", "vendor due diligence",
+    "encryption standards", "access control procedures", "penetration testing",
+    "audit history", "key person risk", "employee background checks",
+    "remote work arrangements", "hosting infrastructure", "support hours",
+]
+
+QUESTION_TEMPLATES = [
+    "Please describe your {topic} in detail?",
+    "How does your firm manage its {topic}?",
+    "What changes have been made to your {topic} in the last {n} years?",
+    "Can you provide documentation of your {topic} for section {n}?",
+    "Who is responsible for overseeing the {topic} at your firm?",
+    "Does your {topic} cover all {n} regional offices?",
+]
+
+ANSWER_TEMPLATES = [
+    "Our {topic} is reviewed annually by senior management and documented in policy {n}.",
+    "The firm maintains a formal {topic} that is tested every {n} months by an independent party.",
+    "Responsibility for the {topic} sits with the Chief Operating Officer, supported by {n} staff.",
+    "We updated our {topic} {n} times over the period to reflect new client requirements.",
+]
+
+
+def make_questions(count, seed=0):
+    """Return `count` distinct, realistic-looking RFP questions."""
+    rng = random.Random(seed)
+    questions = []
+    seen = set()
+    while len(questions) < count:
+        question = rng.choice(QUESTION_TEMPLATES).format(topic=rng.choice(TOPICS), n=rng.randint(1, 999))
+        if question not in seen:
+            seen.add(question)
+            questions.append(question)
+    return questions
+
+
+def make_qa_pairs(count, seed=0):
+    """Return `count` question/answer pairs for an archived questionnaire."""
+    rng = random.Random(seed)
+    pairs = []
+    for question in make_questions(count, seed):
+        topic = next((t for t in TOPICS if t in question), rng.choice(TOPICS))
+        answer = rng.choice(ANSWER_TEMPLATES).format(topic=topic, n=rng.randint(2, 99))
+        pairs.append((question, answer))
+    return pairs
+
+
+def write_rfp(path, questions, table_every=10):
+    """
+    Write a new-RFP style document.
+
+    Most questions are plain paragraphs grouped under section headings; every
+    `table_every`-th question is placed in a numbered questionnaire table row.
+    """
+    doc = Document()
+    doc.add_heading("Request for Proposal", level=1)
+    table = None
+
+    for i, question in enumerate(questions):
+        if i % 25 == 0:
+            doc.add_heading(f"Section {i // 25 + 1}", level=2)
+            doc.add_paragraph("Please answer every question in this section.")
+            table = None
+        if table_every and i % table_every == table_every - 1:
+            if table is None:
+                table = doc.add_table(rows=0, cols=2)
+            row = table.add_row()
+            row.cells[0].text = str(i + 1)
+            row.cells[1].text = question
+        else:
+            doc.add_paragraph(question)
+
+    doc.save(path)
+
+
+def write_archive(path, pairs):
+    """Write a finalized questionnaire in the archive format (question, then answer)."""
+    doc = Document()
+    doc.add_heading("Final RFP Response", level=1)
+    for question, answer in pairs:
+        doc.add_paragraph(question)
+        doc.add_paragraph(answer)
+    doc.save(path)
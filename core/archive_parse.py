@@ -0,0 +1,111 @@
+# core/archive_parse.py
+# Parsing stage of archive ingestion, safe to run in worker processes
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from core.config import REBUILD_PARSE_WORKERS
+from core.docx_stream import iter_qa_pairs
+from core.generate import looks_like_question
+from core.manifest import point_id_for
+
+
+def collect_answer_entries(file_path, source_name=None):
+    """
+    Extract Q&A pairs from a DOCX file and drop pairs whose answer is too short to embed.
+
+    Each entry carries a deterministic point 'id' derived from the source file
+    name and the Q&A content, and a 'kind' of "answer", or "question" when
+    the answer text reads like a question (see looks_like_question) and
+    should never be used as context. Exact duplicate pairs within a document
+    are collapsed to one entry.
+
+    Args:
+        file_path: Path to the .docx file
+        source_name: Document name to record (default: the file's basename)
+
+    Returns:
+        Tuple of (entries, skipped) where entries is a list of dicts with
+        'id', 'question', 'answer', 'source' and 'kind' keys
+    """
+    source = source_name or os.path.basename(file_path)
+    entries = {}
+    skipped = 0
+
+    for pair in iter_qa_pairs(file_path):
+        answer = pair["answer"].strip()
+        question = pair["question"].strip()
+
+        if not answer or len(answer) < 10:
+            print(f"[WARNING] Skipping too-short answer for: {question[:60]}...")
+            skipped += 1
+            continue
+
+        point_id = point_id_for(source, question, answer)
+        entries[point_id] = {
+            "id": point_id,
+            "question": question,
+            "answer": answer,
+            "source": source,
+            "kind": "question" if looks_like_question(answer) else "answer",
+        }
+
+    return list(entries.values()), skipped
+
+
+def _parse_in_process(file_path):
+    try:
+        entries, _ = collect_answer_entries(file_path)
+        return entries, None
+    except Exception as e:
+        return None, e
+
+
+def iter_parsed_documents(file_paths, workers=REBUILD_PARSE_WORKERS):
+    """
+    Parse documents on a process pool and yield each one as soon as it is done.
+
+    DOCX parsing is CPU-bound pure Python, so worker processes sidestep the
+    GIL while the caller embeds and uploads documents that are already parsed.
+    Workers are spawned rather than forked, so they start clean even when
+    the caller has threads running. A document that fails to parse is
+    yielded with its exception instead of stopping the others. If the pool itself breaks, the remaining documents
+    are parsed in this process.
+
+    Args:
+        file_paths: Paths to .docx files
+        workers: Number of parser processes; 1 parses everything in-process
+
+    Yields:
+        Tuples of (file_path, entries, error) in completion order, where
+        exactly one of entries and error is None
+    """
+    file_paths = list(file_paths)
+    pending = set(file_paths)
+
+    if workers > 1 and len(file_paths) > 1:
+        try:
+            # Forking a process that already runs threads (Streamlit, upload pools) can copy held locks
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=min(workers, len(file_paths)), mp_context=context) as pool:
+                futures = {pool.submit(collect_answer_entries, path): path for path in file_paths}
+                for future in as_completed(futures):
+                    path = futures[future]
+                    try:
+                        entries, _ = future.result()
+                        error = None
+                    except BrokenProcessPool:
+                        raise
+                    except Exception as e:
+                        entries, error = None, e
+                    pending.discard(path)
+                    yield path, entries, error
+        except BrokenProcessPool as e:
+            print(f"[WARNING] Parser process pool failed ({e}). Parsing remaining documents in-process.")
+
+    for path in file_paths:
+        if path in pending:
+            entries, error = _parse_in_process(path)
+            yield path, entries, error
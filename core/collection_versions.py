@@ -0,0 +1,78 @@
+# core/collection_versions.py
+# Versioned Qdrant collections served through an alias, so rebuilds never touch the live data
+
+import time
+
+# Versions are named "<alias>_v<UTC timestamp with milliseconds>", so they sort oldest first
+VERSION_SEPARATOR = "_v"
+
+
+def list_versions(client, alias) -> list[str]:
+    """Return the names of the collection versions built for `alias`, oldest first."""
+    prefix = f"{alias}{VERSION_SEPARATOR}"
+    return sorted(
+        c.name for c in client.get_collections().collections
+        if c.name.startswith(prefix) and c.name[len(prefix):].isdigit()
+    )
+
+
+def new_version_name(client, alias) -> str:
+    """Return an unused version name for `alias`, newer than every existing version."""
+    existing = set(list_versions(client, alias))
+    now = time.time()
+    stamp = int(time.strftime("%Y%m%d%H%M%S", time.gmtime(now))) * 1000 + int(now * 1000) % 1000
+    while f"{alias}{VERSION_SEPARATOR}{stamp}" in existing:
+        stamp += 1
+    return f"{alias}{VERSION_SEPARATOR}{stamp}"
+
+
+def alias_target(client, alias) -> str | None:
+    """Return the collection `alias` currently points to, or None if it is not an alias."""
+    for description in client.get_aliases().aliases:
+        if description.alias_name == alias:
+            return description.collection_name
+    return None
+
+
+def live_collection(client, alias) -> str:
+    """Return the physical collection searches of `alias` read from."""
+    return alias_target(client, alias) or alias
+
+
+def point_alias(client, alias, collection_name):
+    """
+    Atomically repoint `alias` at `collection_name`.
+
+    Removing the old alias and creating the new one happen in a single
+    request, so searches see either the old or the new collection and never
+    a missing one. A collection from before versioning that is itself called
+    `alias` has to be deleted first; its points cannot be kept for rollback.
+    """
+    from qdrant_client.models import CreateAlias, CreateAliasOperation, DeleteAlias, DeleteAliasOperation
+
+    operations = []
+    if alias_target(client, alias) is not None:
+        operations.append(DeleteAliasOperation(delete_alias=DeleteAlias(alias_name=alias)))
+    elif client.collection_exists(alias):
+        print(f"[WARNING] Replacing unversioned collection '{alias}' with alias to '{collection_name}'; "
+              "it cannot be rolled back to.")
+        client.delete_collection(alias)
+    operations.append(CreateAliasOperation(create_alias=CreateAlias(collection_name=collection_name, alias_name=alias)))
+    client.update_collection_aliases(change_aliases_operations=operations)
+    print(f"[INFO] Alias '{alias}' now points to '{collection_name}'.")
+
+
+def prune_versions(client, alias, keep) -> list[str]:
+    """
+    Delete all but the newest `keep` versions besides the live one.
+
+    Returns:
+        Names of the deleted collections
+    """
+    live = alias_target(client, alias)
+    spare = [name for name in list_versions(client, alias) if name != live]
+    deleted = spare[:max(0, len(spare) - keep)]
+    for name in deleted:
+        client.delete_collection(name)
+        print(f"[INFO] Deleted old collection version '{name}'.")
+    return deleted
@@ -2,29 +2,217 @@
 # Production-ready configuration for Streamlit Cloud deployment
 
 import os
-import streamlit as st
+import sys
+import threading
+from pathlib import Path
 from dotenv import load_dotenv
 
 # Load .env for local development (ignored in production)
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+load_dotenv(PROJECT_ROOT / ".env")
 load_dotenv()
 
-# Model & API configuration - prioritize Streamlit secrets over environment variables
+# Model configuration
 OLLAMA_EMBEDDING_MODEL = "nomic-embed-text"  # For local development only
 OLLAMA_GENERATION_MODEL = "llama3"  # For local development only
-OPENAI_API_KEY = st.secrets.get("OPENAI_API_KEY", os.getenv("OPENAI_API_KEY"))
 OPENAI_MODEL_NAME = "gpt-4"
 OPENAI_GENERATION_MODEL = "gpt-4-turbo"
-QDRANT_API_KEY = st.secrets.get("QDRANT_API_KEY", os.getenv("QDRANT_API_KEY"))
-QDRANT_CLUSTER_URL = st.secrets.get("QDRANT_CLUSTER_URL", os.getenv("QDRANT_CLUSTER_URL"))
-COLLECTION_NAME = st.secrets.get("COLLECTION_NAME", "past_rfp_answers")
+
+
+def _read_secrets():
+    """
+    Return Streamlit secrets as a dict without requiring a Streamlit context.
+
+    Inside a running Streamlit app st.secrets is used as-is. Everywhere else
+    the same secrets.toml files Streamlit would read (user-level, then
+    project-level) are parsed directly, so Streamlit is never imported just
+    to read configuration.
+    """
+    if "streamlit" in sys.modules:
+        try:
+            return sys.modules["streamlit"].secrets.to_dict()
+        except Exception:
+            pass  # No secrets file: fall through and report none
+
+    try:
+        import tomllib
+    except ImportError:  # Python < 3.11
+        return {}
+
+    secrets = {}
+    for path in (Path.home() / ".streamlit" / "secrets.toml", Path.cwd() / ".streamlit" / "secrets.toml"):
+        try:
+            with open(path, "rb") as f:
+                secrets.update(tomllib.load(f))
+        except FileNotFoundError:
+            continue
+        except (OSError, tomllib.TOMLDecodeError) as e:
+            print(f"[WARNING] Could not read secrets from {path}: {e}")
+    return secrets
+
+
+class Settings:
+    """
+    Deployment settings: Streamlit secrets first, then environment variables
+    (including .env), then defaults.
+    """
+
+    def __init__(self, secrets, environ):
+        def lookup(name, default=None):
+            value = secrets.get(name)
+            return value if value not in (None, "") else environ.get(name, default)
+
+        self.openai_api_key = lookup("OPENAI_API_KEY")
+        self.qdrant_api_key = lookup("QDRANT_API_KEY")
+        self.qdrant_cluster_url = lookup("QDRANT_CLUSTER_URL")
+        self.collection_name = lookup("COLLECTION_NAME", "past_rfp_answers")
+        # Retrieval backend: "qdrant" (hosted cluster) or "local" (in-process NumPy index)
+        self.search_backend = lookup("SEARCH_BACKEND", "qdrant")
+
+
+_settings = None
+_settings_lock = threading.Lock()
+
+
+def get_settings() -> Settings:
+    """Return the process-wide settings, resolving secrets on first use."""
+    global _settings
+    with _settings_lock:
+        if _settings is None:
+            _settings = Settings(_read_secrets(), os.environ)
+        return _settings
+
+
+def reset_settings():
+    """Forget resolved settings so the next get_settings() reads them again."""
+    global _settings
+    with _settings_lock:
+        _settings = None
+
+
+# Module-level names kept for older scripts; resolved on first access
+_SETTING_NAMES = {
+    "OPENAI_API_KEY": "openai_api_key",
+    "QDRANT_API_KEY": "qdrant_api_key",
+    "QDRANT_CLUSTER_URL": "qdrant_cluster_url",
+    "COLLECTION_NAME": "collection_name",
+    "SEARCH_BACKEND": "search_backend",
+}
+
+
+def __getattr__(name):
+    if name in _SETTING_NAMES:
+        return getattr(get_settings(), _SETTING_NAMES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+LOCAL_INDEX_DIR = os.path.join("cache", "local_index")
 REVIEW_SCORE_THRESHOLD = 0.60
 USE_OPENAI = True
 
+# Embedding size requested from text-embedding-3-small, which can shorten its 1536-float output.
+# Changing it requires recreating the collection (and rebuilding the local index)
+EMBEDDING_DIMENSIONS = int(os.getenv("EMBEDDING_DIMENSIONS", "1536"))
+
+# Two-stage retrieval: with SEARCH_COMPACT_DIMENSIONS > 0 the collection also stores the first
+# that many dimensions of every embedding; searches scan the compact vectors for
+# limit * SEARCH_COMPACT_OVERSAMPLING candidates and rescore those with the full vectors
+SEARCH_COMPACT_DIMENSIONS = int(os.getenv("SEARCH_COMPACT_DIMENSIONS", "0"))
+SEARCH_COMPACT_OVERSAMPLING = 4
+
+# Batched embedding requests (OpenAI accepts up to 2048 inputs / ~300k tokens per call)
+EMBEDDING_BATCH_SIZE = 256
+EMBEDDING_BATCH_MAX_TOKENS = 100_000
+
+# On-disk embedding cache (keyed by model + normalized text hash)
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "1") != "0"
+EMBEDDING_CACHE_PATH = os.path.join("cache", "embeddings.sqlite3")
+EMBEDDING_CACHE_MAX_ENTRIES = 200_000
+
+# Semantic draft cache: reuse the search results and draft of a previously answered question
+# whose embedding is at least this cosine-similar, until the archive changes
+DRAFT_CACHE_ENABLED = os.getenv("DRAFT_CACHE_ENABLED", "1") != "0"
+DRAFT_CACHE_PATH = os.path.join("cache", "drafts.sqlite3")
+DRAFT_CACHE_SIMILARITY = float(os.getenv("DRAFT_CACHE_SIMILARITY", "0.97"))
+DRAFT_CACHE_MAX_ENTRIES = 20_000
+
+# Local index of archived questions (normalized text hash -> points); run_pipeline answers
+# questions found there directly, without embedding or searching them
+QUESTION_INDEX_ENABLED = os.getenv("QUESTION_INDEX_ENABLED", "1") != "0"
+QUESTION_INDEX_PATH = os.path.join("cache", "question_index.sqlite3")
+
+# Record of which point IDs each archived document produced (drives incremental re-indexing)
+ARCHIVE_MANIFEST_PATH = os.path.join("cache", "archive_manifest.json")
+
+# Questions in one RFP whose character-shingle Jaccard similarity is at least this are
+# answered once and the answer is reused for every copy (1.0 collapses exact repeats only)
+DEDUP_SIMILARITY = 0.9
+DEDUP_SHINGLE_SIZE = 4
+
+# run_pipeline resolves questions in chunks that start this small, so the first answers
+# arrive quickly, and double up to EMBEDDING_BATCH_SIZE
+STREAM_FIRST_CHUNK_SIZE = 8
+
+# Number of question chunks embedded/searched concurrently by run_pipeline
+PIPELINE_WORKERS = 4
+
+# Qdrant vector storage, applied when the collection is (re)created: quantization is "none",
+# "scalar" (int8, 4x smaller) or "binary" (1 bit per dimension, 32x smaller). With
+# QDRANT_VECTORS_ON_DISK the original float32 vectors stay on disk and only the quantized
+# copy is held in RAM
+QDRANT_QUANTIZATION = os.getenv("QDRANT_QUANTIZATION", "none")
+QDRANT_VECTORS_ON_DISK = os.getenv("QDRANT_VECTORS_ON_DISK", "0") == "1"
+# Searches on a quantized collection fetch limit * SEARCH_OVERSAMPLING candidates by quantized
+# score and, with SEARCH_RESCORE, re-rank them with the original vectors
+SEARCH_OVERSAMPLING = float(os.getenv("SEARCH_OVERSAMPLING", "2.0"))
+SEARCH_RESCORE = os.getenv("SEARCH_RESCORE", "1") != "0"
+
+# HNSW graph parameters for (re)created collections. Full rebuilds load with indexing suspended
+# (indexing_threshold 0), then restore QDRANT_INDEXING_THRESHOLD (KB per segment, Qdrant's
+# default) so the graph is built once, waiting up to QDRANT_OPTIMIZE_TIMEOUT seconds for it
+QDRANT_HNSW_M = int(os.getenv("QDRANT_HNSW_M", "16"))
+QDRANT_HNSW_EF_CONSTRUCT = int(os.getenv("QDRANT_HNSW_EF_CONSTRUCT", "100"))
+QDRANT_INDEXING_THRESHOLD = 20_000
+QDRANT_OPTIMIZE_TIMEOUT = 30 * 60
+
+# The collection name is an alias for the live "<name>_v<timestamp>" collection. Rebuilds load
+# a new version and swap the alias to it; this many older versions are kept for rollback
+QDRANT_KEEP_VERSIONS = int(os.getenv("QDRANT_KEEP_VERSIONS", "2"))
+
+# Number of query vectors sent per Qdrant batch search request
+SEARCH_BATCH_SIZE = 64
+
+# Ingestion streams points to Qdrant with upload_points: QDRANT_UPLOAD_BATCH_SIZE points per
+# upsert, up to QDRANT_UPLOAD_PARALLEL upserts in flight (threads), and each batch attempted up
+# to QDRANT_UPLOAD_MAX_RETRIES times, waiting QDRANT_UPLOAD_RETRY_DELAY seconds, then twice that, ...
+QDRANT_UPLOAD_BATCH_SIZE = 128
+QDRANT_UPLOAD_PARALLEL = int(os.getenv("QDRANT_UPLOAD_PARALLEL", "2"))
+QDRANT_UPLOAD_MAX_RETRIES = 3
+QDRANT_UPLOAD_RETRY_DELAY = 1.0
+
+# Parser processes used when re-indexing the archive
+REBUILD_PARSE_WORKERS = min(4, os.cpu_count() or 1)
+
 # Paths
 LOG_DIR = "logs"
 OUTPUT_DIR = "output"
 PAST_RFPS_DIR = "past_rfps"
 
-# NOTE: Qdrant client is NOT initialized here to avoid conflicts.
-# Always use get_qdrant_client() from core.search instead.
+# Background drafting jobs: each job gets its own directory under JOBS_DIR
+JOBS_DIR = os.path.join(OUTPUT_DIR, "jobs")
+JOB_MAX_CONCURRENT = int(os.getenv("JOB_MAX_CONCURRENT", "2"))
+# Finished jobs and their files are removed after this many seconds
+JOB_RETENTION_SECONDS = 7 * 24 * 3600
+
+# Draft log: rotate at this size or when the date changes, keeping this many gzipped segments
+LOG_MAX_BYTES = 50 * 1024 * 1024
+LOG_ROTATE_DAILY = True
+LOG_BACKUP_COUNT = 30
+# Log lines buffered for the background writer; callers block when it is full
+LOG_QUEUE_SIZE = 10_000
+# Seconds between flushes of the draft log to disk
+LOG_FLUSH_INTERVAL = 1.0
+
+# NOTE: No clients are initialized here. Use get_qdrant_client() from core.search
+# and get_openai_client() from core.generate, which build them on first use.
 
@@ -0,0 +1,96 @@
+# core/dedupe.py
+# Grouping of repeated and near-duplicate questions within one RFP
+
+import math
+import re
+from collections import Counter, defaultdict
+
+from core.config import DEDUP_SHINGLE_SIZE, DEDUP_SIMILARITY
+from core.embedding_cache import normalize_text
+
+_NUMBER = re.compile(r"\d+")
+_PUNCTUATION = re.compile(r"[^\w\s]")
+
+
+def canonical_question(text: str) -> str:
+    """Lowercase, strip punctuation and collapse whitespace so trivial variants compare equal."""
+    return normalize_text(_PUNCTUATION.sub(" ", normalize_text(text).casefold()))
+
+
+def shingles(text: str, size: int = DEDUP_SHINGLE_SIZE) -> frozenset:
+    """Return the set of overlapping character `size`-grams of a canonical question."""
+    if len(text) <= size:
+        return frozenset([text])
+    return frozenset(text[i:i + size] for i in range(len(text) - size + 1))
+
+
+def _jaccard(a, b):
+    overlap = len(a & b)
+    return overlap / (len(a) + len(b) - overlap)
+
+
+def _prefix(shingle_set, frequency, threshold):
+    # Two sets with Jaccard >= threshold must share one of their rarest
+    # |s| - ceil(threshold * |s|) + 1 shingles
+    ordered = sorted(shingle_set, key=lambda s: (frequency[s], s))
+    return ordered[:len(ordered) - math.ceil(threshold * len(ordered)) + 1]
+
+
+def group_duplicates(questions: list[str], threshold: float = DEDUP_SIMILARITY,
+                     size: int = DEDUP_SHINGLE_SIZE):
+    """
+    Group questions that are exact or near-duplicates of an earlier question.
+
+    Questions are first grouped by canonical text. Each remaining question is
+    compared with the first question of every existing group by Jaccard
+    similarity of character shingles. Questions that mention different
+    numbers (section 4 vs section 5) are never grouped. Candidate groups come
+    from an inverted index over the rarest shingles of each representative
+    (prefix filtering), which finds every pair above `threshold` without
+    comparing all pairs.
+
+    Args:
+        questions: Questions in document order
+        threshold: Minimum Jaccard similarity to treat two questions as the same
+        size: Shingle length in characters
+
+    Returns:
+        Tuple of (representatives, assignment): representatives are the
+        indexes of the first question of each group, in document order, and
+        assignment[i] is the position in `representatives` of the group that
+        question i belongs to
+    """
+    canonical = [canonical_question(q) for q in questions]
+    shingle_sets = [shingles(c, size) for c in canonical]
+    numbers = [_NUMBER.findall(c) for c in canonical]
+    frequency = Counter(s for shingle_set in shingle_sets for s in shingle_set)
+
+    representatives = []
+    assignment = []
+    by_text = {}
+    index = defaultdict(list)  # Prefix shingle -> groups whose representative has it
+
+    for i, (text, shingle_set) in enumerate(zip(canonical, shingle_sets)):
+        group = by_text.get(text)
+        prefix = _prefix(shingle_set, frequency, threshold) if group is None and threshold < 1.0 else ()
+
+        if prefix:
+            best_score = threshold
+            for candidate in sorted({g for s in prefix for g in index[s]}):
+                rep = representatives[candidate]
+                if numbers[rep] != numbers[i]:
+                    continue
+                score = _jaccard(shingle_set, shingle_sets[rep])
+                if score > best_score or (group is None and score >= threshold):
+                    group, best_score = candidate, score
+
+        if group is None:
+            group = len(representatives)
+            representatives.append(i)
+            by_text[text] = group
+            for s in prefix:
+                index[s].append(group)
+
+        assignment.append(group)
+
+    return representatives, assignment
@@ -0,0 +1,203 @@
+# core/docx_stream.py
+# Streaming, table-aware DOCX reader for question and Q&A extraction
+
+import zipfile
+import xml.etree.ElementTree as ET
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+BODY = W + "body"
+P = W + "p"
+R = W + "r"
+HYPERLINK = W + "hyperlink"
+TBL = W + "tbl"
+TR = W + "tr"
+TC = W + "tc"
+BR = W + "br"
+
+# Run content translated the same way python-docx's Run.text does
+RUN_TEXT = {
+    W + "t": None,
+    W + "tab": "\t",
+    W + "ptab": "\t",
+    W + "cr": "\n",
+    W + "noBreakHyphen": "-",
+    BR: None,
+}
+
+
+def _run_item_text(elem):
+    if elem.tag == W + "t":
+        return elem.text or ""
+    if elem.tag == BR:
+        # Page and column breaks carry no text
+        return "\n" if elem.get(W + "type", "textWrapping") == "textWrapping" else ""
+    return RUN_TEXT[elem.tag]
+
+
+def _in_paragraph_run(stack):
+    """True if the element just closed sat in a run directly inside a paragraph (or its hyperlink)."""
+    if len(stack) < 2 or stack[-1].tag != R:
+        return False
+    if stack[-2].tag == P:
+        return True
+    return len(stack) >= 3 and stack[-2].tag == HYPERLINK and stack[-3].tag == P
+
+
+def iter_docx_blocks(file_path):
+    """
+    Stream the body of a DOCX file in document order without building a Document.
+
+    `word/document.xml` is read straight out of the zip with incremental XML
+    parsing, and finished elements are discarded as soon as they are yielded,
+    so memory stays bounded regardless of document length.
+
+    Args:
+        file_path: Path (or file-like object) of the .docx file
+
+    Yields:
+        ("paragraph", text) for each body-level paragraph, and
+        ("row", cells) for each table row, where cells is a list with one list
+        of paragraph texts per cell
+    """
+    with zipfile.ZipFile(file_path) as archive, archive.open("word/document.xml") as xml:
+        stack = []       # Open elements, outermost first
+        paragraphs = []  # Text parts for each open w:p
+        cells = []       # Paragraph texts for each open w:tc
+        rows = []        # Cells for each open w:tr
+
+        for event, elem in ET.iterparse(xml, events=("start", "end")):
+            if event == "start":
+                stack.append(elem)
+                if elem.tag == P:
+                    paragraphs.append([])
+                elif elem.tag == TC:
+                    cells.append([])
+                elif elem.tag == TR:
+                    rows.append([])
+                continue
+
+            stack.pop()
+            tag = elem.tag
+            parent = stack[-1] if stack else None
+
+            if tag in RUN_TEXT:
+                if _in_paragraph_run(stack):
+                    paragraphs[-1].append(_run_item_text(elem))
+            elif tag == P:
+                text = "".join(paragraphs.pop())
+                if parent is not None and parent.tag == BODY:
+                    yield "paragraph", text
+                elif parent is not None and parent.tag == TC:
+                    cells[-1].append(text)
+                elem.clear()
+            elif tag == TC:
+                rows[-1].append(cells.pop())
+                elem.clear()
+            elif tag == TR:
+                yield "row", rows.pop()
+                elem.clear()
+            elif tag == TBL:
+                elem.clear()
+
+            # Detach finished top-level blocks so the tree never grows
+            if parent is not None and parent.tag == BODY and tag in (P, TBL):
+                parent.remove(elem)
+
+
+def is_question(text):
+    """Heuristic used by the pipeline to decide whether a paragraph is a question."""
+    return text.endswith("?") and len(text.split()) > 3
+
+
+def iter_questions(file_path):
+    """
+    Yield question paragraphs from body text and table cells, in document order.
+    """
+    for kind, content in iter_docx_blocks(file_path):
+        if kind == "paragraph":
+            texts = [content.strip()]
+        else:
+            texts = [text.strip() for cell in content for text in cell]
+
+        for text in texts:
+            if is_question(text):
+                yield text
+
+
+class _QAPairer:
+    """
+    Pair each question (text ending with '?') with the text that immediately follows it.
+
+    A question followed by another question, or by nothing, has no valid answer
+    and is reported and dropped.
+    """
+
+    def __init__(self):
+        self.pending = None
+
+    def feed(self, text):
+        """Consume the next non-empty text; return a Q&A dict when a pair completes."""
+        if self.pending is not None:
+            question = self.pending
+            self.pending = None
+            # Answer shouldn't be another question
+            if not text.endswith("?"):
+                return {"question": question, "answer": text}
+            print(f"[WARNING] Question without valid answer: {question[:60]}...")
+
+        if text.endswith("?"):
+            self.pending = text
+        return None
+
+    def finish(self):
+        if self.pending is not None:
+            print(f"[WARNING] Question without valid answer: {self.pending[:60]}...")
+            self.pending = None
+
+
+def _row_units(cells):
+    """
+    Flatten a table row into the texts used for pairing.
+
+    A cell that contains a question is split into its paragraphs; any other
+    cell is kept whole, so a multi-paragraph answer cell stays one answer.
+    """
+    for cell in cells:
+        texts = [text.strip() for text in cell if text.strip()]
+        if any(text.endswith("?") for text in texts):
+            yield from texts
+        elif texts:
+            yield "\n".join(texts)
+
+
+def iter_qa_pairs(file_path):
+    """
+    Yield question-answer pairs from body paragraphs and table rows.
+
+    Body paragraphs follow the archive format: a question ending with '?' is
+    answered by the next non-empty paragraph. In tables, each row is paired on
+    its own, which covers both "question | answer" rows and cells holding a
+    question followed by its answer.
+
+    Yields:
+        Dicts with 'question' and 'answer' keys, in document order
+    """
+    body = _QAPairer()
+
+    for kind, content in iter_docx_blocks(file_path):
+        if kind == "paragraph":
+            text = content.strip()
+            if text:
+                pair = body.feed(text)
+                if pair:
+                    yield pair
+            continue
+
+        row = _QAPairer()
+        for text in _row_units(content):
+            pair = row.feed(text)
+            if pair:
+                yield pair
+        row.finish()
+
+    body.finish()
@@ -0,0 +1,285 @@
+# core/draft_cache.py
+# Semantic cache of search results and drafts, keyed by question embedding
+
+import json
+import os
+import sqlite3
+import threading
+from array import array
+
+from core.config import (
+    DRAFT_CACHE_ENABLED, DRAFT_CACHE_MAX_ENTRIES, DRAFT_CACHE_PATH, DRAFT_CACHE_SIMILARITY, get_settings,
+)
+from core.manifest import ArchiveManifest
+from core.search_hit import SearchHit
+
+
+def knowledge_base_revision() -> str:
+    """Identify the current archive contents; cached drafts are only valid for one revision."""
+    settings = get_settings()
+    revision = f"{settings.search_backend}:{ArchiveManifest(settings.collection_name).revision()}"
+    if settings.search_backend == "local":
+        # The local index is refreshed from Qdrant or a snapshot without touching the manifest
+        from core.local_index import local_index_revision
+
+        revision += f":{local_index_revision()}"
+    return revision
+
+
+def _serialize_results(results) -> str:
+    return json.dumps([SearchHit.from_point(r).to_dict() for r in results], ensure_ascii=False)
+
+
+def _deserialize_results(data: str) -> list:
+    # Entries written before SearchHit stored the whole payload
+    return [SearchHit.from_payload(r["id"], r["score"], r["payload"]) if "payload" in r else SearchHit.from_dict(r)
+            for r in json.loads(data)]
+
+
+class DraftCache:
+    """
+    SQLite-backed cache of answered questions, matched by cosine similarity.
+
+    Each entry stores a question's embedding, its search results and the
+    drafted result. A lookup returns the entry whose embedding is most
+    similar to the query if that similarity is at least `threshold`. Cached
+    vectors are kept in memory as one normalized matrix, so a batch of
+    lookups is a single matrix multiply.
+
+    All entries belong to one knowledge-base revision; `sync_revision`
+    discards them when the archive changes. Past `max_entries`, the least
+    recently used entries are evicted. The instance is safe to share
+    between threads.
+    """
+
+    def __init__(self, path, threshold=DRAFT_CACHE_SIMILARITY, max_entries=DRAFT_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._ids = None
+        self._matrix = None
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS drafts ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " question TEXT NOT NULL,"
+            " vector BLOB NOT NULL,"
+            " results TEXT NOT NULL,"
+            " result TEXT NOT NULL,"
+            " last_used INTEGER NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_drafts_last_used ON drafts(last_used)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._conn.commit()
+
+        row = self._conn.execute("SELECT MAX(last_used) FROM drafts").fetchone()
+        self._clock = row[0] or 0
+
+    def _tick(self):
+        self._clock += 1
+        return self._clock
+
+    def sync_revision(self, revision: str):
+        """Drop every entry if the knowledge base changed since they were cached."""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'revision'").fetchone()
+            if row and row[0] == revision:
+                return
+            if row:
+                print("[INFO] Archive changed since drafts were cached; clearing the draft cache.")
+            self._conn.execute("DELETE FROM drafts")
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('revision', ?)", (revision,))
+            self._conn.commit()
+            self._ids = None
+            self._matrix = None
+
+    @staticmethod
+    def _normalized_rows(blobs):
+        import numpy as np
+
+        matrix = np.array([np.frombuffer(blob, dtype=np.float32) for blob in blobs])
+        return matrix / np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+
+    def _load_matrix(self):
+        import numpy as np
+
+        rows = self._conn.execute("SELECT id, vector FROM drafts").fetchall()
+        self._ids = np.array([row[0] for row in rows], dtype=np.int64)
+        self._matrix = self._normalized_rows([row[1] for row in rows]) if rows else None
+
+    def _update_matrix(self, new_ids, blobs, evicted):
+        """Append inserted rows to the in-memory matrix and drop evicted ones, instead of reloading it."""
+        import numpy as np
+
+        if self._ids is None:
+            return  # Not loaded yet; the next lookup loads everything
+        added = self._normalized_rows(blobs)
+        if self._matrix is not None and added.shape[1] != self._matrix.shape[1]:
+            self._ids = None  # Embedding size changed; reload on the next lookup
+            self._matrix = None
+            return
+
+        ids = np.concatenate([self._ids, np.array(new_ids, dtype=np.int64)])
+        matrix = added if self._matrix is None else np.vstack([self._matrix, added])
+        if evicted:
+            keep = ~np.isin(ids, evicted)
+            ids, matrix = ids[keep], matrix[keep]
+        self._ids = ids
+        self._matrix = matrix if len(ids) else None
+
+    def lookup_many(self, vectors) -> list:
+        """
+        Find cached answers for a batch of question embeddings.
+
+        Returns:
+            List aligned with `vectors`; each item is None on a miss or a
+            (results, result) tuple with the cached search results and the
+            cached result dict
+        """
+        if not vectors:
+            return []
+
+        import numpy as np
+
+        with self._lock:
+            if self._ids is None:
+                self._load_matrix()
+
+            matched = [None] * len(vectors)
+            if self._matrix is not None and len(vectors[0]) == self._matrix.shape[1]:
+                queries = np.asarray(vectors, dtype=np.float32)
+                queries /= np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+                scores = queries @ self._matrix.T
+                best = scores.argmax(axis=1)
+                for n, column in enumerate(best):
+                    if scores[n, column] >= self.threshold:
+                        matched[n] = int(self._ids[column])
+
+            hit_ids = sorted({entry_id for entry_id in matched if entry_id is not None})
+            found = {}
+            for start in range(0, len(hit_ids), 500):
+                chunk = hit_ids[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                for entry_id, results, result in self._conn.execute(
+                    f"SELECT id, results, result FROM drafts WHERE id IN ({placeholders})", chunk
+                ):
+                    found[entry_id] = (results, result)
+
+            if found:
+                tick = self._tick()
+                self._conn.executemany(
+                    "UPDATE drafts SET last_used = ? WHERE id = ?", [(tick, entry_id) for entry_id in found]
+                )
+                self._conn.commit()
+
+            answers = []
+            for entry_id in matched:
+                if entry_id in found:
+                    results, result = found[entry_id]
+                    answers.append((_deserialize_results(results), json.loads(result)))
+                else:
+                    answers.append(None)
+
+            hits = sum(1 for a in answers if a is not None)
+            self.hits += hits
+            self.misses += len(answers) - hits
+
+        return answers
+
+    def put_many(self, items):
+        """
+        Store answered questions, evicting least recently used entries if over capacity.
+
+        Args:
+            items: Iterable of (question, vector, results, result) tuples
+        """
+        rows = [
+            (question, array("f", vector).tobytes(), _serialize_results(results),
+             json.dumps(result, ensure_ascii=False))
+            for question, vector, results, result in items
+        ]
+        if not rows:
+            return
+
+        with self._lock:
+            tick = self._tick()
+            self._conn.executemany(
+                "INSERT INTO drafts (question, vector, results, result, last_used) VALUES (?, ?, ?, ?, ?)",
+                [row + (tick,) for row in rows]
+            )
+            # The tick is new, so it identifies exactly the rows just inserted
+            new_ids = [row[0] for row in self._conn.execute(
+                "SELECT id FROM drafts WHERE last_used = ? ORDER BY id", (tick,)
+            )]
+            evicted = []
+            count = self._conn.execute("SELECT COUNT(*) FROM drafts").fetchone()[0]
+            if count > self.max_entries:
+                evicted = [row[0] for row in self._conn.execute(
+                    "SELECT id FROM drafts ORDER BY last_used, id LIMIT ?", (count - self.max_entries,)
+                )]
+                self._conn.executemany("DELETE FROM drafts WHERE id = ?", [(entry_id,) for entry_id in evicted])
+            self._conn.commit()
+            self._update_matrix(new_ids, [row[1] for row in rows], evicted)
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM drafts")
+            self._conn.commit()
+            self._ids = None
+            self._matrix = None
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and the current number of cached drafts."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM drafts").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": entries,
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_draft_cache():
+    """
+    Return the shared draft cache, or None if it is disabled.
+
+    Every call re-checks the knowledge-base revision, so drafts cached before
+    an archive update are never served after it.
+    """
+    global _cache
+    if not DRAFT_CACHE_ENABLED:
+        return None
+
+    with _cache_lock:
+        if _cache is None:
+            try:
+                _cache = DraftCache(DRAFT_CACHE_PATH)
+            except sqlite3.Error as e:
+                print(f"[WARNING] Draft cache unavailable, continuing without it: {e}")
+                return None
+
+    try:
+        _cache.sync_revision(knowledge_base_revision())
+    except sqlite3.Error as e:
+        print(f"[WARNING] Draft cache unavailable, continuing without it: {e}")
+        return None
+    return _cache
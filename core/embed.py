@@ -2,48 +2,469 @@
 # Production-ready embedding with proper Q&A extraction
 
 import os
-import uuid
-from docx import Document
-from qdrant_client.models import PointStruct, VectorParams, Distance
-from core.generate import get_embedding
-from core.search import get_qdrant_client
-import streamlit as st
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 
-# Get collection name from secrets/config
-COLLECTION_NAME = st.secrets.get("COLLECTION_NAME", "past_rfp_answers")
+from core.archive_parse import collect_answer_entries, iter_parsed_documents
+from core.config import (
+    EMBEDDING_BATCH_SIZE, EMBEDDING_DIMENSIONS, QDRANT_HNSW_EF_CONSTRUCT, QDRANT_HNSW_M,
+    QDRANT_INDEXING_THRESHOLD, QDRANT_KEEP_VERSIONS, QDRANT_OPTIMIZE_TIMEOUT, QDRANT_QUANTIZATION,
+    QDRANT_UPLOAD_BATCH_SIZE, QDRANT_UPLOAD_MAX_RETRIES, QDRANT_UPLOAD_PARALLEL, QDRANT_UPLOAD_RETRY_DELAY,
+    QDRANT_VECTORS_ON_DISK, REBUILD_PARSE_WORKERS, SEARCH_COMPACT_DIMENSIONS, get_settings,
+)
+from core.collection_versions import (
+    alias_target, list_versions, live_collection, new_version_name, point_alias, prune_versions,
+)
+from core.docx_stream import iter_qa_pairs
+from core.generate import compact_vector, get_embeddings, looks_like_question
+from core.manifest import ArchiveManifest
+from core.question_index import open_question_index
+from core.search import COMPACT_VECTOR, FULL_VECTOR, KIND_FIELD, get_qdrant_client
 
 
-def ensure_correct_collection():
+def quantization_config(kind):
     """
-    Recreate the Qdrant collection with correct vector dimensions and distance metric.
-    
-    WARNING: This deletes all existing data in the collection.
-    Only call this when explicitly setting up or resetting the database.
+    Return the Qdrant quantization config for a QDRANT_QUANTIZATION value.
+
+    Args:
+        kind: "none", "scalar" (int8) or "binary"
+
+    Returns:
+        ScalarQuantization, BinaryQuantization or None
+
+    Raises:
+        ValueError: If `kind` is not one of the supported values
+    """
+    from qdrant_client.models import (
+        BinaryQuantization, BinaryQuantizationConfig, ScalarQuantization, ScalarQuantizationConfig, ScalarType,
+    )
+
+    if kind == "none":
+        return None
+    if kind == "scalar":
+        # Clip the 1% most extreme values so they do not stretch the int8 range
+        return ScalarQuantization(
+            scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=True)
+        )
+    if kind == "binary":
+        return BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=True))
+    raise ValueError(f"Unknown quantization '{kind}'; expected 'none', 'scalar' or 'binary'.")
+
+
+def vectors_config(dimensions=EMBEDDING_DIMENSIONS, compact_dimensions=SEARCH_COMPACT_DIMENSIONS, on_disk=False):
+    """
+    Return the Qdrant vector configuration for the collection.
+
+    Without compact vectors this is a single unnamed COSINE vector. With
+    `compact_dimensions`, points carry a FULL_VECTOR and a COMPACT_VECTOR; the
+    compact vectors always stay in RAM, since every search scans them.
+
+    Raises:
+        ValueError: If the compact vector is not smaller than the full one
+    """
+    from qdrant_client.models import Distance, VectorParams
+
+    full = VectorParams(size=dimensions, distance=Distance.COSINE, on_disk=on_disk)
+    if not compact_dimensions:
+        return full
+    if not 0 < compact_dimensions < dimensions:
+        raise ValueError(
+            f"Compact vectors need fewer dimensions than the full vectors ({compact_dimensions} >= {dimensions})."
+        )
+    return {
+        FULL_VECTOR: full,
+        COMPACT_VECTOR: VectorParams(size=compact_dimensions, distance=Distance.COSINE, on_disk=False),
+    }
+
+
+def create_collection(client, collection_name, quantization=QDRANT_QUANTIZATION, on_disk=QDRANT_VECTORS_ON_DISK,
+                      dimensions=EMBEDDING_DIMENSIONS, compact_dimensions=SEARCH_COMPACT_DIMENSIONS,
+                      bulk_load=False, hnsw_m=QDRANT_HNSW_M, hnsw_ef_construct=QDRANT_HNSW_EF_CONSTRUCT):
+    """
+    Create an empty collection with correct vector dimensions and distance metric.
+
+    Args:
+        client: Qdrant client
+        collection_name: Name of the new collection
+        quantization: "none", "scalar" or "binary" (see quantization_config).
+            Quantized vectors are kept in RAM and searched first; the original
+            vectors are used to rescore the best candidates.
+        on_disk: Store the original float32 vectors on disk instead of in RAM
+        dimensions: Embedding size (EMBEDDING_DIMENSIONS)
+        compact_dimensions: Size of the compact vectors used for two-stage
+            search, or 0 for a single vector (see vectors_config)
+        bulk_load: Create the collection with HNSW indexing suspended, so a
+            full load does not rebuild the graph as points arrive. Call
+            finish_bulk_load once every point is uploaded.
+        hnsw_m: Edges per node of the HNSW graph
+        hnsw_ef_construct: Candidate list size while building the graph
+    """
+    from qdrant_client.models import HnswConfigDiff, OptimizersConfigDiff
+
+    client.create_collection(
+        collection_name=collection_name,
+        vectors_config=vectors_config(dimensions, compact_dimensions, on_disk),
+        quantization_config=quantization_config(quantization),
+        hnsw_config=HnswConfigDiff(m=hnsw_m, ef_construct=hnsw_ef_construct),
+        # An indexing threshold of 0 keeps every segment unindexed until finish_bulk_load
+        optimizers_config=OptimizersConfigDiff(indexing_threshold=0) if bulk_load else None
+    )
+    ensure_payload_index(client, collection_name)
+    compact = f", compact vectors: {compact_dimensions}" if compact_dimensions else ""
+    deferred = ", indexing deferred for bulk load" if bulk_load else ""
+    print(f"[INFO] Collection '{collection_name}' created with {dimensions} dimensions "
+          f"(quantization: {quantization}, vectors on disk: {on_disk}, "
+          f"HNSW m={hnsw_m} ef_construct={hnsw_ef_construct}{compact}{deferred}).")
+
+
+def ensure_correct_collection(**collection_options):
+    """
+    Replace the live collection with a new, empty one (see create_collection).
+
+    WARNING: Searches see an empty archive afterwards. The previous collection
+    is kept as an older version (QDRANT_KEEP_VERSIONS of them are kept) and can
+    be restored with rollback_collection. Use rebuild_archive to rebuild
+    without ever serving an empty collection.
+
+    Args:
+        **collection_options: Options for create_collection (quantization,
+            on_disk, dimensions, compact_dimensions, bulk_load, hnsw_m,
+            hnsw_ef_construct)
     """
     client = get_qdrant_client()
     if client is None:
         raise RuntimeError("Qdrant client is not available.")
     
+    alias = get_settings().collection_name
     try:
-        client.recreate_collection(
-            collection_name=COLLECTION_NAME,
-            vectors_config=VectorParams(
-                size=1536,  # Required by OpenAI text-embedding-3-small
-                distance=Distance.COSINE
-            )
-        )
-        print(f"[INFO] Collection '{COLLECTION_NAME}' recreated with 1536 dimensions.")
+        version = new_version_name(client, alias)
+        create_collection(client, version, **collection_options)
+        point_alias(client, alias, version)
+        prune_versions(client, alias, QDRANT_KEEP_VERSIONS)
+
+        # The collection is empty now, so nothing recorded in the manifest exists any more
+        manifest = ArchiveManifest(alias)
+        manifest.clear()
+        manifest.save()
+        question_index = open_question_index()
+        if question_index is not None:
+            question_index.reset(manifest.revision())
     except Exception as e:
         print(f"[ERROR] Could not recreate collection: {e}")
         raise
 
 
+def build_version(client, load, keep_versions=QDRANT_KEEP_VERSIONS, **collection_options):
+    """
+    Fill a new collection version and make it live once it is verified.
+
+    The live collection keeps serving searches throughout. The new version is
+    bulk loaded by default (see create_collection), its point count is
+    checked against what `load` reports and, once its HNSW graph is built,
+    the collection alias is swapped to it in one step. The manifest and
+    question index are then rebuilt from the new collection. If anything
+    fails, the new version is deleted and the live collection is left as it was.
+
+    Args:
+        client: Qdrant client
+        load: Callable(version) that uploads the points into collection
+            `version` and returns how many it uploaded
+        keep_versions: Older versions to keep for rollback_collection
+        **collection_options: Options for create_collection
+
+    Returns:
+        Name of the collection now live
+
+    Raises:
+        RuntimeError: If the point count does not match; anything raised by
+            `load` is re-raised. The live collection is unchanged.
+    """
+    alias = get_settings().collection_name
+    version = new_version_name(client, alias)
+    collection_options.setdefault("bulk_load", True)
+    create_collection(client, version, **collection_options)
+
+    try:
+        expected = load(version)
+        stored = client.count(collection_name=version, exact=True).count
+        if stored != expected:
+            raise RuntimeError(f"Collection '{version}' holds {stored} points but {expected} were uploaded.")
+
+        if collection_options["bulk_load"]:
+            finish_bulk_load(collection_name=version)
+    except Exception:
+        print(f"[ERROR] Loading '{version}' failed; deleting it and keeping the live collection.")
+        client.delete_collection(version)
+        raise
+
+    _switch_to_version(client, alias, version)
+    prune_versions(client, alias, keep_versions)
+    return version
+
+
+def rebuild_archive(file_paths, progress_callback=None, workers=REBUILD_PARSE_WORKERS,
+                    keep_versions=QDRANT_KEEP_VERSIONS, **collection_options):
+    """
+    Re-embed the archive into a new collection version and switch searches to it.
+
+    See build_version: searches are served by the live collection until the
+    new version is complete and verified.
+
+    Args:
+        file_paths: Paths to finalized RFP .docx files
+        progress_callback: Optional callable(done, total, file_path, result),
+            as for embed_rfp_archive
+        workers: Number of DOCX parser processes
+        keep_versions: Older versions to keep for rollback_collection
+        **collection_options: Options for create_collection
+
+    Returns:
+        Dict mapping each file path to the number of points uploaded
+
+    Raises:
+        RuntimeError: If Qdrant is unavailable, a document failed or the point
+            count does not match; the live collection is unchanged
+    """
+    client = get_qdrant_client()
+    if client is None:
+        raise RuntimeError("Qdrant client is not available. Cannot rebuild the archive.")
+
+    results = {}
+
+    def load(version):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            manifest = ArchiveManifest(version, path=os.path.join(tmp_dir, "manifest.json"))
+            results.update(embed_rfp_archive(file_paths, progress_callback=progress_callback, workers=workers,
+                                             manifest=manifest))
+
+        failed = [path for path, result in results.items() if isinstance(result, Exception)]
+        if failed:
+            raise RuntimeError(f"{len(failed)} document(s) failed to sync, first: {failed[0]}")
+        return sum(len(manifest.get(source)) for source in manifest.sources())
+
+    build_version(client, load, keep_versions, **collection_options)
+    return results
+
+
+def rollback_collection(version=None):
+    """
+    Point searches back at an older collection version.
+
+    Args:
+        version: Version to restore (see list_versions); by default the newest
+            one older than the live collection
+
+    Returns:
+        Name of the collection now live
+
+    Raises:
+        RuntimeError: If Qdrant is unavailable or there is no older version
+        ValueError: If `version` is not a version of the collection
+    """
+    client = get_qdrant_client()
+    if client is None:
+        raise RuntimeError("Qdrant client is not available.")
+
+    alias = get_settings().collection_name
+    versions = list_versions(client, alias)
+    if version is None:
+        live = alias_target(client, alias)
+        older = [name for name in versions if live is None or name < live]
+        if not older:
+            raise RuntimeError(f"No older version of '{alias}' to roll back to.")
+        version = older[-1]
+    elif version not in versions:
+        raise ValueError(f"'{version}' is not a version of '{alias}'; available: {', '.join(versions) or 'none'}")
+
+    _switch_to_version(client, alias, version)
+    return version
+
+
+def _switch_to_version(client, alias, version, page_size=1024):
+    """
+    Swap `alias` to `version` and rebuild the archive manifest and question index from its points.
+
+    The local records describe the live collection, so they are rebuilt from
+    the contents of the version that becomes live.
+    """
+    entries = {}
+    offset = None
+    while True:
+        records, offset = client.scroll(
+            collection_name=version,
+            limit=page_size,
+            offset=offset,
+            with_payload=["source", "question", "answer", KIND_FIELD],
+            with_vectors=False
+        )
+        for record in records:
+            payload = record.payload or {}
+            entries.setdefault(payload.get("source", "Unknown"), []).append({
+                "id": str(record.id),
+                "question": payload.get("question", ""),
+                "answer": payload.get("answer", ""),
+                "kind": payload.get(KIND_FIELD, "answer"),
+            })
+        if offset is None:
+            break
+
+    # Stop exact-match answers from the old version before searches move to the new one
+    question_index = open_question_index()
+    if question_index is not None:
+        question_index.reset("")
+
+    point_alias(client, alias, version)
+
+    if question_index is not None:
+        for source, source_entries in entries.items():
+            question_index.sync_document(source, source_entries, "", "")
+
+    manifest = ArchiveManifest(alias)
+    manifest.clear()
+    for source, source_entries in entries.items():
+        manifest.set(source, {entry["id"] for entry in source_entries})
+    manifest.save()
+
+    if question_index is not None:
+        question_index.mark_synced(manifest.revision())
+    print(f"[INFO] Archive records rebuilt from '{version}' ({len(entries)} documents).")
+
+
+def finish_bulk_load(collection_name=None, indexing_threshold=QDRANT_INDEXING_THRESHOLD,
+                     timeout=QDRANT_OPTIMIZE_TIMEOUT, poll_interval=1.0):
+    """
+    Re-enable HNSW indexing after a bulk load and wait until the graph is built.
+
+    Call this after create_collection(bulk_load=True) and the upload,
+    whether or not every document succeeded: until it runs, the collection
+    is searched by full scan.
+
+    Args:
+        collection_name: Collection that was bulk loaded (default: the live one)
+
+    Returns:
+        The collection info once optimization has finished
+
+    Raises:
+        RuntimeError: If the Qdrant client is unavailable or the optimizer failed
+        TimeoutError: If optimization is still running after `timeout` seconds
+    """
+    from qdrant_client.models import OptimizersConfigDiff
+
+    client = get_qdrant_client()
+    if client is None:
+        raise RuntimeError("Qdrant client is not available.")
+
+    collection_name = collection_name or live_collection(client, get_settings().collection_name)
+    client.update_collection(
+        collection_name=collection_name,
+        optimizers_config=OptimizersConfigDiff(indexing_threshold=indexing_threshold)
+    )
+    print(f"[INFO] Indexing re-enabled for '{collection_name}'; waiting for the HNSW graph to be built...")
+
+    start = time.monotonic()
+    info = wait_for_optimization(client, collection_name, timeout, poll_interval)
+    print(f"[INFO] Collection '{collection_name}' optimized in {time.monotonic() - start:.1f}s "
+          f"({info.points_count} points).")
+    return info
+
+
+def wait_for_optimization(client, collection_name, timeout=QDRANT_OPTIMIZE_TIMEOUT, poll_interval=1.0):
+    """
+    Poll the collection until its optimizers are idle (status green); see finish_bulk_load.
+
+    A grey collection has optimizations pending that Qdrant has not started
+    (for example after a restart); an empty optimizer update triggers them.
+    """
+    from qdrant_client.models import CollectionStatus, OptimizersConfigDiff, OptimizersStatusOneOf
+
+    deadline = time.monotonic() + timeout
+    triggered = False
+    while True:
+        info = client.get_collection(collection_name)
+        if info.optimizer_status != OptimizersStatusOneOf.OK:
+            raise RuntimeError(f"Optimizer failed for '{collection_name}': {info.optimizer_status.error}")
+        if info.status == CollectionStatus.GREEN:
+            return info
+        if info.status == CollectionStatus.GREY and not triggered:
+            triggered = True
+            print(f"[INFO] Optimizations for '{collection_name}' are pending; triggering them.")
+            client.update_collection(collection_name=collection_name, optimizers_config=OptimizersConfigDiff())
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f"Collection '{collection_name}' is still optimizing after {timeout}s "
+                               f"(status: {info.status.value}).")
+        time.sleep(poll_interval)
+
+
+def ensure_payload_index(client, collection_name):
+    """Index the KIND_FIELD payload field, which every search filters on. Safe to repeat."""
+    from qdrant_client.models import PayloadSchemaType
+
+    client.create_payload_index(
+        collection_name=collection_name,
+        field_name=KIND_FIELD,
+        field_schema=PayloadSchemaType.KEYWORD
+    )
+
+
+def classify_unlabeled_points(client, collection_name, page_size=256):
+    """
+    Set KIND_FIELD on points archived before answers were classified at ingestion.
+
+    Returns:
+        Number of points updated
+    """
+    from qdrant_client.models import Filter, IsEmptyCondition, PayloadField
+
+    unlabeled = Filter(must=[IsEmptyCondition(is_empty=PayloadField(key=KIND_FIELD))])
+    updated = 0
+    offset = None
+    while True:
+        records, offset = client.scroll(
+            collection_name=collection_name,
+            scroll_filter=unlabeled,
+            limit=page_size,
+            offset=offset,
+            with_payload=["answer", "text", "text_content"],
+            with_vectors=False
+        )
+        by_kind = {"answer": [], "question": []}
+        for record in records:
+            payload = record.payload or {}
+            answer = payload.get("answer") or payload.get("text") or payload.get("text_content") or ""
+            by_kind["question" if looks_like_question(answer) else "answer"].append(record.id)
+        for kind, ids in by_kind.items():
+            if ids:
+                client.set_payload(collection_name=collection_name, payload={KIND_FIELD: kind}, points=ids)
+                updated += len(ids)
+        if offset is None:
+            break
+
+    if updated:
+        print(f"[INFO] Classified {updated} previously archived point(s) as answers or questions.")
+    return updated
+
+
+def point_vector(vector, compact_dimensions=SEARCH_COMPACT_DIMENSIONS):
+    """Return the vector(s) to store for one embedding, matching vectors_config."""
+    if not compact_dimensions:
+        return vector
+    return {FULL_VECTOR: vector, COMPACT_VECTOR: compact_vector(vector, compact_dimensions)}
+
+
 def extract_qa_from_docx(file_path):
     """
     Extract question-answer pairs from a DOCX file.
     
     Format assumption: Questions end with '?' and are immediately followed by 
-    their answer in the next paragraph.
+    their answer in the next paragraph. Questionnaire tables are also read,
+    pairing a question cell with the answer cell(s) in the same row.
+
+    The document is streamed (see core.docx_stream) instead of being loaded
+    into a python-docx object tree.
     
     Args:
         file_path: Path to the .docx file
@@ -51,42 +472,164 @@ def extract_qa_from_docx(file_path):
     Returns:
         List of dicts with 'question' and 'answer' keys
     """
-    doc = Document(file_path)
-    qa_pairs = []
-    paras = [p.text.strip() for p in doc.paragraphs if p.text.strip()]
-    
-    i = 0
-    while i < len(paras):
-        if paras[i].endswith("?"):
-            question = paras[i]
-            answer = paras[i + 1] if i + 1 < len(paras) else ""
-            
-            # Only add pairs that have both question and answer
-            if answer and not answer.endswith("?"):  # Answer shouldn't be another question
-                qa_pairs.append({
-                    "question": question,
-                    "answer": answer
-                })
-                i += 2  # Skip both question and answer
-            else:
-                print(f"[WARNING] Question without valid answer: {question[:60]}...")
-                i += 1
-        else:
-            i += 1
-    
-    return qa_pairs
+    return list(iter_qa_pairs(file_path))
+
+
+def _iter_points(entries, vectors):
+    """Pair Q&A entries with their embeddings, skipping (and logging) entries that failed to embed."""
+    from qdrant_client.models import PointStruct
+
+    for entry, vector in zip(entries, vectors):
+        if vector is None:
+            print(f"[ERROR] Failed to embed answer for '{entry['question'][:60]}...'")
+            continue
+
+        yield PointStruct(
+            id=entry["id"],
+            payload={
+                "question": entry["question"],  # Store for reference
+                "answer": entry["answer"],      # This is what we embedded
+                "source": entry["source"],
+                KIND_FIELD: entry["kind"]       # "answer" or "question"; search skips questions
+            },
+            vector=point_vector(vector)
+        )
+
+
+def _embed_points(entries, failed):
+    """
+    Embed `entries` EMBEDDING_BATCH_SIZE at a time and yield their points.
+
+    Only one batch of embeddings is held at a time, however large the document.
+
+    Args:
+        entries: Entries to embed (see collect_answer_entries)
+        failed: List that entries which could not be embedded are appended to
+    """
+    for start in range(0, len(entries), EMBEDDING_BATCH_SIZE):
+        batch = entries[start:start + EMBEDDING_BATCH_SIZE]
+        vectors = get_embeddings([entry["answer"] for entry in batch])
+        failed.extend(entry for entry, vector in zip(batch, vectors) if vector is None)
+        yield from _iter_points(batch, vectors)
+
+
+def upload_points(client, collection_name, points, batch_size=QDRANT_UPLOAD_BATCH_SIZE,
+                  parallel=QDRANT_UPLOAD_PARALLEL, max_retries=QDRANT_UPLOAD_MAX_RETRIES,
+                  retry_delay=QDRANT_UPLOAD_RETRY_DELAY):
+    """
+    Stream points to a collection in bounded batches, several in flight at once.
+
+    `points` may be a generator; it is consumed as batches are sent, and at
+    most `parallel` batches are held at a time, so the request size and memory
+    use do not grow with the number of points. Each batch is upserted on a
+    pool of `parallel` threads and waited for, so the points are stored when
+    this returns. A failed batch is attempted up to `max_retries` times in
+    all, waiting `retry_delay` seconds before the second attempt and twice as
+    long before each one after that.
+
+    Returns:
+        List of the uploaded point IDs, in input order
+
+    Raises:
+        Exception: The error of a batch that failed on every attempt
+    """
+    def send(batch):
+        attempts = max(1, max_retries)
+        for attempt in range(attempts):
+            try:
+                client.upsert(collection_name=collection_name, points=batch, wait=True)
+                return [point.id for point in batch]
+            except Exception as e:
+                if attempt + 1 == attempts:
+                    raise
+                delay = retry_delay * 2 ** attempt
+                print(f"[WARNING] Upload of {len(batch)} points to '{collection_name}' failed ({e}). "
+                      f"Retrying in {delay:.1f}s.")
+                time.sleep(delay)
+
+    uploaded = []
+    points = iter(points)
+    batches = iter(lambda: list(islice(points, batch_size)), [])
+    parallel = max(1, parallel)
+    with ThreadPoolExecutor(max_workers=parallel, thread_name_prefix="qdrant-upload") as executor:
+        in_flight = deque()
+        for batch in batches:
+            if len(in_flight) == parallel:
+                uploaded.extend(in_flight.popleft().result())
+            in_flight.append(executor.submit(send, batch))
+        while in_flight:
+            uploaded.extend(in_flight.popleft().result())
+    return uploaded
+
+
+def _sync_document(client, manifest, source, entries, points, question_index=None):
+    """
+    Upsert a document's new points and delete the ones it no longer contains.
+
+    The manifest and, if given, the question index are updated to match.
+
+    Args:
+        client: Qdrant client
+        manifest: ArchiveManifest recording what is already stored
+        source: Document file name used as the manifest key
+        entries: All current entries for the document (see collect_answer_entries)
+        points: Newly embedded points to upload (any iterable, streamed by upload_points)
+        question_index: QuestionIndex of the live collection, or None
+
+    Returns:
+        Tuple of (uploaded, deleted) point counts
+    """
+    from qdrant_client.models import PointIdsList
+
+    known = manifest.get(source)
+    current = {entry["id"] for entry in entries}
+    stale = sorted(known - current)
+
+    uploaded = upload_points(client, manifest.collection_name, points)
+    if stale:
+        client.delete(
+            collection_name=manifest.collection_name,
+            points_selector=PointIdsList(points=stale)
+        )
+
+    # Entries that failed to embed are left out so the next run retries them
+    previous_revision = manifest.revision()
+    stored = (known & current) | set(uploaded)
+    manifest.set(source, stored)
+    manifest.save()
+
+    if question_index is not None:
+        question_index.sync_document(
+            source, [entry for entry in entries if entry["id"] in stored], previous_revision, manifest.revision()
+        )
+    return len(uploaded), len(stale)
+
+
+def _new_entries(manifest, entries):
+    """Return the entries whose point IDs are not yet recorded for their document."""
+    if not entries:
+        return []
+    known = manifest.get(entries[0]["source"])
+    return [entry for entry in entries if entry["id"] not in known]
 
 
-def embed_final_rfp(file_path):
+def embed_final_rfp(file_path, source_name=None):
     """
     Load a final RFP draft from DOCX, extract Q&A pairs, and upload to Qdrant.
     
     IMPORTANT: Only the ANSWERS are embedded, not the questions. This prevents
     questions from polluting search results. The questions are stored in the
     payload for reference.
+
+    Point IDs are derived from the document name and Q&A content, so
+    re-archiving a document only embeds pairs that changed and deletes pairs
+    that were removed, instead of piling up duplicates.
     
     Args:
         file_path: Path to the finalized RFP .docx file
+        source_name: Document name to archive it under (default: the file's
+            basename). Pass the original name when `file_path` is a temporary
+            copy, so point IDs match the copy kept in past_rfps/.
         
     Raises:
         RuntimeError: If Qdrant client is unavailable
@@ -95,57 +638,150 @@ def embed_final_rfp(file_path):
     if client is None:
         raise RuntimeError("Qdrant client is not available. Cannot embed RFP.")
 
+    source = source_name or os.path.basename(file_path)
+    manifest = ArchiveManifest(get_settings().collection_name)
+
     # Extract Q&A pairs from the document
-    qa_pairs = extract_qa_from_docx(file_path)
+    entries, skipped = collect_answer_entries(file_path, source)
     
-    if not qa_pairs:
+    if not entries:
         print(f"[WARNING] No Q&A pairs found in {file_path}. Check document format.")
-        return
-    
-    print(f"[INFO] Extracted {len(qa_pairs)} Q&A pairs from {os.path.basename(file_path)}")
-    
-    points = []
-    skipped = 0
-    
-    for pair in qa_pairs:
-        answer = pair["answer"].strip()
-        question = pair["question"].strip()
-        
-        if not answer or len(answer) < 10:
-            print(f"[WARNING] Skipping too-short answer for: {question[:60]}...")
-            skipped += 1
-            continue
+        if not manifest.get(source):
+            return
+    else:
+        print(f"[INFO] Extracted {len(entries)} Q&A pairs from {source}")
+
+    # Embed ONLY the new answers (not the questions); points stream to Qdrant batch by batch
+    new_entries = _new_entries(manifest, entries)
+    failed = []
+
+    try:
+        uploaded, deleted = _sync_document(
+            client, manifest, source, entries, _embed_points(new_entries, failed), open_question_index()
+        )
+        skipped += len(failed)
+        print(f"[INFO] Uploaded {uploaded} new Q&A pairs to Qdrant "
+              f"({len(entries) - len(new_entries)} unchanged, {deleted} stale removed).")
+        if skipped > 0:
+            print(f"[INFO] Skipped {skipped} invalid entries.")
+    except Exception as e:
+        print(f"[ERROR] Failed to upload to Qdrant: {e}")
+        raise
+
+
+def embed_rfp_archive(file_paths, progress_callback=None, remove_missing=False,
+                      workers=REBUILD_PARSE_WORKERS, manifest=None):
+    """
+    Incrementally sync many finalized RFPs into Qdrant, pooling answers across documents.
+
+    Only Q&A pairs that are not already recorded in the archive manifest are
+    embedded; points for pairs that disappeared from a document are deleted.
+    Documents are parsed on a pool of `workers` processes and fed into a
+    shared embedding and upload stage as they complete. Small documents are
+    grouped until they hold at least EMBEDDING_BATCH_SIZE new answers, so
+    they share embedding requests; larger ones are embedded and uploaded one
+    batch at a time, so memory use does not grow with document size. A
+    document that fails to parse, embed or upload is recorded and the rest
+    of the archive continues.
+
+    Args:
+        file_paths: Paths to finalized RFP .docx files
+        progress_callback: Optional callable(done, total, file_path, result)
+            invoked once per document after it has been synced
+        remove_missing: If True, also delete the points of documents that are
+            in the manifest but not in `file_paths`. If every document then
+            synced, the question index is marked up to date.
+        workers: Number of DOCX parser processes (1 parses in-process)
+        manifest: ArchiveManifest of the collection to sync into; by default
+            the live collection's. Another collection (a version being built
+            by rebuild_archive) leaves the question index alone.
+
+    Returns:
+        Dict mapping each file path to the number of points uploaded, or to
+        the Exception that stopped that document
+
+    Raises:
+        RuntimeError: If Qdrant client is unavailable
+    """
+    client = get_qdrant_client()
+    if client is None:
+        raise RuntimeError("Qdrant client is not available. Cannot embed RFPs.")
+
+    file_paths = list(file_paths)
+    question_index = open_question_index() if manifest is None else None
+    if manifest is None:
+        manifest = ArchiveManifest(get_settings().collection_name)
+    results = {}
+
+    # Collections from before ingest-time classification need the index and labels once
+    ensure_payload_index(client, manifest.collection_name)
+    classify_unlabeled_points(client, manifest.collection_name)
+    chunk = []
 
+    def report(file_path, result):
+        results[file_path] = result
+        if progress_callback:
+            progress_callback(len(results), len(file_paths), file_path, result)
+
+    def sync(file_path, entries, new, points):
         try:
-            # Embed ONLY the answer (not the question)
-            vector = get_embedding(answer)
-            
-            point = PointStruct(
-                id=str(uuid.uuid4()),
-                payload={
-                    "question": question,      # Store for reference
-                    "answer": answer,          # This is what we embedded
-                    "source": os.path.basename(file_path)
-                },
-                vector=vector
+            uploaded, deleted = _sync_document(
+                client, manifest, os.path.basename(file_path), entries, points, question_index
             )
-            points.append(point)
-            
+            print(f"[INFO] {os.path.basename(file_path)}: uploaded {uploaded}, "
+                  f"unchanged {len(entries) - len(new)}, removed {deleted}.")
+            report(file_path, uploaded)
         except Exception as e:
-            print(f"[ERROR] Failed to embed answer for '{question[:60]}...': {e}")
-            skipped += 1
+            print(f"[ERROR] Failed to upload {file_path} to Qdrant: {e}")
+            report(file_path, e)
 
-    if points:
+    def upload_chunk():
+        # Every pooled document has fewer than EMBEDDING_BATCH_SIZE new answers, so this stays bounded
         try:
-            client.upsert(
-                collection_name=COLLECTION_NAME,
-                points=points
-            )
-            print(f"[INFO] Successfully uploaded {len(points)} Q&A pairs to Qdrant.")
-            if skipped > 0:
-                print(f"[INFO] Skipped {skipped} invalid entries.")
+            vectors = get_embeddings([entry["answer"] for _, _, new in chunk for entry in new])
         except Exception as e:
-            print(f"[ERROR] Failed to upload to Qdrant: {e}")
-            raise
-    else:
-        print(f"[WARNING] No valid points to upload from {file_path}")
+            print(f"[ERROR] Failed to embed {len(chunk)} document(s): {e}")
+            for file_path, _, _ in chunk:
+                report(file_path, e)
+            chunk.clear()
+            return
+
+        offset = 0
+        for file_path, entries, new in chunk:
+            sync(file_path, entries, new, _iter_points(new, vectors[offset:offset + len(new)]))
+            offset += len(new)
+        chunk.clear()
+
+    # Documents arrive as soon as a parser process finishes them
+    for file_path, entries, error in iter_parsed_documents(file_paths, workers=workers):
+        if error is not None:
+            print(f"[ERROR] Could not extract Q&A pairs from {file_path}: {error}")
+            report(file_path, error)
+            continue
+
+        print(f"[INFO] Extracted {len(entries)} Q&A pairs from {os.path.basename(file_path)}")
+        new = _new_entries(manifest, entries)
+        if len(new) >= EMBEDDING_BATCH_SIZE:
+            # Large documents are embedded and uploaded one batch at a time, never all at once
+            sync(file_path, entries, new, _embed_points(new, []))
+            continue
+
+        chunk.append((file_path, entries, new))
+        if sum(len(pooled) for _, _, pooled in chunk) >= EMBEDDING_BATCH_SIZE:
+            upload_chunk()
+
+    if chunk:
+        upload_chunk()
+
+    if remove_missing:
+        present = {os.path.basename(path) for path in file_paths}
+        for source in manifest.sources():
+            if source not in present:
+                _, deleted = _sync_document(client, manifest, source, [], [], question_index)
+                print(f"[INFO] Removed {deleted} points for deleted document {source}.")
+
+        # Every archived document was just re-synced, so the question index is complete again
+        if question_index is not None and not any(isinstance(r, Exception) for r in results.values()):
+            question_index.mark_synced(manifest.revision())
+
+    return results
@@ -0,0 +1,167 @@
+# core/embedding_cache.py
+# Persistent, content-addressed cache for embedding vectors
+
+import hashlib
+import os
+import sqlite3
+import threading
+import unicodedata
+from array import array
+
+from core.config import EMBEDDING_CACHE_ENABLED, EMBEDDING_CACHE_MAX_ENTRIES, EMBEDDING_CACHE_PATH
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text so trivially different copies share one cache entry."""
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+def cache_key(model: str, text: str) -> str:
+    """Return the content address for a (model, text) pair."""
+    digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+    return f"{model}:{digest}"
+
+
+class EmbeddingCache:
+    """
+    SQLite-backed embedding cache keyed by (model name, normalized text hash).
+
+    Vectors are stored as packed float32 blobs. When the cache grows past
+    `max_entries`, the least recently used entries are evicted. The instance
+    is safe to share between threads.
+    """
+
+    def __init__(self, path, max_entries=EMBEDDING_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._clock = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " key TEXT PRIMARY KEY,"
+            " vector BLOB NOT NULL,"
+            " last_used INTEGER NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings(last_used)")
+        self._conn.commit()
+
+        row = self._conn.execute("SELECT MAX(last_used) FROM embeddings").fetchone()
+        self._clock = row[0] or 0
+
+    def _tick(self):
+        self._clock += 1
+        return self._clock
+
+    def get(self, model: str, text: str) -> list[float] | None:
+        """Return the cached vector for `text`, or None on a miss."""
+        return self.get_many(model, [text])[0]
+
+    def get_many(self, model: str, texts: list[str]) -> list[list[float] | None]:
+        """Return cached vectors aligned with `texts` (None for each miss)."""
+        keys = [cache_key(model, text) for text in texts]
+        found = {}
+
+        with self._lock:
+            unique_keys = list(set(keys))
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(unique_keys), 500):
+                chunk = unique_keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = array("f", blob).tolist()
+
+            if found:
+                tick = self._tick()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                    [(tick, key) for key in found]
+                )
+                self._conn.commit()
+
+            results = [found.get(key) for key in keys]
+            hits = sum(1 for r in results if r is not None)
+            self.hits += hits
+            self.misses += len(results) - hits
+
+        return results
+
+    def put(self, model: str, text: str, vector: list[float]):
+        """Store a single vector."""
+        self.put_many(model, [(text, vector)])
+
+    def put_many(self, model: str, items):
+        """Store (text, vector) pairs, evicting least recently used entries if over capacity."""
+        rows = [
+            (cache_key(model, text), array("f", vector).tobytes())
+            for text, vector in items
+            if vector is not None
+        ]
+        if not rows:
+            return
+
+        with self._lock:
+            tick = self._tick()
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)",
+                [(key, blob, tick) for key, blob in rows]
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM embeddings WHERE key IN "
+                    "(SELECT key FROM embeddings ORDER BY last_used LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and the current number of cached vectors."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": entries,
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_embedding_cache():
+    """
+    Return the shared on-disk embedding cache, or None if caching is disabled.
+
+    The cache is opened lazily on first use so importing this module is cheap.
+    """
+    global _cache
+    if not EMBEDDING_CACHE_ENABLED:
+        return None
+
+    with _cache_lock:
+        if _cache is None:
+            try:
+                _cache = EmbeddingCache(EMBEDDING_CACHE_PATH)
+            except sqlite3.Error as e:
+                print(f"[WARNING] Embedding cache unavailable, continuing without it: {e}")
+                return None
+        return _cache
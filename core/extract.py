@@ -11,19 +11,17 @@
 #             questions.append(text)
 #         return questions
 
-from docx import Document
+from core.docx_stream import iter_questions
 
 
 def extract_questions_from_docx(file_path):
-    doc = Document(file_path)
-    questions = []
+    """
+    Extract questions from body paragraphs and table cells of a DOCX file.
 
-    print("\n All paragraphs found in docx:")
-    for para in doc.paragraphs:
-        text = para.text.strip()
-        print(f"• {text}")
-        if text.endswith("?") and len(text.split()) > 3:
-            questions.append(text)
+    The document is streamed (see core.docx_stream) rather than loaded as a
+    python-docx Document, so large questionnaires parse quickly in bounded memory.
+    """
+    questions = list(iter_questions(file_path))
 
     print(f"\nExtracted {len(questions)} question(s)")
     return questions
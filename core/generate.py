@@ -1,61 +1,231 @@
 # core/generate.py
 # Production-ready generation with OpenAI embeddings and question filtering
 
-import os
-import streamlit as st
-from pathlib import Path
-from dotenv import load_dotenv
-from openai import OpenAI
-
-# Load environment variables for local development
-try:
-    project_root = Path(__file__).resolve().parent.parent
-    dotenv_path = project_root / ".env"
-    if dotenv_path.is_file():
-        load_dotenv(dotenv_path=dotenv_path)
-except Exception as e:
-    print(f"[INFO] Could not load .env file. Using Streamlit secrets. {e}")
-
-# Initialize OpenAI client with proper API key handling
-try:
-    api_key = st.secrets.get("OPENAI_API_KEY", os.getenv("OPENAI_API_KEY"))
-    if not api_key:
-        raise ValueError("OpenAI API key not found in secrets or environment variables.")
-    
-    client = OpenAI(api_key=api_key)
-    print("[INFO] Successfully initialized OpenAI client.")
-except Exception as e:
-    print(f"[ERROR] Failed to initialize OpenAI client: {e}")
-    client = None
+import threading
+from core.config import EMBEDDING_BATCH_SIZE, EMBEDDING_BATCH_MAX_TOKENS, EMBEDDING_DIMENSIONS, get_settings
+from core.embedding_cache import get_embedding_cache
+from core.search_hit import SearchHit
+
+# OpenAI client, built on first use by get_openai_client()
+client = None
+_client_lock = threading.Lock()
+
+
+def get_openai_client():
+    """
+    Return the shared OpenAI client, building it on first use.
+
+    The openai package is only imported here, so modules that never embed
+    anything do not pay for it.
+
+    Returns:
+        OpenAI client instance or None if no API key is configured
+    """
+    global client
+    with _client_lock:
+        if client is not None:
+            return client
+        try:
+            api_key = get_settings().openai_api_key
+            if not api_key:
+                raise ValueError("OpenAI API key not found in secrets or environment variables.")
+
+            from openai import OpenAI
+            client = OpenAI(api_key=api_key)
+            print("[INFO] Successfully initialized OpenAI client.")
+        except Exception as e:
+            print(f"[ERROR] Failed to initialize OpenAI client: {e}")
+        return client
+
 
 EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_MODEL_DIMENSIONS = 1536  # Native output size of EMBEDDING_MODEL
+
+
+def _embedding_options() -> dict:
+    """Extra embeddings.create arguments; `dimensions` is only sent when shortening the output."""
+    if EMBEDDING_DIMENSIONS == EMBEDDING_MODEL_DIMENSIONS:
+        return {}
+    return {"dimensions": EMBEDDING_DIMENSIONS}
+
+
+def _cache_model() -> str:
+    """Embedding cache namespace, so vectors of different sizes never mix."""
+    if EMBEDDING_DIMENSIONS == EMBEDDING_MODEL_DIMENSIONS:
+        return EMBEDDING_MODEL
+    return f"{EMBEDDING_MODEL}@{EMBEDDING_DIMENSIONS}"
+
+
+def compact_vector(vector, dimensions):
+    """
+    Shorten an embedding to its first `dimensions` values, rescaled to unit length.
+
+    text-embedding-3 models are trained so that this truncation gives the same
+    vector the API would return when asked for `dimensions` directly.
+    """
+    head = vector[:dimensions]
+    norm = sum(x * x for x in head) ** 0.5
+    return [x / norm for x in head] if norm else list(head)
+
+
+def _request_embedding(text: str) -> list[float]:
+    """Call the OpenAI embeddings API for a single text, bypassing the cache."""
+    client = get_openai_client()
+    if not client:
+        raise RuntimeError("OpenAI client is not initialized. Check your API key configuration.")
+
+    try:
+        response = client.embeddings.create(
+            input=text,
+            model=EMBEDDING_MODEL,
+            **_embedding_options()
+        )
+        return response.data[0].embedding
+    except Exception as e:
+        print(f"[ERROR] OpenAI API call failed: {e}")
+        raise RuntimeError(f"Failed to generate embedding. Error: {e}")
 
 
 def get_embedding(text: str) -> list[float]:
     """
     Get embedding for a given text using OpenAI's embedding API.
+
+    Vectors are served from the on-disk embedding cache when the same
+    (normalized) text has been embedded before with the same model and
+    EMBEDDING_DIMENSIONS.
     
     Args:
         text: The text to embed
         
     Returns:
-        List of floats representing the embedding vector (1536 dimensions)
+        List of floats representing the embedding vector (EMBEDDING_DIMENSIONS long)
         
     Raises:
         RuntimeError: If OpenAI client is not initialized or API call fails
     """
-    if not client:
+    cache = get_embedding_cache()
+    if cache is not None:
+        cached = cache.get(_cache_model(), text)
+        if cached is not None:
+            return cached
+
+    vector = _request_embedding(text)
+    if cache is not None:
+        cache.put(_cache_model(), text, vector)
+    return vector
+
+
+def _estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) used only for batch sizing."""
+    return len(text) // 4 + 1
+
+
+def _iter_embedding_batches(items, max_items=EMBEDDING_BATCH_SIZE, max_tokens=EMBEDDING_BATCH_MAX_TOKENS):
+    """
+    Group (index, text) pairs into batches bounded by item count and token budget.
+
+    A single text larger than the token budget still gets a batch of its own so
+    that the API can accept or reject it independently.
+    """
+    batch = []
+    batch_tokens = 0
+    for index, text in items:
+        tokens = _estimate_tokens(text)
+        if batch and (len(batch) >= max_items or batch_tokens + tokens > max_tokens):
+            yield batch
+            batch = []
+            batch_tokens = 0
+        batch.append((index, text))
+        batch_tokens += tokens
+    if batch:
+        yield batch
+
+
+def get_embeddings(texts: list[str]) -> list[list[float] | None]:
+    """
+    Get embeddings for many texts using as few OpenAI API calls as possible.
+
+    Texts are packed into requests bounded by EMBEDDING_BATCH_SIZE items and
+    EMBEDDING_BATCH_MAX_TOKENS estimated tokens. Texts already in the
+    on-disk embedding cache are served from it without an API call. If a batch
+    request fails, its texts are retried one at a time so a single bad input
+    cannot fail the whole batch.
+
+    Args:
+        texts: The texts to embed
+
+    Returns:
+        List aligned with `texts`. Each entry is the embedding vector, or None
+        if that text was empty or could not be embedded.
+
+    Raises:
+        RuntimeError: If OpenAI client is not initialized
+    """
+    embeddings = [None] * len(texts)
+    pending = [(i, text) for i, text in enumerate(texts) if text and text.strip()]
+
+    cache = get_embedding_cache()
+    if cache is not None and pending:
+        cached = cache.get_many(_cache_model(), [text for _, text in pending])
+        for (index, _), vector in zip(pending, cached):
+            embeddings[index] = vector
+        pending = [(i, text) for i, text in pending if embeddings[i] is None]
+
+    client = get_openai_client() if pending else None
+    if pending and not client:
         raise RuntimeError("OpenAI client is not initialized. Check your API key configuration.")
 
-    try:
-        response = client.embeddings.create(
-            input=text,
-            model=EMBEDDING_MODEL
-        )
-        return response.data[0].embedding
-    except Exception as e:
-        print(f"[ERROR] OpenAI API call failed: {e}")
-        raise RuntimeError(f"Failed to generate embedding. Error: {e}")
+    for batch in _iter_embedding_batches(pending):
+        try:
+            response = client.embeddings.create(
+                input=[text for _, text in batch],
+                model=EMBEDDING_MODEL,
+                **_embedding_options()
+            )
+            # The API returns one item per input, tagged with the input position
+            for item in response.data:
+                embeddings[batch[item.index][0]] = item.embedding
+        except Exception as e:
+            if len(batch) == 1:
+                print(f"[ERROR] OpenAI API call failed: {e}")
+            else:
+                print(f"[WARNING] Batch of {len(batch)} embeddings failed ({e}). Retrying individually.")
+                for index, text in batch:
+                    try:
+                        embeddings[index] = _request_embedding(text)
+                    except RuntimeError:
+                        pass  # Already reported; leave this entry as None
+
+        if cache is not None:
+            cache.put_many(_cache_model(), [(text, embeddings[index]) for index, text in batch])
+
+    return embeddings
+
+
+# Archived entries whose "answer" starts like this are usually a question captured in the answer slot
+_QUESTION_PREFIXES = (
+    "Q", "E.", "Please provide", "Please describe",
+    "Please outline", "Please explain", "Complete the table",
+    "What ", "How ", "Why ", "When ", "Where ", "Who ",
+    "Does ", "Do ", "Can ", "Could ", "Would ", "Should ",
+    "Is ", "Are ", "Have ", "Has "
+)
+
+
+def looks_like_question(text: str) -> bool:
+    """
+    Return True if an archived answer is really a question or too short to use.
+
+    Applied once per entry at ingestion (see core.embed._iter_points), which
+    stores the outcome in the payload's 'kind' field.
+    """
+    text = text.strip()
+    return (
+        text.endswith("?") or               # Ends with question mark
+        text.startswith(_QUESTION_PREFIXES) or
+        len(text) < 20 or                   # Too short to be meaningful
+        text.count("?") > 2                 # Multiple questions
+    )
 
 
 def generate_draft_answer(question: str, retrieved_context: list) -> str:
@@ -63,13 +233,17 @@ def generate_draft_answer(question: str, retrieved_context: list) -> str:
     Generate a draft RFP answer by combining the top-matched Qdrant responses.
     
     Features:
-    - Handles multiple payload formats for backward compatibility
+    - Handles multiple payload formats for backward compatibility (via SearchHit)
     - Filters out question-like results to return only actual answers
     - Includes source attribution and confidence scores
+
+    Points classified at ingestion carry a 'kind' payload field and search
+    never returns those of kind "question"; the looks_like_question check is
+    only run for older points without it.
     
     Args:
         question: The RFP question being answered
-        retrieved_context: List of search results from Qdrant
+        retrieved_context: List of SearchHit (or ScoredPoint-like) search results
         
     Returns:
         String containing the formatted draft answer with sources
@@ -81,45 +255,22 @@ def generate_draft_answer(question: str, retrieved_context: list) -> str:
     filtered_count = 0
     
     for i, item in enumerate(retrieved_context):
-        # Handle multiple payload formats for backward compatibility
-        answer_piece = (
-            item.payload.get("answer") or         # Format 1: Original database
-            item.payload.get("text") or           # Format 2: Old embed.py
-            item.payload.get("text_content") or   # Format 3: Attempted fix
-            ""
-        ).strip()
-        
-        # Get source information
-        source_file = (
-            item.payload.get("source") or         # Format 1 & 2
-            item.payload.get("source_file") or    # Format 3
-            "Unknown"
-        )
+        # Legacy payload formats are resolved by SearchHit (see core.search_hit)
+        hit = SearchHit.from_point(item)
 
-        if answer_piece:
+        if hit.answer:
             # Filter out results that are questions, not answers
-            is_question = (
-                answer_piece.endswith("?") or                           # Ends with question mark
-                answer_piece.startswith((
-                    "Q", "E.", "Please provide", "Please describe", 
-                    "Please outline", "Please explain", "Complete the table", 
-                    "What ", "How ", "Why ", "When ", "Where ", "Who ",
-                    "Does ", "Do ", "Can ", "Could ", "Would ", "Should ",
-                    "Is ", "Are ", "Have ", "Has "
-                )) or
-                len(answer_piece) < 20 or                               # Too short to be meaningful
-                answer_piece.count("?") > 2                             # Multiple questions
-            )
+            is_question = hit.kind == "question" if hit.kind else looks_like_question(hit.answer)
             
             if not is_question:
                 # This looks like a real answer, include it
-                base_answer += f"[Source: {source_file} | Score: {item.score:.2f}]\n{answer_piece}\n\n"
+                base_answer += f"[Source: {hit.source} | Score: {hit.score:.2f}]\n{hit.answer}\n\n"
             else:
                 filtered_count += 1
-                print(f"[DEBUG] Filtered question-like result: {answer_piece[:80]}...")
+                print(f"[DEBUG] Filtered question-like result: {hit.answer[:80]}...")
         else:
             # Debug logging for empty results
-            print(f"[DEBUG] Empty result at index {i}. Payload keys: {list(item.payload.keys())}")
+            print(f"[DEBUG] Empty result at index {i} (point {hit.id}).")
 
     if not base_answer:
         if filtered_count > 0:
@@ -0,0 +1,267 @@
+# core/jobs.py
+# Background drafting jobs with per-job output directories
+
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from core.config import JOB_MAX_CONCURRENT, JOB_RETENTION_SECONDS, JOBS_DIR
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class Job:
+    """State of one submitted RFP. Only the JobManager mutates it."""
+
+    def __init__(self, job_id, input_name, directory):
+        self.id = job_id
+        self.input_name = input_name
+        self.directory = directory
+        self.status = QUEUED
+        self.done = 0
+        self.total = None
+        self.results = []
+        self.summary = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_event = threading.Event()
+        self.future = None
+
+    def snapshot(self) -> dict:
+        """Return the job's status as a plain dict (without the per-question results)."""
+        eta = None
+        if self.status == RUNNING and self.done and self.total:
+            elapsed = time.time() - self.started_at
+            eta = elapsed / self.done * (self.total - self.done)
+        return {
+            "id": self.id,
+            "input_name": self.input_name,
+            "status": self.status,
+            "done": self.done,
+            "total": self.total,
+            "eta_seconds": eta,
+            "error": self.error,
+            "summary": self.summary,
+            "output_dir": self.directory,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobManager:
+    """
+    Run drafting jobs on a bounded pool of background threads.
+
+    Each job copies its input into its own directory under `jobs_dir` and
+    writes its draft documents there, so concurrent users never overwrite
+    each other's output. Callers submit a file, get a job ID back, and poll
+    `status` and `results` instead of blocking on the run. At most
+    `max_concurrent` jobs run at once; the rest wait in submission order.
+    Finished jobs older than `retention_seconds` are removed, along with
+    their files, whenever a new job is submitted.
+
+    Args:
+        pipeline: Callable with run_pipeline's signature, called as
+            pipeline(input_path, output_dir=..., progress_callback=...,
+            cancel_event=..., input_name=..., **options)
+        jobs_dir: Directory holding one subdirectory per job
+        max_concurrent: Maximum number of jobs running at the same time
+        retention_seconds: Age after which finished jobs are pruned
+    """
+
+    def __init__(self, pipeline, jobs_dir=JOBS_DIR, max_concurrent=JOB_MAX_CONCURRENT,
+                 retention_seconds=JOB_RETENTION_SECONDS):
+        self.pipeline = pipeline
+        self.jobs_dir = jobs_dir
+        self.retention_seconds = retention_seconds
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_concurrent), thread_name_prefix="rfp-job")
+        os.makedirs(jobs_dir, exist_ok=True)
+
+    def submit(self, input_path, input_name=None, **options) -> str:
+        """
+        Queue an RFP for drafting.
+
+        The input file is copied into the job directory, so the caller may
+        delete it as soon as this returns.
+
+        Args:
+            input_path: Path to the RFP .docx file
+            input_name: Display name for the job (defaults to the file name)
+            **options: Extra keyword arguments for the pipeline, e.g. workers
+
+        Returns:
+            The new job ID
+        """
+        self._prune()
+
+        job_id = uuid.uuid4().hex[:12]
+        directory = os.path.join(self.jobs_dir, job_id)
+        os.makedirs(directory)
+        job_input = os.path.join(directory, "input.docx")
+        shutil.copyfile(input_path, job_input)
+
+        job = Job(job_id, input_name or os.path.basename(input_path), directory)
+        with self._lock:
+            self._jobs[job_id] = job
+            job.future = self._executor.submit(self._run, job, job_input, options)
+        print(f"[INFO] Queued job {job_id} for {job.input_name}")
+        return job_id
+
+    def _run(self, job, input_path, options):
+        with self._lock:
+            if job.status != QUEUED:
+                return
+            job.status = RUNNING
+            job.started_at = time.time()
+
+        def on_result(done, total, result):
+            with self._lock:
+                job.results.append(result)
+                job.done = done
+                job.total = total
+
+        try:
+            summary = self.pipeline(
+                input_path,
+                output_dir=job.directory,
+                progress_callback=on_result,
+                cancel_event=job.cancel_event,
+                input_name=job.input_name,
+                **options
+            )
+            with self._lock:
+                if summary is None:
+                    job.status = FAILED
+                    job.error = "No valid questions found in the document."
+                else:
+                    job.status = SUCCEEDED
+                    job.summary = summary
+        except Exception as e:
+            with self._lock:
+                if job.cancel_event.is_set():
+                    job.status = CANCELLED
+                else:
+                    print(f"[ERROR] Job {job.id} failed: {e}")
+                    job.status = FAILED
+                    job.error = str(e)
+        finally:
+            with self._lock:
+                job.finished_at = time.time()
+            self._save(job)
+
+    def _save(self, job):
+        """Record the final status next to the job's output."""
+        try:
+            with self._lock:
+                snapshot = job.snapshot()
+            with open(os.path.join(job.directory, "job.json"), "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, indent=2, default=str)
+        except OSError as e:
+            print(f"[WARNING] Could not write status for job {job.id}: {e}")
+
+    def status(self, job_id) -> dict | None:
+        """Return a snapshot of the job's status, or None for an unknown ID."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.snapshot() if job else None
+
+    def results(self, job_id, start=0) -> list[dict]:
+        """Return the results drafted so far, in question order, from index `start` on."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return list(job.results[start:]) if job else []
+
+    def list_jobs(self) -> list[dict]:
+        """Return snapshots of all known jobs, newest first."""
+        with self._lock:
+            jobs = sorted(self._jobs.values(), key=lambda j: j.created_at, reverse=True)
+            return [job.snapshot() for job in jobs]
+
+    def cancel(self, job_id) -> bool:
+        """
+        Cancel a queued or running job.
+
+        A queued job is cancelled immediately. A running job stops before its
+        next answer and writes no documents.
+
+        Returns:
+            True if the job was still queued or running
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status in FINISHED:
+                return False
+            job.cancel_event.set()
+            if job.status == QUEUED:
+                job.future.cancel()
+                job.status = CANCELLED
+                job.finished_at = time.time()
+        return True
+
+    def wait(self, job_id, timeout=None) -> dict | None:
+        """Block until the job finishes (or `timeout` seconds pass) and return its status."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while job.status not in FINISHED:
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            time.sleep(0.05)
+        return self.status(job_id)
+
+    def _prune(self):
+        cutoff = time.time() - self.retention_seconds
+        with self._lock:
+            expired = [job for job in self._jobs.values()
+                       if job.status in FINISHED and (job.finished_at or 0) < cutoff]
+            for job in expired:
+                del self._jobs[job.id]
+            active = set(self._jobs)
+
+        # Also clear directories left behind by earlier processes
+        for name in os.listdir(self.jobs_dir):
+            path = os.path.join(self.jobs_dir, name)
+            if name in active or not os.path.isdir(path):
+                continue
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    shutil.rmtree(path, ignore_errors=True)
+            except OSError:
+                pass
+
+    def shutdown(self, cancel=True):
+        """Stop accepting jobs; with `cancel`, cancel everything queued or running first."""
+        if cancel:
+            for job_id in list(self._jobs):
+                self.cancel(job_id)
+        self._executor.shutdown(wait=True)
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager():
+    """Return the process-wide job manager, shared by every UI session."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            from run_pipeline import run_pipeline
+            _manager = JobManager(run_pipeline)
+        return _manager
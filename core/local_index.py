@@ -0,0 +1,218 @@
+# core/local_index.py
+# In-process vector index used as an offline alternative to Qdrant
+
+import json
+import os
+import shutil
+import threading
+
+import numpy as np
+
+from core.config import LOCAL_INDEX_DIR
+from core.search import FULL_VECTOR, answers_only_filter
+from core.search_hit import SearchHit
+
+VECTORS_FILE = "vectors.f32"
+POINTS_FILE = "points.json"
+
+
+def write_local_index(directory, points):
+    """
+    Write a local index from (id, vector, payload) tuples.
+
+    Vectors are streamed to a flat float32 file as they arrive, so memory use
+    stays proportional to the payloads rather than the vectors. Files are
+    written to a temporary directory and swapped in at the end so readers
+    never see a half-written index.
+
+    Args:
+        directory: Target index directory
+        points: Iterable of (point_id, vector, payload) tuples
+
+    Returns:
+        Number of points written
+    """
+    tmp_dir = f"{directory}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    ids = []
+    payloads = []
+    dim = None
+
+    with open(os.path.join(tmp_dir, VECTORS_FILE), "wb") as f:
+        for point_id, vector, payload in points:
+            row = np.asarray(vector, dtype=np.float32)
+            if dim is None:
+                dim = row.shape[0]
+            elif row.shape[0] != dim:
+                raise ValueError(f"Vector for point {point_id} has {row.shape[0]} dimensions, expected {dim}.")
+            f.write(row.tobytes())
+            ids.append(point_id)
+            payloads.append(payload or {})
+
+    with open(os.path.join(tmp_dir, POINTS_FILE), "w", encoding="utf-8") as f:
+        json.dump({"dim": dim or 0, "count": len(ids), "ids": ids, "payloads": payloads}, f, ensure_ascii=False)
+
+    old_dir = f"{directory}.old"
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if os.path.exists(directory):
+        os.replace(directory, old_dir)
+    os.replace(tmp_dir, directory)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return len(ids)
+
+
+class LocalVectorIndex:
+    """
+    Brute-force cosine index over a memory-mapped float32 matrix.
+
+    All answer vectors live in one contiguous (count x dim) matrix, so a batch
+    of queries is answered with a single matrix multiply followed by an
+    argpartition top-k. For an archive of a few thousand answers this is
+    faster than a network round trip to Qdrant and works offline.
+    """
+
+    def __init__(self, directory=LOCAL_INDEX_DIR):
+        self.directory = directory
+
+        with open(os.path.join(directory, POINTS_FILE), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        self.ids = meta["ids"]
+        # Resolve each payload once to the (answer, source, kind) a SearchHit carries
+        self.fields = [
+            (hit.answer, hit.source, hit.kind)
+            for hit in (SearchHit.from_payload(None, 0.0, payload) for payload in meta["payloads"])
+        ]
+        self.dim = meta["dim"]
+        count = meta["count"]
+
+        if count == 0:
+            self.matrix = np.zeros((0, self.dim), dtype=np.float32)
+            return
+
+        matrix = np.memmap(
+            os.path.join(directory, VECTORS_FILE), dtype=np.float32, mode="r", shape=(count, self.dim)
+        )
+
+        # OpenAI embeddings are already unit length; only copy the matrix if they are not
+        norms = np.linalg.norm(matrix, axis=1)
+        if np.allclose(norms, 1.0, atol=1e-3):
+            self.matrix = matrix
+        else:
+            norms[norms == 0] = 1.0
+            self.matrix = np.ascontiguousarray(matrix / norms[:, None], dtype=np.float32)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def search(self, vector, limit):
+        return self.search_batch([vector], limit)[0]
+
+    def search_batch(self, vectors, limit):
+        """
+        Return the top `limit` points for each query vector.
+
+        Returns:
+            List of SearchHit lists aligned with `vectors`, best match first
+        """
+        if not vectors:
+            return []
+        if len(self) == 0:
+            return [[] for _ in vectors]
+
+        queries = np.asarray(vectors, dtype=np.float32)
+        if queries.shape[1] != self.dim:
+            raise ValueError(f"Query has {queries.shape[1]} dimensions but the local index has {self.dim}.")
+        query_norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        query_norms[query_norms == 0] = 1.0
+        scores = (queries / query_norms) @ self.matrix.T
+
+        k = min(limit, len(self))
+        if k < len(self):
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            top = np.tile(np.arange(len(self)), (len(queries), 1))
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+        return [
+            [
+                SearchHit(self.ids[j], score, *self.fields[j])
+                for j, score in zip(row_ids, row_scores)
+            ]
+            for row_ids, row_scores in zip(top.tolist(), top_scores.tolist())
+        ]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_local_index():
+    """Load the local index on first use and reuse it afterwards."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            if not os.path.exists(os.path.join(LOCAL_INDEX_DIR, POINTS_FILE)):
+                raise FileNotFoundError(
+                    f"Local index not found in '{LOCAL_INDEX_DIR}'. "
+                    "Build it from Qdrant with scripts/build_local_index.py."
+                )
+            _index = LocalVectorIndex(LOCAL_INDEX_DIR)
+            print(f"[INFO] Loaded local index with {len(_index)} points.")
+        return _index
+
+
+def local_index_revision(directory=LOCAL_INDEX_DIR) -> str:
+    """Identify the index on disk; it changes whenever write_local_index swaps in a new one."""
+    try:
+        stat = os.stat(os.path.join(directory, POINTS_FILE))
+    except FileNotFoundError:
+        return "missing"
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+def reset_local_index():
+    """Drop the loaded index so the next search reloads it from disk."""
+    global _index
+    with _index_lock:
+        _index = None
+
+
+def build_local_index_from_qdrant(client, collection_name, directory=LOCAL_INDEX_DIR, page_size=256):
+    """
+    Copy the points (vector and payload) of a Qdrant collection into a local index.
+
+    Points classified as questions are left out, just as Qdrant searches skip them.
+
+    Returns:
+        Number of points written
+    """
+    answers_only = answers_only_filter()
+
+    def scroll_points():
+        offset = None
+        while True:
+            records, offset = client.scroll(
+                collection_name=collection_name,
+                scroll_filter=answers_only,
+                limit=page_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=True
+            )
+            for record in records:
+                vector = record.vector
+                if isinstance(vector, dict):  # Collection with compact vectors for two-stage search
+                    vector = vector[FULL_VECTOR]
+                yield str(record.id), vector, record.payload
+            if offset is None:
+                break
+
+    count = write_local_index(directory, scroll_points())
+    reset_local_index()
+    print(f"[INFO] Wrote {count} points from '{collection_name}' to local index '{directory}'.")
+    return count
@@ -1,13 +1,239 @@
 import os
 import json
+import glob
+import gzip
+import queue
+import shutil
+import atexit
+import threading
+import time
 from datetime import datetime
-from core.config import LOG_DIR
+from core.config import (
+    LOG_DIR, LOG_MAX_BYTES, LOG_ROTATE_DAILY, LOG_BACKUP_COUNT, LOG_QUEUE_SIZE, LOG_FLUSH_INTERVAL,
+)
 
 os.makedirs(LOG_DIR, exist_ok=True)
 LOG_PATH = os.path.join(LOG_DIR, "draft_log.jsonl")
 
+_FLUSH = object()
+_CLOSE = object()
+
+
+class JsonlWriter:
+    """
+    Append JSON lines to a file from any thread through one background writer.
+
+    Callers only serialize their entry and enqueue the line; a single thread
+    owns the open file, so lines from concurrent callers never interleave.
+    Lines are written in batches and flushed every `flush_interval` seconds.
+    The file is rotated when it would exceed `max_bytes` or when the date
+    changes, and rotated segments are gzipped next to it, keeping the newest
+    `backup_count`.
+
+    Args:
+        path: JSONL file to append to
+        max_bytes: Rotate before a write would grow the file past this size (0 disables)
+        rotate_daily: Rotate when the first write of a new day arrives
+        backup_count: Compressed segments to keep (0 keeps all)
+        queue_size: Lines buffered before write() blocks
+        flush_interval: Maximum seconds a written line waits before it is flushed
+    """
+
+    def __init__(self, path, max_bytes=LOG_MAX_BYTES, rotate_daily=LOG_ROTATE_DAILY,
+                 backup_count=LOG_BACKUP_COUNT, queue_size=LOG_QUEUE_SIZE,
+                 flush_interval=LOG_FLUSH_INTERVAL):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.rotate_daily = rotate_daily
+        self.backup_count = backup_count
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._file = None
+        self._size = 0
+        self._opened_on = None
+        self._last_flush = time.monotonic()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="jsonl-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, entry):
+        """Queue one entry for writing. Blocks only while the queue is full."""
+        if self._closed:
+            raise RuntimeError(f"Log writer for {self.path} is closed")
+        self._queue.put(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def flush(self):
+        """Block until every entry queued so far is written and flushed to disk."""
+        if self._closed:
+            return
+        done = threading.Event()
+        self._queue.put((_FLUSH, done))
+        done.wait()
+
+    def close(self):
+        """Write everything still queued, close the file and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put((_CLOSE, None))
+        self._thread.join()
+
+    # --- Writer thread ---
+
+    def _run(self):
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self._flush_file()
+                continue
+
+            batch = []
+            while True:
+                if isinstance(item, tuple):
+                    self._write_lines(batch)
+                    self._flush_file()
+                    command, done = item
+                    if command is _CLOSE:
+                        self._close_file()
+                        return
+                    done.set()
+                    batch = []
+                else:
+                    batch.append(item)
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            self._write_lines(batch)
+            if time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush_file()
+
+    def _write_lines(self, lines):
+        for line in lines:
+            try:
+                data = line.encode("utf-8")
+                self._rotate_if_needed(len(data))
+                if self._file is None:
+                    self._open_file()
+                self._file.write(data)
+                self._size += len(data)
+            except Exception as e:
+                print(f"[ERROR] Failed to write draft log entry to {self.path}: {e}")
+
+    def _flush_file(self):
+        self._last_flush = time.monotonic()
+        if self._file is not None:
+            try:
+                self._file.flush()
+            except Exception as e:
+                print(f"[ERROR] Failed to flush draft log {self.path}: {e}")
+
+    def _open_file(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, "ab")
+        self._size = self._file.tell()
+        modified = os.path.getmtime(self.path) if self._size else None
+        self._opened_on = (datetime.fromtimestamp(modified) if modified else datetime.now()).date()
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _rotate_if_needed(self, incoming):
+        if self._file is None:
+            if not os.path.exists(self.path):
+                return
+            self._open_file()
+        if not self._size:
+            return
+        too_big = self.max_bytes and self._size + incoming > self.max_bytes
+        new_day = self.rotate_daily and datetime.now().date() != self._opened_on
+        if too_big or new_day:
+            self._rotate()
+
+    def _rotate(self):
+        self._close_file()
+        stem, ext = os.path.splitext(self.path)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        target = f"{stem}.{stamp}{ext}"
+        n = 1
+        while os.path.exists(target) or os.path.exists(target + ".gz"):
+            target = f"{stem}.{stamp}-{n}{ext}"
+            n += 1
+
+        os.replace(self.path, target)
+        try:
+            with open(target, "rb") as src, gzip.open(target + ".gz", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(target)
+        except Exception as e:
+            print(f"[WARNING] Could not compress rotated log {target}: {e}")
+
+        if self.backup_count:
+            rotated = [segment for segment in log_segments(self.path) if segment != self.path]
+            for old in rotated[:-self.backup_count]:
+                try:
+                    os.remove(old)
+                except OSError:
+                    pass
+
+
+def log_segments(path=None):
+    """
+    Return the rotated segments of a JSONL log followed by the live file, oldest first.
+
+    Only paths that exist are returned.
+    """
+    path = path or LOG_PATH
+    stem, ext = os.path.splitext(path)
+    # Rotated names carry a fixed-width timestamp, so name order is age order
+    segments = sorted(glob.glob(glob.escape(stem) + ".*" + ext + ".gz")
+                      + glob.glob(glob.escape(stem) + ".*" + ext))
+    if os.path.exists(path):
+        segments.append(path)
+    return segments
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_log_writer():
+    """Return the shared writer for LOG_PATH, starting it on first use."""
+    global _writer
+    with _writer_lock:
+        if _writer is None or _writer.path != LOG_PATH:
+            if _writer is not None:
+                _writer.close()
+            _writer = JsonlWriter(LOG_PATH)
+        return _writer
+
+
+def flush_logs():
+    """Block until all logged entries are on disk."""
+    if _writer is not None:
+        _writer.flush()
+
+
+@atexit.register
+def close_logs():
+    """Flush and close the shared log writer. Runs automatically at interpreter exit."""
+    global _writer
+    with _writer_lock:
+        if _writer is not None:
+            _writer.close()
+            _writer = None
+
 
 def log_result(entry):
     entry["timestamp"] = datetime.now().isoformat()
-    with open(LOG_PATH, "a", encoding="utf-8") as f:
-        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    get_log_writer().write(entry)
+
+
+def log_run_summary(summary):
+    """Append a run-level summary record, tagged with type 'run_summary'."""
+    log_result({"type": "run_summary", **summary})
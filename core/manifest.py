@@ -0,0 +1,84 @@
+# core/manifest.py
+# Per-document record of which Q&A points are stored in the collection
+
+import hashlib
+import json
+import os
+import uuid
+
+from core.config import ARCHIVE_MANIFEST_PATH
+
+# Fixed namespace so the same Q&A content always maps to the same point ID
+POINT_ID_NAMESPACE = uuid.UUID("5b0f5c1e-7d3a-4c8e-9f1b-2a6d8e4c3b70")
+
+
+def point_id_for(source: str, question: str, answer: str) -> str:
+    """
+    Return a deterministic point ID for a Q&A pair from a given source document.
+
+    Re-archiving the same document therefore overwrites its existing points
+    instead of adding duplicates.
+    """
+    return str(uuid.uuid5(POINT_ID_NAMESPACE, "\x1f".join((source, question, answer))))
+
+
+class ArchiveManifest:
+    """
+    JSON manifest mapping each archived document to the point IDs it produced.
+
+    Because point IDs are content hashes, comparing a document's current IDs
+    with the manifest tells us exactly which pairs are new and which points
+    are stale, so a re-index only touches what changed.
+    """
+
+    def __init__(self, collection_name, path=ARCHIVE_MANIFEST_PATH):
+        self.collection_name = collection_name
+        self.path = path
+        self.documents = {}
+
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                # A manifest written for another collection says nothing about this one
+                if data.get("collection") == collection_name:
+                    self.documents = {k: set(v) for k, v in data.get("documents", {}).items()}
+            except (OSError, ValueError) as e:
+                print(f"[WARNING] Could not read archive manifest, starting fresh: {e}")
+
+    def get(self, source):
+        """Return the set of point IDs recorded for `source`."""
+        return set(self.documents.get(source, ()))
+
+    def set(self, source, point_ids):
+        if point_ids:
+            self.documents[source] = set(point_ids)
+        else:
+            self.documents.pop(source, None)
+
+    def sources(self):
+        return list(self.documents)
+
+    def clear(self):
+        self.documents = {}
+
+    def revision(self):
+        """Return a hash that changes whenever the recorded archive contents change."""
+        canonical = json.dumps(
+            [self.collection_name, sorted((k, sorted(v)) for k, v in self.documents.items())]
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def save(self):
+        """Write the manifest atomically."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "collection": self.collection_name,
+                "documents": {k: sorted(v) for k, v in sorted(self.documents.items())},
+            }, f, indent=2)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,195 @@
+# core/question_index.py
+# Local hash index of archived questions for answering exact repeats without a search
+
+import hashlib
+import os
+import sqlite3
+import threading
+
+from core.config import QUESTION_INDEX_ENABLED, QUESTION_INDEX_PATH, get_settings
+from core.dedupe import canonical_question
+from core.manifest import ArchiveManifest
+from core.search_hit import SearchHit
+
+
+def question_key(question: str) -> str:
+    """Hash of the canonical question, so case, punctuation and spacing variants share a key."""
+    return hashlib.sha256(canonical_question(question).encode("utf-8")).hexdigest()
+
+
+class QuestionIndex:
+    """
+    SQLite table of every archived Q&A point, looked up by normalized question.
+
+    Rows mirror the points stored in the collection: each document's rows are
+    replaced whenever the document is synced (see core.embed._sync_document).
+    The index records the archive manifest revision it matches; it is only
+    trusted while that equals the current manifest revision, so an index that
+    missed an update is never used to answer questions. The instance is safe
+    to share between threads.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.hits = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS questions ("
+            " point_id TEXT PRIMARY KEY,"
+            " key TEXT NOT NULL,"
+            " source TEXT NOT NULL,"
+            " question TEXT NOT NULL,"
+            " answer TEXT NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_questions_key ON questions(key)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_questions_source ON questions(source)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._conn.commit()
+
+    def _get_meta(self, key):
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def revision(self) -> str | None:
+        """Return the manifest revision the index was last known to match."""
+        with self._lock:
+            return self._get_meta("revision")
+
+    def reset(self, revision):
+        """Drop every row; the (empty) index now matches manifest `revision`."""
+        with self._lock:
+            self._conn.execute("DELETE FROM questions")
+            self._set_meta("revision", revision)
+            self._conn.commit()
+
+    def sync_document(self, source, entries, previous_revision, revision):
+        """
+        Replace the rows of one document.
+
+        The index only moves to `revision` if it matched `previous_revision`,
+        the manifest revision before this document changed; otherwise it
+        stays out of date until mark_synced.
+
+        Args:
+            source: Document file name
+            entries: The document's stored entries (dicts with 'id',
+                'question', 'answer' and 'kind'); only real answers are kept
+            previous_revision: Manifest revision before the document was synced
+            revision: Manifest revision after the document was synced
+        """
+        rows = [(e["id"], question_key(e["question"]), source, e["question"], e["answer"])
+                for e in entries if e.get("kind", "answer") == "answer"]
+        with self._lock:
+            self._conn.execute("DELETE FROM questions WHERE source = ?", (source,))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO questions (point_id, key, source, question, answer) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            if self._get_meta("revision") == previous_revision:
+                self._set_meta("revision", revision)
+            self._conn.commit()
+
+    def mark_synced(self, revision):
+        """Record that every document in the manifest has just been synced into the index."""
+        with self._lock:
+            self._set_meta("revision", revision)
+            self._conn.commit()
+
+    def lookup_many(self, questions, limit=5) -> list:
+        """
+        Find archived points whose question matches each question after normalization.
+
+        Returns:
+            List aligned with `questions`; each item is a list of up to `limit`
+            SearchHit results with score 1.0, most recently archived first,
+            or an empty list when nothing matches
+        """
+        keys = [question_key(q) for q in questions]
+        found = {}
+        with self._lock:
+            unique_keys = list(set(keys))
+            for start in range(0, len(unique_keys), 500):
+                chunk = unique_keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                for point_id, key, source, answer in self._conn.execute(
+                    f"SELECT point_id, key, source, answer FROM questions "
+                    f"WHERE key IN ({placeholders}) ORDER BY rowid DESC", chunk
+                ):
+                    matches = found.setdefault(key, [])
+                    if len(matches) < limit:
+                        matches.append(SearchHit(point_id, 1.0, answer.strip(), source, "answer"))
+            self.hits += sum(1 for key in keys if key in found)
+
+        return [list(found.get(key, ())) for key in keys]
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM questions").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_index = None
+_index_lock = threading.Lock()
+_reported_stale = None
+
+
+def open_question_index():
+    """Return the shared question index for maintenance, or None if it is disabled or unavailable."""
+    global _index
+    if not QUESTION_INDEX_ENABLED:
+        return None
+
+    with _index_lock:
+        if _index is None:
+            try:
+                index = QuestionIndex(QUESTION_INDEX_PATH)
+                # A new index is complete only if nothing has been archived yet
+                manifest = ArchiveManifest(get_settings().collection_name)
+                if index.revision() is None and not manifest.sources():
+                    index.mark_synced(manifest.revision())
+                _index = index
+            except sqlite3.Error as e:
+                print(f"[WARNING] Question index unavailable, continuing without it: {e}")
+                return None
+        return _index
+
+
+def get_question_index():
+    """
+    Return the shared question index if it matches the current archive, else None.
+
+    An out-of-date index is reported once per archive revision; the next full
+    sync of past_rfps/ (scripts/rebuild_qdrant_db.py or Database Management)
+    brings it up to date.
+    """
+    global _reported_stale
+    index = open_question_index()
+    if index is None:
+        return None
+
+    revision = ArchiveManifest(get_settings().collection_name).revision()
+    try:
+        if index.revision() == revision:
+            return index
+    except sqlite3.Error as e:
+        print(f"[WARNING] Question index unavailable, continuing without it: {e}")
+        return None
+
+    if _reported_stale != revision:
+        _reported_stale = revision
+        print("[INFO] Question index is out of date with the archive; exact-match answers are "
+              "disabled until the next full archive sync.")
+    return None
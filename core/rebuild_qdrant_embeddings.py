@@ -5,7 +5,7 @@ from docx import Document
 from dotenv import load_dotenv
 from qdrant_client import QdrantClient
 from qdrant_client.models import PointStruct
-from core.embed import get_embedding
+from core.generate import get_embedding
 from core.config import COLLECTION_NAME
 import os
 import sys
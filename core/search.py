@@ -1,90 +1,313 @@
 # core/search.py
 # Production-ready Qdrant search with proper error handling
 
-import streamlit as st
-from qdrant_client import QdrantClient
-from qdrant_client.http.models import SearchParams
-from qdrant_client.http.exceptions import UnexpectedResponse
+import math
+import threading
+from core.config import (
+    QDRANT_QUANTIZATION, SEARCH_COMPACT_DIMENSIONS, SEARCH_COMPACT_OVERSAMPLING, SEARCH_OVERSAMPLING,
+    SEARCH_RESCORE, get_settings,
+)
+from core.generate import compact_vector
+from core.search_hit import PAYLOAD_FIELDS, SearchHit
+
+# Vector names used when the collection stores compact vectors for two-stage search
+FULL_VECTOR = "full"
+COMPACT_VECTOR = "compact"
+
+# Indexed payload field set at ingestion: "answer", or "question" for archived entries whose
+# answer reads like a question. Searches exclude "question" points so they never take a result slot
+KIND_FIELD = "kind"
+
+
+def answers_only_filter():
+    """Return the Qdrant filter that drops points classified as questions (unlabeled points pass)."""
+    from qdrant_client.http.models import FieldCondition, Filter, MatchValue
+
+    return Filter(must_not=[FieldCondition(key=KIND_FIELD, match=MatchValue(value="question"))])
+
+
+class SearchError(RuntimeError):
+    """Raised when a search cannot be run; the message is written for the person using the app."""
+
+
+_client = None
+_client_lock = threading.Lock()
 
 
-@st.cache_resource
 def get_qdrant_client():
     """
-    Initialize and return a cached QdrantClient connected to the cluster.
+    Initialize and return a shared QdrantClient connected to the cluster.
     
-    This function is cached so the connection is only made once per session,
-    improving performance and reducing connection overhead.
+    The client is built on first use and reused by every caller (and every
+    Streamlit session) afterwards, so the connection is only made once per
+    process and importing this module stays cheap.
     
     Returns:
         QdrantClient instance or None if connection fails
     """
-    try:
-        client = QdrantClient(
-            url=st.secrets["QDRANT_CLUSTER_URL"],
-            api_key=st.secrets["QDRANT_API_KEY"],
+    global _client
+    with _client_lock:
+        if _client is not None:
+            return _client
+
+        settings = get_settings()
+        if not settings.qdrant_cluster_url:
+            print("[ERROR] Missing Qdrant configuration: 'QDRANT_CLUSTER_URL'")
+            return None
+        try:
+            from qdrant_client import QdrantClient
+
+            _client = QdrantClient(
+                url=settings.qdrant_cluster_url,
+                api_key=settings.qdrant_api_key,
+            )
+            print("[INFO] Successfully connected to Qdrant.")
+            return _client
+        except Exception as e:
+            print(f"[ERROR] Qdrant connection failed: {e}")
+            return None
+
+
+class QdrantBackend:
+    """
+    Retrieval backend that queries the hosted Qdrant collection.
+
+    Every backend exposes search(vector, limit) and search_batch(vectors, limit)
+    and returns SearchHit results (see core.search_hit), best first.
+    Points classified as questions at ingestion (KIND_FIELD) are never returned.
+    See core.local_index.LocalVectorIndex for the in-process implementation.
+
+    On a quantized collection (see core.embed.create_collection) the
+    search over-fetches `oversampling` times as many candidates by quantized
+    score and, with `rescore`, re-ranks them with the original vectors.
+
+    With `compact_dimensions`, the collection holds named FULL_VECTOR and
+    COMPACT_VECTOR vectors. Searches then run in two stages: the compact
+    vectors are scanned for `compact_oversampling` times `limit` candidates,
+    and only those candidates are rescored with the full vectors.
+
+    Only the payload fields in PAYLOAD_FIELDS are fetched and vectors are
+    never returned, so a response carries the answers and nothing else.
+    """
+
+    def __init__(self, client, collection_name, quantization=QDRANT_QUANTIZATION,
+                 oversampling=SEARCH_OVERSAMPLING, rescore=SEARCH_RESCORE,
+                 compact_dimensions=SEARCH_COMPACT_DIMENSIONS, compact_oversampling=SEARCH_COMPACT_OVERSAMPLING):
+        self.client = client
+        self.collection_name = collection_name
+        self.quantization = quantization
+        self.oversampling = oversampling
+        self.rescore = rescore
+        self.compact_dimensions = compact_dimensions
+        self.compact_oversampling = compact_oversampling
+
+    def _search_params(self):
+        from qdrant_client.http.models import QuantizationSearchParams, SearchParams
+
+        quantization = None
+        if self.quantization != "none":
+            # Over-fetch by quantized score, then re-rank with the original vectors
+            quantization = QuantizationSearchParams(rescore=self.rescore, oversampling=self.oversampling)
+        return SearchParams(hnsw_ef=128, quantization=quantization)  # HNSW search parameter for quality
+
+    def search(self, vector, limit):
+        if self.compact_dimensions:
+            return self.search_batch([vector], limit)[0]
+
+        return _to_hits(self.client.search(
+            collection_name=self.collection_name,
+            query_vector=vector,
+            query_filter=answers_only_filter(),
+            limit=limit,
+            with_payload=PAYLOAD_FIELDS,
+            with_vectors=False,
+            search_params=self._search_params()
+        ))
+
+    def search_batch(self, vectors, limit):
+        from qdrant_client.http.models import SearchRequest
+
+        if self.compact_dimensions:
+            return self._search_two_stage(vectors, limit)
+
+        params = self._search_params()
+        answers_only = answers_only_filter()
+        batch = self.client.search_batch(
+            collection_name=self.collection_name,
+            requests=[
+                SearchRequest(
+                    vector=vector,
+                    filter=answers_only,
+                    limit=limit,
+                    with_payload=PAYLOAD_FIELDS,
+                    with_vector=False,
+                    params=params
+                )
+                for vector in vectors
+            ]
         )
-        print("[INFO] Successfully connected to Qdrant.")
-        return client
-    except KeyError as e:
-        st.error(f"Missing required secret: {e}. Please configure Streamlit secrets.")
-        print(f"[ERROR] Missing Qdrant configuration: {e}")
-        return None
-    except Exception as e:
-        st.error(f"Failed to connect to Qdrant: {e}")
-        print(f"[ERROR] Qdrant connection failed: {e}")
-        return None
+        return [_to_hits(found) for found in batch]
+
+    def _search_two_stage(self, vectors, limit):
+        from qdrant_client.http.models import (
+            Filter, HasIdCondition, NamedVector, QuantizationSearchParams, SearchParams, SearchRequest,
+        )
+
+        params = self._search_params()
+        answers_only = answers_only_filter()
+        candidates = self.client.search_batch(
+            collection_name=self.collection_name,
+            requests=[
+                SearchRequest(
+                    vector=NamedVector(name=COMPACT_VECTOR, vector=compact_vector(vector, self.compact_dimensions)),
+                    filter=answers_only,
+                    limit=math.ceil(limit * self.compact_oversampling),
+                    with_payload=False,
+                    with_vector=False,
+                    params=params
+                )
+                for vector in vectors
+            ]
+        )
+
+        # Rescore each question's candidates with its full vector; a search restricted to a
+        # handful of IDs is an exact comparison against just those points
+        rescore_params = None
+        if self.quantization != "none":
+            rescore_params = SearchParams(quantization=QuantizationSearchParams(ignore=True))
+        pending = [i for i, found in enumerate(candidates) if found]
+        rescored = self.client.search_batch(
+            collection_name=self.collection_name,
+            requests=[
+                SearchRequest(
+                    vector=NamedVector(name=FULL_VECTOR, vector=vectors[i]),
+                    filter=Filter(must=[HasIdCondition(has_id=[point.id for point in candidates[i]])]),
+                    limit=limit,
+                    with_payload=PAYLOAD_FIELDS,
+                    with_vector=False,
+                    params=rescore_params
+                )
+                for i in pending
+            ]
+        ) if pending else []
+
+        results = [[] for _ in vectors]
+        for i, found in zip(pending, rescored):
+            results[i] = _to_hits(found)
+        return results
+
+
+def _to_hits(points):
+    """Convert Qdrant ScoredPoints to SearchHits so the pydantic models are not kept around."""
+    return [SearchHit.from_payload(point.id, point.score, point.payload) for point in points]
+
+
+def _collection_name():
+    return get_settings().collection_name
+
+
+def get_search_backend():
+    """
+    Return the retrieval backend selected by the SEARCH_BACKEND setting.
+
+    "qdrant" (default) searches the hosted collection; "local" searches the
+    memory-mapped index built by scripts/build_local_index.py.
+
+    Raises:
+        RuntimeError: If the Qdrant client is not available
+        FileNotFoundError: If the local backend is selected but no index exists
+    """
+    if get_settings().search_backend == "local":
+        from core.local_index import get_local_index
+        return get_local_index()
+
+    client = get_qdrant_client()
+    if client is None:
+        raise RuntimeError("Qdrant client is not available. Cannot perform search.")
+    return QdrantBackend(client, _collection_name())
 
 
 def search_qdrant(vector, limit=5, min_score=0.3):
     """
-    Perform a semantic search on the Qdrant collection.
+    Perform a semantic search on the configured retrieval backend.
     
     Args:
-        vector: The embedding vector to search with (1536 dimensions for OpenAI)
+        vector: The embedding vector to search with (EMBEDDING_DIMENSIONS long)
         limit: Maximum number of results to return (default: 5)
         min_score: Minimum similarity score threshold (default: 0.3)
         
     Returns:
-        List of search results (ScoredPoint objects) or empty list if error occurs
+        List of search results (SearchHit objects)
+
+    Raises:
+        SearchError: If the search fails; the error is also logged
         
     Note:
         Results are automatically filtered by min_score to exclude low-quality matches
     """
-    client = get_qdrant_client()
-    if client is None:
-        st.error("Qdrant client is not available. Cannot perform search.")
+    try:
+        results = get_search_backend().search(vector, limit)
+    except Exception as e:
+        raise _search_error("Search", e) from e
+
+    # Filter out low-confidence results
+    return _filter_by_score(results, min_score)
+
+
+def search_qdrant_batch(vectors, limit=5, min_score=0.3):
+    """
+    Search the configured retrieval backend for many vectors in a single request.
+
+    With Qdrant this uses the batch search endpoint so N questions cost one
+    round trip instead of N; the local backend answers the whole batch with
+    one matrix multiply. Score filtering matches search_qdrant.
+
+    Args:
+        vectors: List of embedding vectors to search with
+        limit: Maximum number of results to return per vector (default: 5)
+        min_score: Minimum similarity score threshold (default: 0.3)
+
+    Returns:
+        List of result lists aligned with `vectors`
+
+    Raises:
+        SearchError: If the search fails; the error is also logged
+    """
+    if not vectors:
         return []
-    
-    # Get collection name from secrets with fallback
-    collection_name = st.secrets.get("COLLECTION_NAME", "past_rfp_answers")
 
     try:
-        results = client.search(
-            collection_name=collection_name,
-            query_vector=vector,
-            limit=limit,
-            with_payload=True,
-            search_params=SearchParams(hnsw_ef=128)  # HNSW search parameter for quality
-        )
-        
-        # Filter out low-confidence results
-        filtered_results = [r for r in results if r.score >= min_score]
-        
-        if len(filtered_results) < len(results):
-            print(f"[INFO] Filtered {len(results) - len(filtered_results)} low-score results")
-        
-        return filtered_results
+        batch_results = get_search_backend().search_batch(vectors, limit)
+    except Exception as e:
+        raise _search_error("Batch search", e) from e
+
+    return [_filter_by_score(results, min_score) for results in batch_results]
+
 
-    except UnexpectedResponse as e:
-        # Collection doesn't exist
-        st.error(
-            f"⚠️ Collection '{collection_name}' not found in Qdrant. "
+def _filter_by_score(results, min_score):
+    """Drop results below `min_score`, logging how many were removed."""
+    filtered_results = [r for r in results if r.score >= min_score]
+
+    if len(filtered_results) < len(results):
+        print(f"[INFO] Filtered {len(results) - len(filtered_results)} low-score results")
+
+    return filtered_results
+
+
+def _is_missing_collection(error):
+    # Only Qdrant raises this, so it has already been imported when it can match
+    from qdrant_client.http.exceptions import UnexpectedResponse
+    return isinstance(error, UnexpectedResponse)
+
+
+def _search_error(operation, error):
+    """Log a failed search and return the SearchError describing it to the user."""
+    if _is_missing_collection(error):
+        message = (
+            f"Collection '{_collection_name()}' not found in Qdrant. "
             "Please rebuild the database using the 'Database Management' section."
         )
-        print(f"[ERROR] Collection '{collection_name}' not found in Qdrant.")
-        return []
-        
-    except Exception as e:
-        st.error(f"An error occurred during search: {e}")
-        print(f"[ERROR] Qdrant search failed: {e}")
-        return []
+    else:
+        message = f"{operation} failed: {error}"
+    print(f"[ERROR] {message}")
+    return SearchError(message)
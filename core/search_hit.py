@@ -0,0 +1,55 @@
+# core/search_hit.py
+# Compact search result record shared by every retrieval backend
+
+# The only payload fields drafting reads, including the names used by older ingestion scripts.
+# Searches ask Qdrant for these alone; the stored question and any other fields stay on the server
+PAYLOAD_FIELDS = ["answer", "text", "text_content", "source", "source_file", "kind"]
+
+
+class SearchHit:
+    """
+    One retrieved answer: point ID, similarity score and the fields a draft uses.
+
+    The payload layouts of older ingestion scripts ('answer'/'text'/
+    'text_content' and 'source'/'source_file') are resolved once, when the
+    hit is created, so nothing downstream needs to know about them. Slots
+    keep large batches of hits small compared with ScoredPoint models.
+    """
+
+    __slots__ = ("id", "score", "answer", "source", "kind")
+
+    def __init__(self, id, score, answer="", source="Unknown", kind=None):
+        self.id = id
+        self.score = score
+        self.answer = answer
+        self.source = source
+        self.kind = kind
+
+    @classmethod
+    def from_payload(cls, point_id, score, payload):
+        """Build a hit from a point ID, score and (possibly legacy) payload dict."""
+        payload = payload or {}
+        return cls(
+            point_id,
+            score,
+            answer=(payload.get("answer") or payload.get("text") or payload.get("text_content") or "").strip(),
+            source=payload.get("source") or payload.get("source_file") or "Unknown",
+            kind=payload.get("kind"),
+        )
+
+    @classmethod
+    def from_point(cls, point):
+        """Return `point` as a SearchHit; ScoredPoint-like objects are converted."""
+        if isinstance(point, cls):
+            return point
+        return cls.from_payload(point.id, point.score, point.payload)
+
+    def to_dict(self) -> dict:
+        return {"id": self.id, "score": self.score, "answer": self.answer, "source": self.source, "kind": self.kind}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["id"], data["score"], data["answer"], data["source"], data.get("kind"))
+
+    def __repr__(self):
+        return f"SearchHit(id={self.id!r}, score={self.score:.4f}, source={self.source!r})"
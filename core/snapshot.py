@@ -0,0 +1,205 @@
+# core/snapshot.py
+# Single-file export of the knowledge base, restorable without re-parsing or re-embedding
+#
+# File layout (little-endian):
+#   MAGIC (8 bytes)
+#   float32 vectors, count x dim, row-major and contiguous (so they can be memory-mapped)
+#   header JSON: format version, embedding model, dim, count and one column per field
+#     ("id", "question", "answer", "source", "kind"), row i describing vector i
+#   header length (uint64), MAGIC (8 bytes)
+# The header goes last so vectors can be streamed to disk while the collection is scrolled.
+
+import json
+import os
+import struct
+
+import numpy as np
+
+from core.config import EMBEDDING_DIMENSIONS, LOCAL_INDEX_DIR, QDRANT_KEEP_VERSIONS, SEARCH_COMPACT_DIMENSIONS
+from core.embed import build_version, point_vector, upload_points
+from core.generate import EMBEDDING_MODEL, looks_like_question
+from core.local_index import reset_local_index, write_local_index
+from core.search import FULL_VECTOR, KIND_FIELD
+from core.search_hit import PAYLOAD_FIELDS, SearchHit
+
+MAGIC = b"RFPSNAP1"
+FORMAT_VERSION = 1
+COLUMNS = ("id", "question", "answer", "source", "kind")
+_FOOTER = struct.Struct("<Q8s")
+
+
+def export_snapshot(client, collection_name, path, page_size=256) -> int:
+    """
+    Write every point of a collection (vector and Q&A payload) to a snapshot file.
+
+    Payloads from older ingestion scripts ('text'/'text_content',
+    'source_file') are written under the current field names, and points
+    without a kind are classified as answers or questions.
+
+    Vectors are written as they are scrolled, so memory use is proportional to
+    the payload text only. The file is written under a temporary name and
+    renamed at the end.
+
+    Returns:
+        Number of points written
+    """
+    columns = {name: [] for name in COLUMNS}
+    dim = None
+    tmp_path = f"{path}.tmp"
+
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        offset = None
+        while True:
+            records, offset = client.scroll(
+                collection_name=collection_name,
+                limit=page_size,
+                offset=offset,
+                with_payload=["question", *PAYLOAD_FIELDS],
+                with_vectors=True
+            )
+            for record in records:
+                vector = record.vector
+                if isinstance(vector, dict):  # Compact vectors are derived again on import
+                    vector = vector[FULL_VECTOR]
+                row = np.asarray(vector, dtype="<f4")
+                if dim is None:
+                    dim = row.shape[0]
+                elif row.shape[0] != dim:
+                    raise ValueError(f"Point {record.id} has {row.shape[0]} dimensions, expected {dim}.")
+                f.write(row.tobytes())
+
+                payload = record.payload or {}
+                hit = SearchHit.from_payload(record.id, 0.0, payload)  # Resolves legacy field names
+                columns["id"].append(record.id)  # UUID string or integer, as stored
+                columns["question"].append(payload.get("question", ""))
+                columns["answer"].append(hit.answer)
+                columns["source"].append(hit.source)
+                # Points archived before classification are labeled the way classify_unlabeled_points would
+                columns["kind"].append(hit.kind or ("question" if looks_like_question(hit.answer) else "answer"))
+            if offset is None:
+                break
+
+        header = json.dumps({
+            "format": FORMAT_VERSION,
+            "model": EMBEDDING_MODEL,
+            "dim": dim or 0,
+            "count": len(columns["id"]),
+            "columns": columns,
+        }, ensure_ascii=False).encode("utf-8")
+        f.write(header)
+        f.write(_FOOTER.pack(len(header), MAGIC))
+
+    os.replace(tmp_path, path)
+    print(f"[INFO] Exported {len(columns['id'])} points from '{collection_name}' to '{path}'.")
+    return len(columns["id"])
+
+
+class Snapshot:
+    """
+    Read-only view of a snapshot file.
+
+    The vectors are memory-mapped rather than loaded, so iterating the points
+    reads the file sequentially and never holds more than the page cache.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        size = os.path.getsize(path)
+
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"'{path}' is not a knowledge-base snapshot.")
+            f.seek(size - _FOOTER.size)
+            header_length, magic = _FOOTER.unpack(f.read(_FOOTER.size))
+            if magic != MAGIC:
+                raise ValueError(f"Snapshot '{path}' is truncated.")
+            f.seek(size - _FOOTER.size - header_length)
+            header = json.loads(f.read(header_length).decode("utf-8"))
+
+        if header["format"] != FORMAT_VERSION:
+            raise ValueError(f"Snapshot '{path}' has unsupported format {header['format']}.")
+        self.model = header["model"]
+        self.dim = header["dim"]
+        self.columns = header["columns"]
+        count = header["count"]
+
+        if len(MAGIC) + count * self.dim * 4 + header_length + _FOOTER.size != size:
+            raise ValueError(f"Snapshot '{path}' is truncated.")
+        self.vectors = (
+            np.memmap(path, dtype="<f4", mode="r", offset=len(MAGIC), shape=(count, self.dim))
+            if count else np.zeros((0, self.dim), dtype=np.float32)
+        )
+
+    def __len__(self):
+        return len(self.columns["id"])
+
+    def iter_points(self, include_questions=True):
+        """Yield (point_id, vector, payload) for every point, in file order."""
+        for i, point_id in enumerate(self.columns["id"]):
+            kind = self.columns["kind"][i]
+            if not include_questions and kind == "question":
+                continue
+            payload = {
+                "question": self.columns["question"][i],
+                "answer": self.columns["answer"][i],
+                "source": self.columns["source"][i],
+                KIND_FIELD: kind,
+            }
+            yield point_id, self.vectors[i], payload
+
+    def check_compatible(self, dimensions=EMBEDDING_DIMENSIONS):
+        """Raise ValueError unless searches embed questions with this snapshot's model and size."""
+        if self.model != EMBEDDING_MODEL or (len(self) and self.dim != dimensions):
+            raise ValueError(
+                f"Snapshot vectors are {self.model} with {self.dim} dimensions, but questions are embedded "
+                f"with {EMBEDDING_MODEL} at {dimensions} dimensions."
+            )
+
+
+def restore_snapshot_to_qdrant(client, path, keep_versions=QDRANT_KEEP_VERSIONS, **collection_options) -> str:
+    """
+    Load a snapshot into a new collection version and make it live (see core.embed.build_version).
+
+    Points keep their IDs, so later archive syncs recognise them. No
+    embeddings are requested; compact vectors, if configured, are derived
+    from the stored ones.
+
+    Returns:
+        Name of the collection now live
+    """
+    from qdrant_client.models import PointStruct
+
+    snapshot = Snapshot(path)
+    snapshot.check_compatible(collection_options.get("dimensions", EMBEDDING_DIMENSIONS))
+    compact_dimensions = collection_options.get("compact_dimensions", SEARCH_COMPACT_DIMENSIONS)
+
+    def load(version):
+        points = (
+            PointStruct(id=point_id, vector=point_vector(vector.tolist(), compact_dimensions), payload=payload)
+            for point_id, vector, payload in snapshot.iter_points()
+        )
+        upload_points(client, version, points)
+        return len(snapshot)
+
+    version = build_version(client, load, keep_versions, **collection_options)
+    print(f"[INFO] Restored {len(snapshot)} points from '{path}' into '{version}'.")
+    return version
+
+
+def restore_snapshot_to_local_index(path, directory=LOCAL_INDEX_DIR, dimensions=EMBEDDING_DIMENSIONS) -> int:
+    """
+    Write a snapshot's answers into the local index used by SEARCH_BACKEND=local.
+
+    Points classified as questions are left out, just as Qdrant searches skip them.
+
+    Returns:
+        Number of points written
+    """
+    snapshot = Snapshot(path)
+    snapshot.check_compatible(dimensions)
+    points = snapshot.iter_points(include_questions=False)
+    count = write_local_index(directory, ((str(point_id), vector, payload) for point_id, vector, payload in points))
+    reset_local_index()
+    print(f"[INFO] Wrote {count} points from '{path}' to local index '{directory}'.")
+    return count
@@ -0,0 +1,32 @@
+# core/timing.py
+# Stage timing spans recorded in the draft log
+
+import time
+
+# Pipeline stages, in execution order
+STAGES = ("extraction", "embedding", "search", "assembly", "write")
+
+
+def elapsed_ms(start):
+    """Milliseconds since a time.perf_counter() reading."""
+    return (time.perf_counter() - start) * 1000
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(values):
+    """Return count, total and p50/p95/max of a list of millisecond timings."""
+    if not values:
+        return {"count": 0, "total_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+    return {
+        "count": len(values),
+        "total_ms": round(sum(values), 3),
+        "p50_ms": round(percentile(values, 50), 3),
+        "p95_ms": round(percentile(values, 95), 3),
+        "max_ms": round(max(values), 3),
+    }
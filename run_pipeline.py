@@ -1,103 +1,440 @@
 # run_pipeline.py (The final, complete, and correctly structured version)
 
-from core.logger import log_result
-from core.search import search_qdrant
-from core.generate import get_embedding, generate_draft_answer
+from core.logger import log_result, log_run_summary, flush_logs
+from core.search import SearchError, search_qdrant_batch
+from core.generate import get_embeddings, generate_draft_answer
 from core.extract import extract_questions_from_docx
-from core.config import OUTPUT_DIR, REVIEW_SCORE_THRESHOLD
+from core.embedding_cache import get_embedding_cache
+from core.draft_cache import get_draft_cache
+from core.question_index import get_question_index
+from core.dedupe import group_duplicates
+from core.config import (
+    OUTPUT_DIR, REVIEW_SCORE_THRESHOLD, PIPELINE_WORKERS, SEARCH_BATCH_SIZE, EMBEDDING_BATCH_SIZE,
+    STREAM_FIRST_CHUNK_SIZE,
+)
+from core.timing import STAGES, elapsed_ms, summarize
 import os
+import time
+import uuid
 import argparse
+from bisect import bisect_right
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from docx import Document
 from docx.shared import Pt
-from pathlib import Path
-from dotenv import load_dotenv
 
-# --- Load environment variables reliably ---
-project_root = Path(__file__).parent.parent
-dotenv_path = project_root / ".env"
-load_dotenv(dotenv_path=dotenv_path)
 
-# --- Import your project's core functions ---
+def build_result(question: str, results: list) -> dict:
+    """
+    Draft an answer for one question from its search results.
+
+    Any exception is caught and turned into a "needs review" result so one
+    failing question never aborts the rest of the RFP.
+
+    Returns:
+        Dict with 'question', 'top_score', 'needs_review' and 'draft' keys
+    """
+    try:
+        # Generate the draft answer using the search results
+        draft = generate_draft_answer(question, results)
+
+        # Determine if the draft needs human review based on the top score
+        top_score = results[0].score if results else 0.0
+        needs_review = top_score < REVIEW_SCORE_THRESHOLD
+
+        if not results or needs_review:
+            draft = f"[⚠ Needs review | Top Score: {top_score:.2f}]\n{draft}"
+    except Exception as e:
+        print(f"[ERROR] Failed to process question '{question[:60]}...': {e}")
+        top_score = 0.0
+        needs_review = True
+        draft = f"[⚠ Needs review | Error: {e}]"
+
+    return {
+        "question": question,
+        "top_score": top_score,
+        "needs_review": needs_review,
+        "draft": draft
+    }
+
+
+def _stream_chunks(count: int) -> list[tuple[int, int]]:
+    """Split `count` items into (start, end) chunks that double from STREAM_FIRST_CHUNK_SIZE."""
+    bounds = []
+    start, size = 0, max(1, STREAM_FIRST_CHUNK_SIZE)
+    while start < count:
+        bounds.append((start, min(count, start + size)))
+        start += size
+        size = min(size * 2, max(EMBEDDING_BATCH_SIZE, STREAM_FIRST_CHUNK_SIZE))
+    return bounds
+
+
+def iter_resolved_questions(questions: list[str], workers: int = PIPELINE_WORKERS):
+    """
+    Draft an answer for every question, yielding each result as soon as it is ready.
+
+    Exact and near-duplicate questions (see core.dedupe.group_duplicates) are
+    grouped and each group is resolved once. Copies keep their own question
+    text and carry 'duplicate_of' with the 1-based number of the first
+    occurrence (None on originals). A group's timing spans are split evenly
+    across its occurrences.
+
+    The distinct questions are resolved in chunks that start small and grow
+    (see _stream_chunks), `workers` chunks at a time, so the first answers
+    are available after one small embedding and search round trip.
+    Closing the generator early cancels chunks that have not started.
+
+    Yields:
+        Result dicts (see build_result) in the original question order
+    """
+    representatives, assignment = group_duplicates(questions)
+    if len(representatives) < len(questions):
+        print(f"[INFO] {len(questions) - len(representatives)} duplicate question(s) "
+              f"will reuse the answer of an earlier question.")
+
+    unique = [questions[i] for i in representatives]
+    bounds = _stream_chunks(len(unique))
+    group_sizes = Counter(assignment)
+
+    # Both check the archive revision, which reads the manifest, so they are looked up once per run
+    question_index = get_question_index()
+    draft_cache = get_draft_cache()
+
+    executor = ThreadPoolExecutor(max_workers=max(1, workers))
+    try:
+        futures = [
+            executor.submit(_resolve_unique, unique[start:end], 1, question_index, draft_cache)
+            for start, end in bounds
+        ]
+        chunk_starts = [start for start, _ in bounds]
+
+        for i, (question, group) in enumerate(zip(questions, assignment)):
+            # Groups are numbered in order of first occurrence, so this waits on chunks in order
+            chunk = bisect_right(chunk_starts, group) - 1
+            group_result = futures[chunk].result()[group - chunk_starts[chunk]]
+
+            original = representatives[group]
+            result = dict(group_result, question=question)
+            result["duplicate_of"] = original + 1 if original != i else None
+            result["timings_ms"] = {
+                stage: ms / group_sizes[group] for stage, ms in group_result["timings_ms"].items()
+            }
+            yield result
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def resolve_questions(questions: list[str], workers: int = PIPELINE_WORKERS) -> list[dict]:
+    """
+    Draft an answer for every question (see iter_resolved_questions).
+
+    Returns:
+        List of result dicts (see build_result) in the original question order
+    """
+    return list(iter_resolved_questions(questions, workers=workers))
+
+
+def _resolve_unique(questions: list[str], workers: int = PIPELINE_WORKERS, question_index=None,
+                    draft_cache=None) -> list[dict]:
+    """
+    Embed all questions, search them in batches, and draft an answer for each.
+
+    Questions whose normalized text matches an archived question are answered
+    straight from the question index (see core.question_index) with score 1.0
+    and are neither embedded nor searched. The others are embedded in as few
+    API calls as possible. Questions that are near-identical to one answered
+    since the archive last changed reuse that answer from the draft cache;
+    the rest are resolved with batched Qdrant searches of up to
+    SEARCH_BATCH_SIZE queries, run concurrently on `workers` threads.
+
+    Each result carries 'exact_match' and 'draft_cache_hit' flags and a
+    'timings_ms' dict with its 'embedding', 'search' and 'assembly' spans.
+    Batched stages are split evenly across the questions in the batch.
+    Questions whose search failed also carry the 'search_error' message; if
+    embedding fails, the questions that needed it go to review with the error.
+
+    Args:
+        questions: Distinct questions to resolve
+        workers: Number of search batches run concurrently
+        question_index: QuestionIndex from get_question_index, or None to skip exact matching
+        draft_cache: DraftCache from get_draft_cache, or None to skip the draft cache
+
+    Returns:
+        List of result dicts (see build_result) in the original question order
+    """
+    start = time.perf_counter()
+    exact = question_index.lookup_many(questions) if question_index is not None else [[] for _ in questions]
+    exact_ms = elapsed_ms(start) / len(questions) if questions else 0.0
+
+    # Questions already in the archive are answered from it without embedding or searching
+    pending = [i for i, matches in enumerate(exact) if not matches]
+    start = time.perf_counter()
+    vectors = [None] * len(questions)
+    embedding_error = "could not embed question"
+    try:
+        for i, vector in zip(pending, get_embeddings([questions[i] for i in pending]) if pending else []):
+            vectors[i] = vector
+    except Exception as e:
+        # E.g. no OpenAI client, or a batch that exhausted its retries; the chunk's questions go to review
+        print(f"[ERROR] Failed to embed {len(pending)} question(s): {e}")
+        embedding_error = str(e)
+    embedding_ms = elapsed_ms(start) / len(pending) if pending else 0.0
+
+    # Only questions that embedded successfully are searched
+    searchable = [(i, vector) for i, vector in enumerate(vectors) if vector is not None]
+
+    start = time.perf_counter()
+    cached = {}
+    if draft_cache is not None and searchable:
+        for (i, _), hit in zip(searchable, draft_cache.lookup_many([v for _, v in searchable])):
+            if hit is not None:
+                cached[i] = hit
+        searchable = [(i, v) for i, v in searchable if i not in cached]
+    lookup_ms = elapsed_ms(start) / len(questions) if questions else 0.0
+
+    chunks = [searchable[start:start + SEARCH_BATCH_SIZE]
+              for start in range(0, len(searchable), SEARCH_BATCH_SIZE)]
+
+    def search_chunk(chunk):
+        chunk_start = time.perf_counter()
+        try:
+            batch, error = search_qdrant_batch([v for _, v in chunk]), None
+        except SearchError as e:
+            batch, error = None, str(e)
+        return batch, error, elapsed_ms(chunk_start) / len(chunk)
+
+    search_results = {}
+    search_errors = {}
+    search_ms = {}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        for chunk, (batch, error, per_question_ms) in zip(chunks, executor.map(search_chunk, chunks)):
+            for n, (i, _) in enumerate(chunk):
+                if error is None:
+                    search_results[i] = batch[n]
+                else:
+                    search_errors[i] = error
+                search_ms[i] = per_question_ms
+
+    resolved = []
+    to_cache = []
+    for i, question in enumerate(questions):
+        start = time.perf_counter()
+        if exact[i]:
+            result = build_result(question, exact[i])
+        elif i in cached:
+            result = dict(cached[i][1], question=question)
+        elif i in search_errors:
+            result = {
+                "question": question,
+                "top_score": 0.0,
+                "needs_review": True,
+                "draft": f"[⚠ Needs review | Error: {search_errors[i]}]",
+                "search_error": search_errors[i],
+            }
+        elif i not in search_results:
+            result = {
+                "question": question,
+                "top_score": 0.0,
+                "needs_review": True,
+                "draft": f"[⚠ Needs review | Error: {embedding_error}]"
+            }
+        else:
+            result = build_result(question, search_results[i])
+            # Questions without results are not cached, so they are searched again once the archive grows
+            if search_results[i]:
+                to_cache.append((question, vectors[i], search_results[i], dict(result)))
+        result["exact_match"] = bool(exact[i])
+        result["draft_cache_hit"] = i in cached
+        result["timings_ms"] = {
+            "embedding": 0.0 if exact[i] else embedding_ms,
+            "search": exact_ms + (0.0 if exact[i] else lookup_ms + search_ms.get(i, 0.0)),
+            "assembly": elapsed_ms(start),
+        }
+        resolved.append(result)
+
+    if draft_cache is not None and to_cache:
+        draft_cache.put_many(to_cache)
+    return resolved
+
 
+def _add_answer(doc, index, question, draft):
+    """Append a bold question and its draft answer to a Word document."""
+    p_q = doc.add_paragraph()
+    run_q = p_q.add_run(f"Q{index}: {question}")
+    run_q.bold = True
+    run_q.font.size = Pt(11)
+    p_q.space_after = Pt(6)
 
-def run_pipeline(input_path: str):
+    p_a = doc.add_paragraph(draft)
+    p_a.space_after = Pt(14)
+
+
+def build_draft_document(results: list[dict], heading: str = "RFP Draft Responses"):
+    """Return a Word document with every result so far, numbered in order."""
+    doc = Document()
+    doc.add_heading(heading, level=1)
+    for i, result in enumerate(results, 1):
+        _add_answer(doc, i, result["question"], result["draft"])
+    return doc
+
+
+class PipelineCancelled(Exception):
+    """Raised by run_pipeline when its cancel_event is set before the run finishes."""
+
+
+def run_pipeline(input_path: str, workers: int = PIPELINE_WORKERS, progress_callback=None,
+                 output_dir: str = OUTPUT_DIR, cancel_event=None, input_name: str = None):
     """
     The main pipeline function that processes an RFP document from start to finish.
+
+    Questions are resolved in growing chunks on a pool of `workers` threads
+    and written to the output documents in the original question order as
+    soon as each answer is ready.
+
+    Every question is logged with its per-stage timing spans, followed by a
+    'run_summary' record with per-stage totals and percentiles for the run.
+
+    Args:
+        input_path: Path to the new RFP .docx file
+        workers: Number of question chunks resolved concurrently
+        progress_callback: Optional callable(done, total, result) called in
+            question order as each answer is drafted
+        output_dir: Directory the draft documents are written to
+        cancel_event: Optional threading.Event; once set, the run stops
+            before the next answer and writes no output
+        input_name: Name reported as the summary's 'input' (defaults to the
+            file name of input_path)
+
+    Returns:
+        The run summary dict, including 'full_draft' and 'review_draft'
+        output paths ('review_draft' is None when nothing needs review) and
+        the distinct 'search_errors' messages, or None if the document has
+        no questions
+
+    Raises:
+        PipelineCancelled: If cancel_event was set during the run
     """
+    run_start = time.perf_counter()
+    run_id = uuid.uuid4().hex[:12]
+
+    # The cache counters are process-wide, so the run reports how far they moved
+    embedding_cache = get_embedding_cache()
+    cache_start = embedding_cache.stats() if embedding_cache is not None else None
+
     print(f"\n[-->] Loading RFP: {input_path}")
     questions = extract_questions_from_docx(input_path)
     if not questions:
         print("X No valid questions found in the document.")
-        return
+        return None
 
+    extraction_ms = elapsed_ms(run_start) / len(questions)
+    workers = max(1, workers)
     print(
-        f"Extracted {len(questions)} questions. Starting draft generation...\n")
+        f"Extracted {len(questions)} questions. Starting draft generation with {workers} worker(s)...\n")
 
     # --- Initialize Word documents for output ---
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    os.makedirs(output_dir, exist_ok=True)
     full_doc = Document()
     full_doc.add_heading("RFP Draft Responses", level=1)
 
     review_doc = Document()
     review_doc.add_heading("[!] Needs Review", level=1)
 
-    # --- This loop is now correctly INSIDE the function ---
-    for i, question in enumerate(questions, 1):
-        print(f"Processing Q{i}: {question[:100]}...")
-
-        # Get embedding and search Qdrant
-        vector = get_embedding(question)
-        results = search_qdrant(vector)
-
-        # Generate the draft answer using the search results
-        draft = generate_draft_answer(question, results)
-
-        # Determine if the draft needs human review based on the top score
-        top_score = results[0].score if results else 0.0
-        needs_review = top_score < REVIEW_SCORE_THRESHOLD
-
-        if not results or needs_review:
-            draft = f"[⚠ Needs review | Top Score: {top_score:.2f}]\n{draft}"
+    resolved = []
+    for i, result in enumerate(iter_resolved_questions(questions, workers=workers), 1):
+        if cancel_event is not None and cancel_event.is_set():
+            print(f"[INFO] Run {run_id} cancelled after {i - 1} of {len(questions)} questions.")
+            raise PipelineCancelled(run_id)
 
-        # Log the outcome for this question
-        log_result({
-            "question": question,
-            "top_score": top_score,
-            "needs_review": needs_review,
-            "draft": draft
-        })
+        question = result["question"]
+        print(f"Processed Q{i}: {question[:100]}...")
 
+        start = time.perf_counter()
         # Add the question and generated draft to the main .docx file
-        p_q = full_doc.add_paragraph()
-        run_q = p_q.add_run(f"Q{i}: {question}")
-        run_q.bold = True
-        run_q.font.size = Pt(11)
-        p_q.space_after = Pt(6)
-
-        p_a = full_doc.add_paragraph(draft)
-        p_a.space_after = Pt(14)
+        _add_answer(full_doc, i, question, result["draft"])
 
         # If it needs review, also add it to the separate review .docx file
-        if needs_review:
-            p_q_r = review_doc.add_paragraph()
-            run_q_r = p_q_r.add_run(f"Q{i}: {question}")
-            run_q_r.bold = True
-            run_q_r.font.size = Pt(11)
-            p_q_r.space_after = Pt(6)
+        if result["needs_review"]:
+            _add_answer(review_doc, i, question, result["draft"])
+        result["timings_ms"]["write"] = elapsed_ms(start)
+        resolved.append(result)
 
-            p_a_r = review_doc.add_paragraph(draft)
-            p_a_r.space_after = Pt(14)
+        if progress_callback:
+            progress_callback(i, len(questions), result)
 
     # --- Save the generated Word documents ---
-    full_path = os.path.join(OUTPUT_DIR, "generated_rfp_draft.docx")
+    start = time.perf_counter()
+    full_path = os.path.join(output_dir, "generated_rfp_draft.docx")
     full_doc.save(full_path)
     print(f"\n✅ Full draft saved to: {full_path}")
 
-    # Only save the review document if it contains questions
+    # Only save the review document if it contains questions, and never leave
+    # one from an earlier run next to this run's draft
+    review_path = os.path.join(output_dir, "low_confidence_rfp_draft.docx")
     if len(review_doc.paragraphs) > 1:
-        review_path = os.path.join(OUTPUT_DIR, "low_confidence_rfp_draft.docx")
         review_doc.save(review_path)
         print(f"ℹ️ Low-confidence draft saved to: {review_path}")
+    else:
+        if os.path.exists(review_path):
+            os.remove(review_path)
+        review_path = None
+    save_ms = elapsed_ms(start) / len(resolved)
+
+    # --- Log each question with its timing spans, then the run summary ---
+    for result in resolved:
+        timings = result["timings_ms"]
+        timings["extraction"] = extraction_ms
+        timings["write"] += save_ms
+        entry = dict(result, run_id=run_id)
+        entry["timings_ms"] = {stage: round(timings[stage], 3) for stage in STAGES}
+        log_result(entry)
+
+    summary = {
+        "run_id": run_id,
+        "input": input_name or os.path.basename(input_path),
+        "questions": len(resolved),
+        "needs_review": sum(1 for r in resolved if r["needs_review"]),
+        "duplicates": sum(1 for r in resolved if r["duplicate_of"] is not None),
+        "exact_matches": sum(1 for r in resolved if r["exact_match"]),
+        "workers": workers,
+        "full_draft": full_path,
+        "review_draft": review_path,
+        "total_ms": round(elapsed_ms(run_start), 3),
+        "stages": {stage: summarize([r["timings_ms"][stage] for r in resolved]) for stage in STAGES},
+        "search_errors": sorted({r["search_error"] for r in resolved if "search_error" in r}),
+    }
+
+    draft_cache = get_draft_cache()
+    if draft_cache is not None:
+        # Duplicates and exact matches never reach the cache, so the rate is over the rest
+        lookups = [r for r in resolved if r["duplicate_of"] is None and not r["exact_match"]]
+        hits = sum(1 for r in lookups if r["draft_cache_hit"])
+        summary["draft_cache"] = {
+            "hits": hits,
+            "hit_rate": round(hits / len(lookups), 4) if lookups else 0.0,
+            "entries": draft_cache.stats()["entries"],
+        }
+        print(f"[INFO] Draft cache: {hits}/{len(lookups)} distinct question(s) answered from cache")
+
+    if embedding_cache is not None:
+        cache_end = embedding_cache.stats()
+        hits = cache_end["hits"] - cache_start["hits"]
+        misses = cache_end["misses"] - cache_start["misses"]
+        summary["embedding_cache"] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "entries": cache_end["entries"],
+        }
+        print(f"[INFO] Embedding cache: {hits} hit(s), {misses} miss(es), "
+              f"{cache_end['entries']} cached vector(s)")
+
+    log_run_summary(summary)
+    flush_logs()
+    print(f"[INFO] Run {run_id} finished in {summary['total_ms'] / 1000:.2f}s ("
+          + ", ".join(f"{stage} {summary['stages'][stage]['total_ms'] / 1000:.2f}s" for stage in STAGES)
+          + ")")
+    return summary
 
 
 # This part allows the script to be run from the command line for local testing
@@ -106,5 +443,7 @@ if __name__ == "__main__":
         description="Run full RFP automation pipeline.")
     parser.add_argument("--rfp", required=True,
                         help="Path to new RFP .docx file")
+    parser.add_argument("--workers", type=int, default=PIPELINE_WORKERS,
+                        help=f"Number of concurrent search batches (default: {PIPELINE_WORKERS})")
     args = parser.parse_args()
-    run_pipeline(args.rfp)
+    run_pipeline(args.rfp, workers=args.workers)
@@ -2,7 +2,7 @@ import json
 import os
 from docx import Document
 from qdrant_client import QdrantClient
-from qdrant_client.http.models import SearchParams
+from qdrant_client.http.models import SearchParams, SearchRequest
 from generate_drafts import generate_draft_answer
 from qa_generation import generate_reviewable_draft
 from dotenv import load_dotenv
@@ -17,6 +17,7 @@ COLLECTION_NAME = "past_rfp_answers"
 EXTRACTED_QUESTIONS_PATH = "output/extracted_questions.json"
 OUTPUT_DOCX_PATH = "output/generated_rfp_draft.docx"
 OLLAMA_MODEL = "llama3"
+OLLAMA_EMBEDDING_MODEL = "nomic-embed-text"
 
 # Prompt C instruction
 PROMPT_C_INSTRUCTION = (
@@ -24,6 +25,17 @@ PROMPT_C_INSTRUCTION = (
     "Improve or expand it using insight from the others and create a concise, professional response"
 )
 
+# Helper - get ollama embedding
+
+
+def get_embedding(text):
+    response = requests.post(
+        "http://localhost:11434/api/embeddings",
+        json={"model": OLLAMA_EMBEDDING_MODEL, "prompt": text}
+    )
+    return response.json()["embedding"]
+
+
 # Connect to qdrant
 client = QdrantClient(
     url=QDRANT_CLUSTER_URL,
@@ -42,23 +54,23 @@ doc.add_heading("RFP Draft Responses", level=1)
 for filename, questions in all_questions.items():
     doc.add_heading(f"File: {filename}", level=2)
 
-    for i, question in enumerate(questions, 1):
-        print(f"🔍 Q{i}: {question}")
+    # Embed every question first, then resolve them all with one batch search
+    vectors = [get_embedding(question) for question in questions]
+    batch_results = client.search_batch(
+        collection_name=COLLECTION_NAME,
+        requests=[
+            SearchRequest(
+                vector=vector,
+                limit=3,
+                with_payload=["answer"],  # only the answer text is used below
+                params=SearchParams(hnsw_ef=128)
+            )
+            for vector in vectors
+        ]
+    )
 
-        # embed question
-        embedding = requests.post(
-            "http://localhost:11434/api/embeddings",
-            json={"model": "nomic-embed-text", "prompt": question}
-        ).json()["embedding"]
-
-        # search qdrant
-        results = client.search(
-            collection_name=COLLECTION_NAME,
-            query_vector=embedding,
-            limit=3,
-            with_payload=True,
-            search_params=SearchParams(hnsw_ef=128)
-        )
+    for i, (question, results) in enumerate(zip(questions, batch_results), 1):
+        print(f"🔍 Q{i}: {question}")
         top_answers = [r.payload["answer"] for r in results]
 
         # generate draft
@@ -2,7 +2,7 @@ import json
 import requests
 import os
 from qdrant_client import QdrantClient
-from qdrant_client.http.models import SearchParams
+from qdrant_client.http.models import SearchParams, SearchRequest
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -37,18 +37,23 @@ client = QdrantClient(
 for filename, questions in data.items():
     print(f"\n📄 Processing file: {filename}")
 
-    for i, question in enumerate(questions, 1):
-        print(f"\n🔎 Q{i}: {question}")
-
-        vector = get_embedding(question)
+    # Embed every question first, then resolve them all with one batch search
+    vectors = [get_embedding(question) for question in questions]
+    batch_results = client.search_batch(
+        collection_name=COLLECTION_NAME,
+        requests=[
+            SearchRequest(
+                vector=vector,
+                limit=3,
+                with_payload=True,
+                params=SearchParams(hnsw_ef=128)
+            )
+            for vector in vectors
+        ]
+    )
 
-        results = client.search(
-            collection_name=COLLECTION_NAME,
-            query_vector=vector,
-            limit=3,
-            with_payload=True,
-            search_params=SearchParams(hnsw_ef=128)
-        )
+    for i, (question, results) in enumerate(zip(questions, batch_results), 1):
+        print(f"\n🔎 Q{i}: {question}")
 
         print("🧠 Top Matches:")
         for idx, match in enumerate(results, 1):
@@ -0,0 +1,18 @@
+from core.config import LOCAL_INDEX_DIR, get_settings
+from core.local_index import build_local_index_from_qdrant
+from core.search import get_qdrant_client
+
+
+def main():
+    """Copy the Qdrant collection into the local index used by SEARCH_BACKEND=local."""
+    client = get_qdrant_client()
+    if client is None:
+        print("Qdrant client is not available.")
+        return
+
+    count = build_local_index_from_qdrant(client, get_settings().collection_name)
+    print(f"Local index in '{LOCAL_INDEX_DIR}' now holds {count} points.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+# scripts/draft_log_report.py
+# Per-stage latency breakdown of pipeline runs recorded in the draft log
+#
+# Usage:
+#   python -m scripts.draft_log_report
+#   python -m scripts.draft_log_report --last 5 --json report.json
+
+import argparse
+import gzip
+import json
+
+from core.logger import LOG_PATH, log_segments
+from core.timing import STAGES, summarize
+
+
+def load_entries(path):
+    """Read a JSONL log (plain or gzipped), skipping blank or malformed lines."""
+    entries = []
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return entries
+
+
+def aggregate(entries, last=None):
+    """
+    Group timed log entries by run and summarize each stage.
+
+    Entries written before timing spans were recorded have no 'run_id' and
+    are ignored.
+
+    Args:
+        entries: Parsed draft log records
+        last: Only include the most recent `last` runs
+
+    Returns:
+        Dict with 'runs' (one summary per run, oldest first) and 'stages'
+        (per-question percentiles for each stage across those runs)
+    """
+    runs = {}
+    for entry in entries:
+        run_id = entry.get("run_id")
+        if not run_id:
+            continue
+        run = runs.setdefault(run_id, {"run_id": run_id, "questions": [], "summary": None})
+        if entry.get("type") == "run_summary":
+            run["summary"] = entry
+        elif isinstance(entry.get("timings_ms"), dict):
+            run["questions"].append(entry["timings_ms"])
+
+    selected = list(runs.values())[-last:] if last else list(runs.values())
+
+    report_runs = []
+    per_stage = {stage: [] for stage in STAGES}
+    for run in selected:
+        summary = run["summary"] or {}
+        stage_totals = {}
+        for stage in STAGES:
+            values = [t[stage] for t in run["questions"] if stage in t]
+            per_stage[stage].extend(values)
+            stage_totals[stage] = round(sum(values), 3)
+        report_runs.append({
+            "run_id": run["run_id"],
+            "timestamp": summary.get("timestamp"),
+            "input": summary.get("input"),
+            "questions": summary.get("questions", len(run["questions"])),
+            "total_ms": summary.get("total_ms"),
+            "stages_ms": stage_totals,
+        })
+
+    grand_total = sum(sum(values) for values in per_stage.values())
+    stages = {}
+    for stage, values in per_stage.items():
+        stages[stage] = summarize(values)
+        stages[stage]["share"] = round(sum(values) / grand_total, 4) if grand_total else 0.0
+
+    return {"runs": report_runs, "stages": stages}
+
+
+def print_report(report):
+    runs = report["runs"]
+    if not runs:
+        print("No timed runs found in the draft log.")
+        return
+
+    print(f"{'run':<14}{'timestamp':<21}{'questions':>10}{'total s':>10}"
+          + "".join(f"{stage + ' s':>14}" for stage in STAGES))
+    for run in runs:
+        total = f"{run['total_ms'] / 1000:.2f}" if run["total_ms"] is not None else "-"
+        timestamp = (run["timestamp"] or "-")[:19]
+        print(f"{run['run_id']:<14}{timestamp:<21}{run['questions']:>10}{total:>10}"
+              + "".join(f"{run['stages_ms'][stage] / 1000:>14.2f}" for stage in STAGES))
+
+    print(f"\nPer-question latency across {len(runs)} run(s):")
+    print(f"{'stage':<12}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}{'total s':>10}{'share':>8}")
+    for stage, stats in report["stages"].items():
+        print(f"{stage:<12}{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}{stats['max_ms']:>10.1f}"
+              f"{stats['total_ms'] / 1000:>10.2f}{stats['share']:>8.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize per-stage latency from the draft log.")
+    parser.add_argument("--log", default=LOG_PATH,
+                        help=f"Draft log to read, including its rotated segments (default: {LOG_PATH})")
+    parser.add_argument("--last", type=int, help="Only include the most recent N runs")
+    parser.add_argument("--json", help="Also write the report to this JSON file")
+    args = parser.parse_args()
+
+    entries = []
+    for segment in log_segments(args.log):
+        entries.extend(load_entries(segment))
+
+    report = aggregate(entries, last=args.last)
+    print_report(report)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ import uuid
 import os
 import json
 from dotenv import load_dotenv
+from core.embed import upload_points
 load_dotenv()
 
 
@@ -16,6 +17,45 @@ QDRANT_CLUSTER_URL = "https://13234bf2-e863-42bc-b01a-76d0c453560b.eu-west-2-0.a
 COLLECTION_NAME = "past_rfp_answers"
 OLLAMA_EMBEDDING_MODEL = "nomic-embed-text"
 QA_PATH = "output/past_rfps_qa.json"
+UPLOAD_BATCH_SIZE = 128   # Points per upsert request
+UPLOAD_PARALLEL = 2       # Upsert requests in flight at once
+UPLOAD_MAX_RETRIES = 3    # Attempts per batch before giving up
+
+# Helper - get embeddings from Ollama
+
+
+def get_embedding(text):
+    response = requests.post(
+        "http://localhost:11434/api/embeddings",
+        json={"model": OLLAMA_EMBEDDING_MODEL, "prompt": text}
+    )
+    return response.json()["embedding"]
+
+
+# Build each answer's point as the uploader asks for it, so only the batches in flight are in memory
+def iter_points(pairs):
+    for pair in pairs:
+        question = pair["question"]
+        answer = pair["answer"]
+        if not answer.strip():
+            print(f"⚠️ Skipping empty answer: {question[:60]}")
+            continue
+
+        vector = get_embedding(answer)
+        if not vector:
+            print(f"❌ Failed to get embedding for: {question[:60]}")
+            continue
+
+        yield PointStruct(
+            id=str(uuid.uuid4()),
+            vector=vector,
+            payload={
+                "question": question,
+                "answer": answer,
+                "source": "past_rfp_qa.json"
+            }
+        )
+
 
 # Connect to Qdrant
 client = QdrantClient(
@@ -38,50 +78,19 @@ client.create_collection(
 )
 print("✅ Collection created successfully.")
 
-
 # Load extracted Q&A pairs
 with open(QA_PATH, "r", encoding="utf-8") as f:
     qa_pairs = json.load(f)
 
-# Helper - get embeddings from Ollama
-
-
-def get_embedding(text):
-    response = requests.post(
-        "http://localhost:11434/api/embeddings",
-        json={"model": OLLAMA_EMBEDDING_MODEL, "prompt": text}
-    )
-    return response.json()["embedding"]
-
-
-# Upload each answer as a point
-points = []
-for pair in qa_pairs:
-    question = pair["question"]
-    answer = pair["answer"]
-    if not answer.strip():
-        print(f"⚠️ Skipping empty answer: {question[:60]}")
-        continue
-
-    vector = get_embedding(answer)
-    if not vector:
-        print(f"❌ Failed to get embedding for: {question[:60]}")
-        continue
-
-    point = PointStruct(
-        id=str(uuid.uuid4()),
-        vector=vector,
-        payload={
-            "question": question,
-            "answer": answer,
-            "source": "past_rfp_qa.json"
-        }
-    )
-
-    points.append(point)
-
-    # Push to Qdrant
-client.upsert(collection_name=COLLECTION_NAME, points=points)
+# Push to Qdrant in bounded batches, each retried on failure; only stored points are counted
+uploaded = upload_points(
+    client,
+    COLLECTION_NAME,
+    iter_points(qa_pairs),
+    batch_size=UPLOAD_BATCH_SIZE,
+    parallel=UPLOAD_PARALLEL,
+    max_retries=UPLOAD_MAX_RETRIES
+)
 
 print(
-    f"✅ Uploaded {len(points)} Q&A embeddings to Qdrant collection: {COLLECTION_NAME}")
+    f"✅ Uploaded {len(uploaded)} Q&A embeddings to Qdrant collection: {COLLECTION_NAME}")
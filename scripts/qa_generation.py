@@ -39,7 +39,7 @@ def generate_reviewable_draft(question):
         collection_name=COLLECTION_NAME,
         query_vector=embedding,
         limit=3,
-        with_payload=True,
+        with_payload=["answer"],  # only the answer text is used below
         search_params=SearchParams(hnsw_ef=128)
 
     )
@@ -1,11 +1,18 @@
+import argparse
 from pathlib import Path
-from core.embed import embed_final_rfp, ensure_correct_collection
+from core.config import REBUILD_PARSE_WORKERS
+from core.embed import embed_rfp_archive, rebuild_archive, rollback_collection
 
 
-def main():
-    """Embed all past RFPs into Qdrant."""
-    ensure_correct_collection()
+def main(full=False, workers=REBUILD_PARSE_WORKERS):
+    """
+    Sync all past RFPs into Qdrant.
 
+    By default only new or changed Q&A pairs are embedded and stale points are
+    deleted. With `full=True` everything is re-embedded into a new collection
+    version, which replaces the live one only once it is complete (see
+    core.embed.rebuild_archive); searches are served throughout.
+    """
     rfp_dir = Path("past_rfps")
     doc_paths = sorted(rfp_dir.glob("*.docx"))
 
@@ -13,14 +20,34 @@ def main():
         print("No .docx files found in 'past_rfps/'.")
         return
 
-    total = 0
-    for doc_path in doc_paths:
-        print(f"Embedding {doc_path.name}...")
-        embed_final_rfp(str(doc_path))
-        total += 1
+    def on_document(done, total, doc_path, result):
+        status = f"failed: {result}" if isinstance(result, Exception) else f"{result} new Q&A pairs"
+        print(f"[{done}/{total}] {Path(doc_path).name}: {status}")
+
+    if full:
+        results = rebuild_archive([str(p) for p in doc_paths], progress_callback=on_document, workers=workers)
+    else:
+        results = embed_rfp_archive(
+            [str(p) for p in doc_paths],
+            progress_callback=on_document,
+            remove_missing=True,
+            workers=workers
+        )
+    total = sum(1 for r in results.values() if not isinstance(r, Exception))
 
     print(f"Processed {total} document{'s' if total != 1 else ''}.")
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Sync past_rfps/ into the Qdrant collection.")
+    parser.add_argument("--full", action="store_true",
+                        help="Re-embed every document into a new collection version and switch to it")
+    parser.add_argument("--rollback", nargs="?", const="", metavar="VERSION",
+                        help="Switch back to the previous collection version (or to VERSION) and exit")
+    parser.add_argument("--workers", type=int, default=REBUILD_PARSE_WORKERS,
+                        help=f"DOCX parser processes (default: {REBUILD_PARSE_WORKERS})")
+    args = parser.parse_args()
+    if args.rollback is not None:
+        print(f"Live collection: {rollback_collection(args.rollback or None)}")
+    else:
+        main(full=args.full, workers=args.workers)
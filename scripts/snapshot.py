@@ -0,0 +1,38 @@
+import argparse
+
+from core.config import LOCAL_INDEX_DIR, get_settings
+from core.search import get_qdrant_client
+
+
+def main():
+    """Export the knowledge base to a snapshot file, or restore one without re-embedding."""
+    parser = argparse.ArgumentParser(description="Export or restore a knowledge-base snapshot.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    export_parser = subparsers.add_parser("export", help="Write every point of the collection to PATH")
+    export_parser.add_argument("path")
+    import_parser = subparsers.add_parser("import", help="Restore PATH into a new collection version")
+    import_parser.add_argument("path")
+    import_parser.add_argument("--local", action="store_true",
+                               help=f"Restore into the local index ('{LOCAL_INDEX_DIR}') instead of Qdrant")
+    args = parser.parse_args()
+
+    # Imported after argument parsing so --help stays fast
+    from core.snapshot import export_snapshot, restore_snapshot_to_local_index, restore_snapshot_to_qdrant
+
+    if args.command == "import" and args.local:
+        restore_snapshot_to_local_index(args.path)
+        return
+
+    client = get_qdrant_client()
+    if client is None:
+        print("Qdrant client is not available.")
+        return
+
+    if args.command == "export":
+        export_snapshot(client, get_settings().collection_name, args.path)
+    else:
+        restore_snapshot_to_qdrant(client, args.path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+from types import SimpleNamespace
+
+import pytest
+from docx import Document
+
+
+def _write_rfp(path, pairs):
+    doc = Document()
+    for question, answer in pairs:
+        doc.add_paragraph(question)
+        doc.add_paragraph(answer)
+    doc.save(path)
+
+
+@pytest.fixture
+def write_rfp():
+    """Return a helper that saves (question, answer) pairs as alternating paragraphs of a .docx."""
+    return _write_rfp
+
+
+class RecordingQdrantClient:
+    """
+    Stand-in for QdrantClient that records collection and search calls as (method, kwargs).
+
+    get_collection reports the next (status, optimizer_status) pair from `statuses`.
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.statuses = []
+
+    def create_collection(self, **kwargs):
+        self.calls.append(("create_collection", kwargs))
+
+    def create_payload_index(self, **kwargs):
+        pass
+
+    def update_collection(self, **kwargs):
+        self.calls.append(("update_collection", kwargs))
+
+    def get_collection(self, collection_name):
+        status, optimizer_status = self.statuses.pop(0)
+        return SimpleNamespace(status=status, optimizer_status=optimizer_status, points_count=3)
+
+    def search(self, **kwargs):
+        self.calls.append(("search", kwargs))
+        return []
+
+
+@pytest.fixture
+def recording_client():
+    return RecordingQdrantClient()
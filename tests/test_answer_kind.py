@@ -0,0 +1,41 @@
+from docx import Document
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, PointStruct, VectorParams
+
+import core.embed as embed
+from core.config import get_settings
+from core.search import QdrantBackend
+
+
+def test_question_like_entries_never_take_a_result_slot(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    collection = get_settings().collection_name
+    client = QdrantClient(":memory:")
+    client.create_collection(collection, vectors_config=VectorParams(size=2, distance=Distance.COSINE))
+
+    # The question-like "answer" is the closest match to the query vector
+    vectors = {
+        "Please provide the DR plan details.": [1.0, 0.0],
+        "Our DR plan is tested twice a year.": [0.9, 0.1],
+    }
+    monkeypatch.setattr(embed, "get_qdrant_client", lambda: client)
+    monkeypatch.setattr(embed, "open_question_index", lambda: None)
+    monkeypatch.setattr(embed, "get_embeddings", lambda texts: [vectors[t] for t in texts])
+
+    doc = Document()
+    for text in ("Disaster recovery?", "Please provide the DR plan details.",
+                 "How often is DR tested?", "Our DR plan is tested twice a year."):
+        doc.add_paragraph(text)
+    doc.save(tmp_path / "final.docx")
+    embed.embed_final_rfp(str(tmp_path / "final.docx"))
+
+    # A point archived before classification is labeled on the next archive sync
+    client.upsert(collection, points=[
+        PointStruct(id=99, vector=[1.0, 0.01], payload={"answer": "What is your RTO?", "source": "old.docx"})
+    ])
+    embed.embed_rfp_archive([])
+    assert client.retrieve(collection, [99])[0].payload["kind"] == "question"
+
+    [results] = QdrantBackend(client, collection).search_batch([[1.0, 0.0]], limit=1)
+    assert [r.answer for r in results] == ["Our DR plan is tested twice a year."]
+    assert results[0].kind == "answer"
@@ -0,0 +1,64 @@
+import pytest
+from qdrant_client import QdrantClient
+
+import core.embed as embed
+from core.collection_versions import alias_target, list_versions
+from core.config import get_settings
+from core.manifest import ArchiveManifest
+from core.question_index import QuestionIndex
+
+
+def live_answers(client):
+    return sorted(p.payload["answer"] for p in client.scroll(get_settings().collection_name)[0])
+
+
+def test_rebuild_swaps_alias_only_when_complete_and_can_roll_back(tmp_path, monkeypatch, write_rfp):
+    monkeypatch.chdir(tmp_path)
+    client = QdrantClient(":memory:")
+    index = QuestionIndex(str(tmp_path / "questions.sqlite3"))
+    monkeypatch.setattr(embed, "get_qdrant_client", lambda: client)
+    monkeypatch.setattr(embed, "get_embeddings", lambda texts: [[1.0, float(len(t))] for t in texts])
+    monkeypatch.setattr(embed, "open_question_index", lambda: index)
+    alias = get_settings().collection_name
+
+    embed.ensure_correct_collection(dimensions=2)
+    rfp = tmp_path / "final.docx"
+    write_rfp(rfp, [("What is your AUM?", "We manage 2 billion dollars.")])
+    embed.embed_rfp_archive([str(rfp)], workers=1)
+    first = alias_target(client, alias)
+
+    # Searches keep reading the old version while the new one loads
+    seen_during_rebuild = []
+    write_rfp(rfp, [("What is your AUM?", "We manage 3 billion dollars."), ("Who audits you?", "Our auditor is KPMG LLP.")])
+    embed.rebuild_archive([str(rfp)], workers=1, dimensions=2,
+                          progress_callback=lambda *args: seen_during_rebuild.append(live_answers(client)))
+
+    assert seen_during_rebuild == [["We manage 2 billion dollars."]]
+    assert live_answers(client) == ["Our auditor is KPMG LLP.", "We manage 3 billion dollars."]
+    assert list_versions(client, alias) == [first, alias_target(client, alias)]
+    assert index.revision() == ArchiveManifest(alias).revision()
+    assert index.lookup_many(["who audits you"])[0][0].answer == "Our auditor is KPMG LLP."
+
+    assert embed.rollback_collection() == first
+    assert live_answers(client) == ["We manage 2 billion dollars."]
+    assert ArchiveManifest(alias).sources() == ["final.docx"]
+    assert index.lookup_many(["who audits you"]) == [[]]
+
+
+def test_failed_rebuild_leaves_live_collection_untouched(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    client = QdrantClient(":memory:")
+    monkeypatch.setattr(embed, "get_qdrant_client", lambda: client)
+    monkeypatch.setattr(embed, "get_embeddings", lambda texts: [[1.0, float(len(t))] for t in texts])
+    monkeypatch.setattr(embed, "open_question_index", lambda: None)
+    alias = get_settings().collection_name
+
+    embed.ensure_correct_collection(dimensions=2)
+    live = alias_target(client, alias)
+    (tmp_path / "broken.docx").write_bytes(b"not a docx")
+
+    with pytest.raises(RuntimeError, match="failed to sync"):
+        embed.rebuild_archive([str(tmp_path / "broken.docx")], workers=1, dimensions=2)
+
+    assert list_versions(client, alias) == [live]
+    assert alias_target(client, alias) == live
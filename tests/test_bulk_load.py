@@ -0,0 +1,44 @@
+import pytest
+from qdrant_client.models import CollectionStatus, OptimizersStatusOneOf, OptimizersStatusOneOf1
+
+import core.embed as embed
+
+
+def test_bulk_load_defers_indexing_until_finish(monkeypatch, recording_client):
+    client = recording_client
+    client.statuses = [
+        (CollectionStatus.YELLOW, OptimizersStatusOneOf.OK),
+        (CollectionStatus.GREEN, OptimizersStatusOneOf.OK),
+    ]
+    monkeypatch.setattr(embed, "get_qdrant_client", lambda: client)
+
+    embed.create_collection(client, "answers_v1", bulk_load=True, hnsw_m=32, hnsw_ef_construct=256)
+    embed.finish_bulk_load("answers_v1", indexing_threshold=20000, poll_interval=0)
+
+    (_, created), (_, updated) = client.calls
+    assert created["optimizers_config"].indexing_threshold == 0
+    assert (created["hnsw_config"].m, created["hnsw_config"].ef_construct) == (32, 256)
+    assert updated["optimizers_config"].indexing_threshold == 20000
+    assert client.statuses == []
+
+
+def test_optimizer_errors_and_timeouts_are_raised(recording_client):
+    recording_client.statuses = [(CollectionStatus.RED, OptimizersStatusOneOf1(error="disk full"))]
+    with pytest.raises(RuntimeError, match="disk full"):
+        embed.wait_for_optimization(recording_client, "answers", poll_interval=0)
+
+    recording_client.statuses = [(CollectionStatus.YELLOW, OptimizersStatusOneOf.OK)]
+    with pytest.raises(TimeoutError):
+        embed.wait_for_optimization(recording_client, "answers", timeout=0, poll_interval=0)
+
+
+def test_pending_optimizations_are_triggered(recording_client):
+    recording_client.statuses = [
+        (CollectionStatus.GREY, OptimizersStatusOneOf.OK),
+        (CollectionStatus.GREEN, OptimizersStatusOneOf.OK),
+    ]
+    embed.wait_for_optimization(recording_client, "answers", poll_interval=0)
+
+    [(method, kwargs)] = recording_client.calls
+    assert method == "update_collection"
+    assert kwargs["optimizers_config"].indexing_threshold is None
@@ -0,0 +1,43 @@
+import run_pipeline
+from core.dedupe import group_duplicates
+
+
+def test_groups_exact_and_near_duplicates_but_not_different_numbers():
+    questions = [
+        "Please describe your business continuity plan?",
+        "Describe section 4 of your security policy?",
+        "please describe your business continuity plan",
+        "Please describe, in detail, your business continuity plan?",
+        "Please describe in detail your business continuity plans?",
+        "Describe section 5 of your security policy?",
+    ]
+    representatives, assignment = group_duplicates(questions)
+
+    assert representatives == [0, 1, 3, 5]
+    assert assignment == [0, 1, 0, 2, 2, 3]
+
+    # A threshold of 1.0 only collapses questions with the same canonical text
+    assert group_duplicates(questions, threshold=1.0)[1] == [0, 1, 0, 2, 3, 4]
+
+
+def test_resolve_questions_answers_each_group_once(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    embedded = []
+
+    def fake_embeddings(texts):
+        embedded.extend(texts)
+        return [[1.0, 0.0] for _ in texts]
+
+    monkeypatch.setattr(run_pipeline, "get_embeddings", fake_embeddings)
+    monkeypatch.setattr(run_pipeline, "search_qdrant_batch", lambda vectors: [[] for _ in vectors])
+    monkeypatch.setattr(run_pipeline, "get_draft_cache", lambda: None)
+    monkeypatch.setattr(run_pipeline, "get_question_index", lambda: None)
+
+    questions = ["What is your DR plan?", "Who audits you?", "What is your DR plan"]
+    resolved = run_pipeline.resolve_questions(questions, workers=1)
+
+    assert embedded == ["What is your DR plan?", "Who audits you?"]
+    assert [r["question"] for r in resolved] == questions
+    assert [r["duplicate_of"] for r in resolved] == [None, None, 1]
+    assert resolved[2]["draft"] == resolved[0]["draft"]
+    assert resolved[2]["timings_ms"] is not resolved[0]["timings_ms"]
@@ -0,0 +1,42 @@
+from docx import Document
+
+from core.docx_stream import iter_qa_pairs, iter_questions
+
+
+def create_questionnaire(path):
+    doc = Document()
+    doc.add_paragraph("Section A")
+    doc.add_paragraph("What is your investment philosophy?")
+    doc.add_paragraph("Long-term fundamental investing.")
+    table = doc.add_table(rows=3, cols=3)
+    table.rows[0].cells[0].text = "1"
+    table.rows[0].cells[1].text = "Who is your primary custodian bank?"
+    table.rows[0].cells[2].text = "State Street."
+    table.rows[1].cells[0].text = "2"
+    table.rows[1].cells[1].text = "Do you outsource any trading functions?"
+    table.rows[2].cells[0].text = "Firm name"
+    table.rows[2].cells[1].text = "APX Stream, Inc."
+    answer_cell = table.rows[1].cells[2]
+    answer_cell.text = "No."
+    answer_cell.add_paragraph("All trading is done in-house.")
+    doc.add_paragraph("How many employees do you have?")
+    doc.add_paragraph("Twelve full-time staff.")
+    doc.save(path)
+
+
+def test_streaming_extractor_reads_body_and_tables(tmp_path):
+    path = tmp_path / "questionnaire.docx"
+    create_questionnaire(path)
+
+    assert list(iter_questions(path)) == [
+        "What is your investment philosophy?",
+        "Who is your primary custodian bank?",
+        "Do you outsource any trading functions?",
+        "How many employees do you have?",
+    ]
+    assert list(iter_qa_pairs(path)) == [
+        {"question": "What is your investment philosophy?", "answer": "Long-term fundamental investing."},
+        {"question": "Who is your primary custodian bank?", "answer": "State Street."},
+        {"question": "Do you outsource any trading functions?", "answer": "No.\nAll trading is done in-house."},
+        {"question": "How many employees do you have?", "answer": "Twelve full-time staff."},
+    ]
@@ -0,0 +1,75 @@
+import pytest
+from qdrant_client.models import ScoredPoint
+
+from core.config import LOCAL_INDEX_DIR, get_settings
+from core.draft_cache import DraftCache, knowledge_base_revision
+from core.local_index import write_local_index
+
+
+def make_result(answer):
+    results = [ScoredPoint(id="a1", version=0, score=0.91, payload={"answer": answer, "source": "x.docx"})]
+    result = {"question": "Q?", "top_score": 0.91, "needs_review": False, "draft": answer}
+    return results, result
+
+
+def test_lookup_matches_near_identical_questions_only(tmp_path):
+    cache = DraftCache(str(tmp_path / "drafts.sqlite3"), threshold=0.95)
+    cache.sync_revision("rev-1")
+    results, result = make_result("We test recovery twice a year.")
+    cache.put_many([("How often is DR tested?", [1.0, 0.0, 0.0], results, result)])
+
+    near, far = cache.lookup_many([[0.99, 0.05, 0.0], [0.6, 0.8, 0.0]])
+
+    assert far is None
+    cached_results, cached_result = near
+    assert cached_result["draft"] == "We test recovery twice a year."
+    assert cached_results[0].source == "x.docx"
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_archive_change_invalidates_and_capacity_evicts(tmp_path):
+    path = str(tmp_path / "drafts.sqlite3")
+    cache = DraftCache(path, threshold=0.99, max_entries=2)
+    cache.sync_revision("rev-1")
+    for n, vector in enumerate(([1.0, 0.0], [0.0, 1.0], [-1.0, 0.0])):
+        results, result = make_result(f"answer {n}")
+        cache.put_many([(f"q{n}", vector, results, result)])
+
+    assert cache.stats()["entries"] == 2
+    assert cache.lookup_many([[1.0, 0.0]]) == [None]  # Oldest entry was evicted
+    assert cache.lookup_many([[-1.0, 0.0]])[0] is not None
+
+    # Reopening with the same revision keeps the entries; a new revision drops them
+    cache.close()
+    cache = DraftCache(path, threshold=0.99)
+    cache.sync_revision("rev-1")
+    assert cache.stats()["entries"] == 2
+    cache.sync_revision("rev-2")
+    assert cache.stats()["entries"] == 0
+    assert cache.lookup_many([[-1.0, 0.0]]) == [None]
+
+
+def test_new_entries_are_added_to_the_loaded_matrix(tmp_path, monkeypatch):
+    cache = DraftCache(str(tmp_path / "drafts.sqlite3"), threshold=0.99, max_entries=2)
+    cache.sync_revision("rev-1")
+    results, result = make_result("answer 0")
+    cache.put_many([("q0", [1.0, 0.0], results, result)])
+    assert cache.lookup_many([[0.0, 1.0]]) == [None]  # Loads the matrix
+
+    monkeypatch.setattr(cache, "_load_matrix", lambda: pytest.fail("matrix was reloaded"))
+    cache.put_many([("q1", [0.0, 1.0], results, result), ("q2", [-1.0, 0.0], results, result)])
+
+    assert cache.lookup_many([[1.0, 0.0]]) == [None]  # Evicted from memory as well as from disk
+    assert cache.lookup_many([[0.0, 1.0]])[0] is not None
+    assert cache.lookup_many([[-1.0, 0.0]])[0] is not None
+
+
+def test_refreshing_the_local_index_changes_the_revision(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(get_settings(), "search_backend", "local")
+
+    write_local_index(LOCAL_INDEX_DIR, [("a1", [1.0, 0.0], {"answer": "Old answer."})])
+    before = knowledge_base_revision()
+    write_local_index(LOCAL_INDEX_DIR, [("a1", [1.0, 0.0], {"answer": "Refreshed answer text."})])
+
+    assert knowledge_base_revision() != before
@@ -0,0 +1,82 @@
+import json
+
+from docx import Document
+from qdrant_client.http.models import ScoredPoint
+
+import core.logger as logger
+import run_pipeline
+from core.timing import STAGES
+from scripts.draft_log_report import aggregate, load_entries
+
+
+def test_run_pipeline_logs_timing_spans_and_summary(tmp_path, monkeypatch):
+    rfp_path = tmp_path / "rfp.docx"
+    doc = Document()
+    doc.add_paragraph("What is your business continuity plan?")
+    doc.add_paragraph("How often do you test disaster recovery?")
+    doc.save(rfp_path)
+
+    log_path = tmp_path / "draft_log.jsonl"
+    with open(log_path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"question": "Legacy entry?", "top_score": 0.9}) + "\n")
+
+    def fake_search(vectors):
+        return [[ScoredPoint(id=1, version=0, score=0.95,
+                             payload={"question": "Q?", "answer": "Archived answer text."})] for _ in vectors]
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(logger, "LOG_PATH", str(log_path))
+    monkeypatch.setattr(run_pipeline, "get_embeddings", lambda texts: [[1.0, 0.0] for _ in texts])
+    monkeypatch.setattr(run_pipeline, "search_qdrant_batch", fake_search)
+    monkeypatch.setattr(run_pipeline, "get_embedding_cache", lambda: None)
+    monkeypatch.setattr(run_pipeline, "get_draft_cache", lambda: None)
+    monkeypatch.setattr(run_pipeline, "get_question_index", lambda: None)
+
+    run_pipeline.run_pipeline(str(rfp_path), workers=2)
+
+    entries = load_entries(log_path)
+    questions = [e for e in entries if "run_id" in e and e.get("type") != "run_summary"]
+    summary = entries[-1]
+
+    assert len(questions) == 2
+    assert all(set(e["timings_ms"]) == set(STAGES) for e in questions)
+    assert summary["type"] == "run_summary"
+    assert summary["questions"] == 2
+    assert summary["stages"]["search"]["count"] == 2
+
+    report = aggregate(entries)
+    assert len(report["runs"]) == 1
+    assert report["runs"][0]["questions"] == 2
+    assert report["stages"]["embedding"]["count"] == 2
+    assert abs(sum(s["share"] for s in report["stages"].values()) - 1) < 0.01
+
+
+def test_run_summary_reports_embedding_cache_use_of_that_run_only(tmp_path, monkeypatch):
+    rfp_path = tmp_path / "rfp.docx"
+    doc = Document()
+    doc.add_paragraph("What is your business continuity plan?")
+    doc.save(rfp_path)
+
+    class FakeCache:
+        hits, misses = 40, 60  # Left over from earlier runs in the same process
+
+        def stats(self):
+            return {"hits": self.hits, "misses": self.misses, "hit_rate": 0.4, "entries": 100}
+
+    cache = FakeCache()
+
+    def embed(texts):
+        cache.hits += len(texts)
+        return [[1.0, 0.0] for _ in texts]
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(logger, "LOG_PATH", str(tmp_path / "draft_log.jsonl"))
+    monkeypatch.setattr(run_pipeline, "get_embeddings", embed)
+    monkeypatch.setattr(run_pipeline, "search_qdrant_batch", lambda vectors: [[] for _ in vectors])
+    monkeypatch.setattr(run_pipeline, "get_embedding_cache", lambda: cache)
+    monkeypatch.setattr(run_pipeline, "get_draft_cache", lambda: None)
+    monkeypatch.setattr(run_pipeline, "get_question_index", lambda: None)
+
+    summary = run_pipeline.run_pipeline(str(rfp_path))
+
+    assert summary["embedding_cache"] == {"hits": 1, "misses": 0, "hit_rate": 1.0, "entries": 100}
@@ -0,0 +1,41 @@
+from types import SimpleNamespace
+
+import core.generate as generate
+
+
+class FakeEmbeddings:
+    def __init__(self, bad_text=None):
+        self.bad_text = bad_text
+        self.calls = []
+
+    def create(self, input, model):
+        inputs = input if isinstance(input, list) else [input]
+        self.calls.append(inputs)
+        if self.bad_text in inputs:
+            raise ValueError("invalid input")
+        return SimpleNamespace(data=[
+            SimpleNamespace(index=i, embedding=[float(len(text))]) for i, text in enumerate(inputs)
+        ])
+
+
+def test_iter_embedding_batches_respects_item_and_token_limits():
+    items = list(enumerate(["a" * 40] * 5))
+    batches = list(generate._iter_embedding_batches(items, max_items=2, max_tokens=1000))
+    assert [len(b) for b in batches] == [2, 2, 1]
+
+    batches = list(generate._iter_embedding_batches(items, max_items=100, max_tokens=25))
+    assert [len(b) for b in batches] == [2, 2, 1]
+
+
+def test_get_embeddings_batches_and_isolates_failures(monkeypatch):
+    fake = FakeEmbeddings(bad_text="bad answer")
+    monkeypatch.setattr(generate, "client", SimpleNamespace(embeddings=fake))
+    monkeypatch.setattr(generate, "get_embedding_cache", lambda: None)
+
+    texts = ["first answer", "", "bad answer", "fourth answer"]
+    vectors = generate.get_embeddings(texts)
+
+    assert vectors == [[12.0], None, None, [13.0]]
+    # One batched call, then individual retries for the failed batch
+    assert fake.calls[0] == ["first answer", "bad answer", "fourth answer"]
+    assert len(fake.calls) == 4
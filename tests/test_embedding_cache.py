@@ -0,0 +1,30 @@
+from core.embedding_cache import EmbeddingCache
+
+MODEL = "text-embedding-3-small"
+
+
+def test_cache_roundtrip_normalizes_text_and_counts(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "emb.sqlite3"))
+    cache.put(MODEL, "Describe your cybersecurity policies.", [0.5, -1.25, 2.0])
+
+    assert cache.get(MODEL, "  Describe your   cybersecurity policies. ") == [0.5, -1.25, 2.0]
+    assert cache.get("other-model", "Describe your cybersecurity policies.") is None
+    assert cache.get_many(MODEL, ["unknown", "Describe your cybersecurity policies."]) == [
+        None, [0.5, -1.25, 2.0]
+    ]
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (2, 2, 1)
+
+
+def test_cache_persists_and_evicts_least_recently_used(tmp_path):
+    path = str(tmp_path / "emb.sqlite3")
+    cache = EmbeddingCache(path, max_entries=2)
+    cache.put(MODEL, "a", [1.0])
+    cache.put(MODEL, "b", [2.0])
+    cache.get(MODEL, "a")  # "b" is now the least recently used entry
+    cache.put(MODEL, "c", [3.0])
+    cache.close()
+
+    reopened = EmbeddingCache(path, max_entries=2)
+    assert reopened.get_many(MODEL, ["a", "b", "c"]) == [[1.0], None, [3.0]]
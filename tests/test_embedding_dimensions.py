@@ -0,0 +1,50 @@
+from types import SimpleNamespace
+
+from qdrant_client import QdrantClient
+from qdrant_client.models import PointStruct
+
+import core.embed as embed
+import core.generate as generate
+from core.embedding_cache import EmbeddingCache
+from core.search import QdrantBackend
+
+
+def test_shortened_embeddings_are_requested_and_cached_separately(tmp_path, monkeypatch):
+    calls = []
+
+    def create(input, model, **options):
+        calls.append(options)
+        return SimpleNamespace(data=[SimpleNamespace(index=i, embedding=[1.0, 0.0]) for i in range(len(input))])
+
+    cache = EmbeddingCache(str(tmp_path / "embeddings.sqlite3"))
+    monkeypatch.setattr(generate, "client", SimpleNamespace(embeddings=SimpleNamespace(create=create)))
+    monkeypatch.setattr(generate, "get_embedding_cache", lambda: cache)
+
+    generate.get_embeddings(["Describe your DR plan."])
+    monkeypatch.setattr(generate, "EMBEDDING_DIMENSIONS", 256)
+    generate.get_embeddings(["Describe your DR plan."])
+    generate.get_embeddings(["Describe your DR plan."])
+
+    assert calls == [{}, {"dimensions": 256}]
+
+
+def test_two_stage_search_rescores_compact_candidates_with_full_vectors(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    client = QdrantClient(":memory:")
+    monkeypatch.setattr(embed, "get_qdrant_client", lambda: client)
+    monkeypatch.setattr(embed, "open_question_index", lambda: None)
+    embed.ensure_correct_collection(dimensions=4, compact_dimensions=2)
+
+    # Identical compact halves, so only the full vectors can order these points
+    vectors = {1: [1.0, 0.0, 0.0, 1.0], 2: [1.0, 0.0, 1.0, 0.0], 3: [1.0, 0.0, 0.5, 0.5], 4: [0.0, 1.0, 0.0, 0.0]}
+    client.upsert("past_rfp_answers", points=[
+        PointStruct(id=i, vector=embed.point_vector(v, compact_dimensions=2), payload={"answer": str(i)})
+        for i, v in vectors.items()
+    ])
+
+    backend = QdrantBackend(client, "past_rfp_answers", compact_dimensions=2, compact_oversampling=3)
+    first, second = backend.search_batch([[1.0, 0.0, 0.9, 0.1], [0.0, 1.0, 0.0, 0.0]], limit=2)
+
+    assert [p.id for p in first] == [2, 3]
+    assert first[0].answer == "2"
+    assert [p.id for p in second][0] == 4
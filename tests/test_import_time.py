@@ -0,0 +1,18 @@
+import subprocess
+import sys
+
+from benchmarks.import_time import REPO_ROOT, eagerly_imported
+
+
+def test_headless_entry_points_defer_heavy_imports():
+    assert eagerly_imported() == []
+
+
+def test_run_pipeline_help_works_without_credentials(tmp_path):
+    env = {"PATH": "", "HOME": str(tmp_path)}
+    result = subprocess.run(
+        [sys.executable, f"{REPO_ROOT}/run_pipeline.py", "--help"],
+        cwd=tmp_path, env=env, capture_output=True, text=True
+    )
+    assert result.returncode == 0
+    assert "usage:" in result.stdout
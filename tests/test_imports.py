@@ -0,0 +1,29 @@
+import ast
+import importlib
+from pathlib import Path
+
+from benchmarks.import_time import REPO_ROOT
+
+LOCAL_PACKAGES = ("core", "scripts", "benchmarks")
+
+
+def local_imports():
+    """Yield (file, module, name) for every `from <local module> import name` in the repo."""
+    for path in sorted(Path(REPO_ROOT).glob("**/*.py")):
+        if "tests" in path.parts:
+            continue
+        for node in ast.walk(ast.parse(path.read_text(encoding="utf-8"))):
+            if isinstance(node, ast.ImportFrom) and node.level == 0 and node.module \
+                    and node.module.split(".")[0] in LOCAL_PACKAGES:
+                for alias in node.names:
+                    yield path.relative_to(REPO_ROOT), node.module, alias.name
+
+
+def test_local_imports_resolve():
+    # Many scripts do their work at import time, so the names they import are checked instead
+    missing = [
+        f"{path}: from {module} import {name}"
+        for path, module, name in local_imports()
+        if not hasattr(importlib.import_module(module), name)
+    ]
+    assert missing == []
@@ -0,0 +1,122 @@
+import os
+
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, VectorParams
+
+import core.embed as embed
+from core.config import get_settings
+
+
+def test_rearchiving_only_touches_changed_pairs(tmp_path, monkeypatch, write_rfp):
+    monkeypatch.chdir(tmp_path)
+    client = QdrantClient(":memory:")
+    client.create_collection(
+        get_settings().collection_name,
+        vectors_config=VectorParams(size=2, distance=Distance.COSINE)
+    )
+    embedded = []
+
+    def fake_embeddings(texts):
+        embedded.extend(texts)
+        return [[1.0, float(len(text))] for text in texts]
+
+    monkeypatch.setattr(embed, "get_qdrant_client", lambda: client)
+    monkeypatch.setattr(embed, "get_embeddings", fake_embeddings)
+    monkeypatch.setattr(embed, "open_question_index", lambda: None)
+
+    rfp = tmp_path / "final.docx"
+    write_rfp(rfp, [
+        ("What is your AUM?", "We manage 2 billion dollars."),
+        ("Who is your auditor?", "Our auditor is KPMG LLP."),
+    ])
+
+    embed.embed_final_rfp(str(rfp))
+    embed.embed_final_rfp(str(rfp))
+    assert len(embedded) == 2
+    assert client.count(get_settings().collection_name).count == 2
+
+    write_rfp(rfp, [
+        ("What is your AUM?", "We manage 3 billion dollars."),
+        ("Who is your auditor?", "Our auditor is KPMG LLP."),
+    ])
+    results = embed.embed_rfp_archive([str(rfp)])
+
+    assert results == {str(rfp): 1}
+    assert embedded[-1] == "We manage 3 billion dollars."
+    answers = {p.payload["answer"] for p in client.scroll(get_settings().collection_name)[0]}
+    assert answers == {"We manage 3 billion dollars.", "Our auditor is KPMG LLP."}
+
+    embed.embed_rfp_archive([], remove_missing=True)
+    assert client.count(get_settings().collection_name).count == 0
+
+
+def test_parallel_parsing_isolates_corrupt_documents(tmp_path, write_rfp):
+    from core.archive_parse import iter_parsed_documents
+
+    good = []
+    for i in range(3):
+        path = tmp_path / f"rfp_{i}.docx"
+        write_rfp(path, [(f"Question number {i}?", f"Answer number {i} is long enough.")])
+        good.append(str(path))
+    corrupt = tmp_path / "corrupt.docx"
+    corrupt.write_bytes(b"not a zip file")
+
+    parsed = {path: (entries, error)
+              for path, entries, error in iter_parsed_documents(good + [str(corrupt)], workers=2)}
+
+    assert set(parsed) == set(good) | {str(corrupt)}
+    assert parsed[str(corrupt)][0] is None and parsed[str(corrupt)][1] is not None
+    for path in good:
+        entries, error = parsed[path]
+        assert error is None
+        assert [e["source"] for e in entries] == [os.path.basename(path)]
+
+
+def test_uploads_archived_from_temporary_copies_keep_their_name(tmp_path, monkeypatch, write_rfp):
+    monkeypatch.chdir(tmp_path)
+    client = QdrantClient(":memory:")
+    client.create_collection(
+        get_settings().collection_name,
+        vectors_config=VectorParams(size=2, distance=Distance.COSINE)
+    )
+    monkeypatch.setattr(embed, "get_qdrant_client", lambda: client)
+    monkeypatch.setattr(embed, "get_embeddings", lambda texts: [[1.0, float(len(t))] for t in texts])
+    monkeypatch.setattr(embed, "open_question_index", lambda: None)
+
+    for tmp_name in ("tmpa1b2.docx", "tmpc3d4.docx"):
+        write_rfp(tmp_path / tmp_name, [("What is your AUM?", "We manage 2 billion dollars.")])
+        embed.embed_final_rfp(str(tmp_path / tmp_name), source_name="final.docx")
+
+    [point] = client.scroll(get_settings().collection_name)[0]
+    assert point.payload["source"] == "final.docx"
+
+
+def test_large_documents_embed_in_batches_and_embedding_errors_stay_per_document(tmp_path, monkeypatch, write_rfp):
+    monkeypatch.chdir(tmp_path)
+    client = QdrantClient(":memory:")
+    client.create_collection(
+        get_settings().collection_name,
+        vectors_config=VectorParams(size=2, distance=Distance.COSINE)
+    )
+    batch_sizes = []
+
+    def fake_embeddings(texts):
+        if any("unreachable" in text for text in texts):
+            raise RuntimeError("embedding service unreachable")
+        batch_sizes.append(len(texts))
+        return [[1.0, float(len(text))] for text in texts]
+
+    monkeypatch.setattr(embed, "EMBEDDING_BATCH_SIZE", 2)
+    monkeypatch.setattr(embed, "get_qdrant_client", lambda: client)
+    monkeypatch.setattr(embed, "get_embeddings", fake_embeddings)
+    monkeypatch.setattr(embed, "open_question_index", lambda: None)
+
+    big, small = tmp_path / "big.docx", tmp_path / "small.docx"
+    write_rfp(big, [(f"Question number {i}?", f"Answer number {i} is long enough.") for i in range(5)])
+    write_rfp(small, [("Who hosts you?", "Our host is unreachable today.")])
+
+    results = embed.embed_rfp_archive([str(big), str(small)], workers=1)
+
+    assert results[str(big)] == 5
+    assert batch_sizes == [2, 2, 1]
+    assert isinstance(results[str(small)], RuntimeError)
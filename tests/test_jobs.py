@@ -0,0 +1,78 @@
+import os
+import threading
+import time
+
+from docx import Document
+
+from core.jobs import CANCELLED, RUNNING, SUCCEEDED, JobManager
+
+
+class FakePipeline:
+    """Drafts two answers, then waits until released or cancelled."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.running = 0
+        self.max_running = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, input_path, output_dir, progress_callback, cancel_event, input_name, workers=1):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            progress_callback(1, 2, {"question": "Q1?", "draft": "A1", "needs_review": False})
+            while not self.release.wait(0.01):
+                if cancel_event.is_set():
+                    raise RuntimeError("cancelled")
+            progress_callback(2, 2, {"question": "Q2?", "draft": "A2", "needs_review": True})
+            path = os.path.join(output_dir, "generated_rfp_draft.docx")
+            Document().save(path)
+            return {"input": input_name, "questions": 2, "full_draft": path, "review_draft": None, "workers": workers}
+        finally:
+            with self.lock:
+                self.running -= 1
+
+
+def test_jobs_run_isolated_within_the_concurrency_limit(tmp_path):
+    rfp = tmp_path / "rfp.docx"
+    Document().save(rfp)
+    pipeline = FakePipeline()
+    manager = JobManager(pipeline, jobs_dir=str(tmp_path / "jobs"), max_concurrent=2)
+
+    job_ids = [manager.submit(str(rfp), workers=3) for _ in range(3)]
+    os.remove(rfp)  # Jobs work on their own copy
+
+    manager.cancel(job_ids[2])
+    pipeline.release.set()
+    statuses = [manager.wait(job_id, timeout=5) for job_id in job_ids]
+
+    assert [s["status"] for s in statuses] == [SUCCEEDED, SUCCEEDED, CANCELLED]
+    assert pipeline.max_running <= 2
+    assert statuses[0]["output_dir"] != statuses[1]["output_dir"]
+    for status in statuses[:2]:
+        assert os.path.exists(status["summary"]["full_draft"])
+        assert status["summary"]["full_draft"].startswith(status["output_dir"])
+        assert status["summary"]["workers"] == 3
+        assert status["summary"]["input"] == "rfp.docx"
+    assert [r["draft"] for r in manager.results(job_ids[0])] == ["A1", "A2"]
+    assert [r["draft"] for r in manager.results(job_ids[0], start=1)] == ["A2"]
+    manager.shutdown()
+
+
+def test_cancel_stops_a_running_job(tmp_path):
+    rfp = tmp_path / "rfp.docx"
+    Document().save(rfp)
+    manager = JobManager(FakePipeline(), jobs_dir=str(tmp_path / "jobs"), max_concurrent=1)
+
+    job_id = manager.submit(str(rfp))
+    deadline = time.monotonic() + 5
+    while manager.status(job_id)["done"] < 1:
+        assert time.monotonic() < deadline, "job never started"
+        time.sleep(0.01)
+    assert manager.status(job_id)["status"] == RUNNING
+
+    assert manager.cancel(job_id)
+    assert manager.wait(job_id, timeout=5)["status"] == CANCELLED
+    assert not manager.cancel(job_id)
+    manager.shutdown()
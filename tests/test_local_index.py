@@ -0,0 +1,27 @@
+import numpy as np
+
+from core.local_index import LocalVectorIndex, write_local_index
+
+
+def test_local_index_matches_brute_force_cosine(tmp_path):
+    rng = np.random.default_rng(7)
+    vectors = rng.normal(size=(50, 8)).astype(np.float32)
+    points = [(f"id-{i}", vec.tolist(), {"answer": f"answer {i}"}) for i, vec in enumerate(vectors)]
+    assert write_local_index(str(tmp_path / "index"), points) == 50
+
+    index = LocalVectorIndex(str(tmp_path / "index"))
+    queries = rng.normal(size=(3, 8)).astype(np.float32)
+    results = index.search_batch(queries.tolist(), limit=5)
+
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    expected = (queries / np.linalg.norm(queries, axis=1, keepdims=True)) @ normalized.T
+    for row, hits in zip(expected, results):
+        best = np.argsort(-row)[:5]
+        assert [hit.id for hit in hits] == [f"id-{i}" for i in best]
+        assert np.allclose([hit.score for hit in hits], row[best], atol=1e-5)
+        assert hits[0].answer == f"answer {best[0]}"
+
+    # Asking for more results than points returns every point, best first
+    everything = index.search(queries[0].tolist(), limit=100)
+    assert len(everything) == 50
+    assert [h.id for h in everything[:5]] == [h.id for h in results[0]]
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.models import PointStruct
+
+import core.embed as embed
+import core.search as search
+from benchmarks.quantization_recall import benchmark, load_vectors
+from core.config import get_settings
+from core.search import QdrantBackend
+
+
+def test_collection_is_created_with_quantization_and_on_disk_vectors(recording_client):
+    client = recording_client
+
+    embed.create_collection(client, "answers_v1", quantization="scalar", on_disk=True)
+
+    _, call = client.calls[0]
+    assert call["vectors_config"].on_disk is True
+    assert call["quantization_config"].scalar.type == "int8"
+
+    with pytest.raises(ValueError):
+        embed.create_collection(client, "answers_v2", quantization="pq")
+
+
+def test_quantized_search_oversamples_and_rescores(recording_client):
+    client = recording_client
+    QdrantBackend(client, "answers", quantization="binary", oversampling=3.0).search([0.1, 0.2], 5)
+    QdrantBackend(client, "answers", quantization="none").search([0.1, 0.2], 5)
+
+    quantized, plain = (kwargs["search_params"] for _, kwargs in client.calls)
+    assert quantized.quantization.rescore is True
+    assert quantized.quantization.oversampling == 3.0
+    assert plain.quantization is None
+
+
+def test_rescoring_recovers_recall():
+    rng = np.random.default_rng(0)
+    centers = rng.standard_normal((50, 64))
+    vectors = np.repeat(centers, 40, axis=0) + 0.3 * rng.standard_normal((2000, 64))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    results = {(r["quantization"], r["oversampling"]): r for r in benchmark(vectors, k=5, query_count=50)}
+
+    assert results[("none", None)]["recall"] == 1.0
+    assert results[("scalar", 4.0)]["recall"] >= results[("scalar", None)]["recall"]
+    assert results[("scalar", 4.0)]["recall"] > 0.95
+    assert results[("binary", 4.0)]["ram_mb_on_disk"] < results[("scalar", 4.0)]["ram_mb_on_disk"]
+
+
+def test_qdrant_vectors_are_full_answer_vectors(monkeypatch):
+    client = QdrantClient(":memory:")
+    collection_name = get_settings().collection_name
+    embed.create_collection(client, collection_name, dimensions=4, compact_dimensions=2)
+    client.upsert(collection_name, points=[
+        PointStruct(id=1, vector=embed.point_vector([1.0, 0.0, 0.0, 0.0], 2), payload={"kind": "answer"}),
+        PointStruct(id=2, vector=embed.point_vector([0.0, 1.0, 0.0, 0.0], 2), payload={"kind": "question"}),
+    ])
+    monkeypatch.setattr(search, "get_qdrant_client", lambda: client)
+
+    vectors = load_vectors("qdrant", size=0)
+
+    assert vectors.shape == (1, 4)
+    assert np.allclose(vectors[0], [1.0, 0.0, 0.0, 0.0])
@@ -0,0 +1,68 @@
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, VectorParams
+
+import core.embed as embed
+import core.question_index as question_index
+import run_pipeline
+from core.config import get_settings
+from core.manifest import ArchiveManifest
+from core.question_index import QuestionIndex
+
+
+def test_archived_questions_are_answered_without_embedding(tmp_path, monkeypatch, write_rfp):
+    monkeypatch.chdir(tmp_path)
+    client = QdrantClient(":memory:")
+    client.create_collection(
+        get_settings().collection_name, vectors_config=VectorParams(size=2, distance=Distance.COSINE)
+    )
+    index = QuestionIndex(str(tmp_path / "questions.sqlite3"))
+    index.mark_synced(ArchiveManifest(get_settings().collection_name).revision())
+    embedded = []
+
+    def fake_embeddings(texts):
+        embedded.extend(texts)
+        return [[1.0, 0.0] for _ in texts]
+
+    monkeypatch.setattr(embed, "get_qdrant_client", lambda: client)
+    monkeypatch.setattr(embed, "get_embeddings", fake_embeddings)
+    monkeypatch.setattr(embed, "open_question_index", lambda: index)
+    monkeypatch.setattr(question_index, "open_question_index", lambda: index)
+    monkeypatch.setattr(run_pipeline, "get_embeddings", fake_embeddings)
+    monkeypatch.setattr(run_pipeline, "search_qdrant_batch", lambda vectors: [[] for _ in vectors])
+    monkeypatch.setattr(run_pipeline, "get_draft_cache", lambda: None)
+
+    rfp = tmp_path / "final.docx"
+    write_rfp(rfp, [("Who is your auditor?", "Our auditor is KPMG LLP.")])
+    embed.embed_final_rfp(str(rfp))
+    embedded.clear()
+
+    exact, other = run_pipeline.resolve_questions(["WHO is your  auditor", "What is your AUM?"])
+
+    assert exact["exact_match"] and not exact["needs_review"]
+    assert "Our auditor is KPMG LLP." in exact["draft"]
+    assert not other["exact_match"]
+    assert embedded == ["What is your AUM?"]
+
+    # Re-archiving replaces the document's rows
+    write_rfp(rfp, [("Who is your auditor?", "Our auditor is Deloitte LLP.")])
+    embed.embed_final_rfp(str(rfp))
+    [exact] = run_pipeline.resolve_questions(["Who is your auditor?"])
+    assert "Deloitte" in exact["draft"] and "KPMG" not in exact["draft"]
+
+
+def test_index_that_missed_an_update_is_not_used(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    index = QuestionIndex(str(tmp_path / "questions.sqlite3"))
+    monkeypatch.setattr(question_index, "open_question_index", lambda: index)
+
+    manifest = ArchiveManifest(get_settings().collection_name)
+    before = manifest.revision()
+    manifest.set("old.docx", {"point-1"})
+    manifest.save()
+
+    # The index never saw old.docx, so syncing another document cannot make it current
+    index.sync_document("new.docx", [], before, "unrelated")
+    assert question_index.get_question_index() is None
+
+    index.mark_synced(manifest.revision())
+    assert question_index.get_question_index() is index
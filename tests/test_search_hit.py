@@ -0,0 +1,35 @@
+import json
+
+from core.draft_cache import _deserialize_results
+from core.search import QdrantBackend
+from core.search_hit import PAYLOAD_FIELDS, SearchHit
+
+
+class ProjectingClient:
+    def __init__(self):
+        self.calls = []
+
+    def search(self, **kwargs):
+        from qdrant_client.models import ScoredPoint
+
+        self.calls.append(kwargs)
+        return [ScoredPoint(id=7, version=0, score=0.8, payload={"text_content": " Legacy answer ", "source_file": "a.docx"})]
+
+
+def test_search_projects_payload_and_resolves_legacy_fields():
+    client = ProjectingClient()
+    [hit] = QdrantBackend(client, "answers", quantization="none").search([0.1, 0.2], 5)
+
+    assert client.calls[0]["with_payload"] == PAYLOAD_FIELDS
+    assert client.calls[0]["with_vectors"] is False
+    assert isinstance(hit, SearchHit)
+    assert (hit.id, hit.answer, hit.source, hit.kind) == (7, "Legacy answer", "a.docx", None)
+    assert not hasattr(hit, "__dict__")
+
+
+def test_draft_cache_reads_entries_stored_with_full_payloads():
+    legacy = json.dumps([{"id": "a1", "score": 0.9, "payload": {"question": "Q?", "answer": "A.", "source": "x.docx"}}])
+    [hit] = _deserialize_results(legacy)
+
+    assert (hit.answer, hit.source) == ("A.", "x.docx")
+    assert SearchHit.from_dict(hit.to_dict()).answer == "A."
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, PointStruct, VectorParams
+
+import core.embed as embed
+from core.config import get_settings
+from core.local_index import LocalVectorIndex
+from core.snapshot import Snapshot, export_snapshot, restore_snapshot_to_local_index, restore_snapshot_to_qdrant
+
+
+def test_snapshot_round_trips_into_qdrant_and_local_index(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    source = QdrantClient(":memory:")
+    source.create_collection("answers", vectors_config=VectorParams(size=3, distance=Distance.COSINE))
+    vectors = np.random.default_rng(0).standard_normal((300, 3)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)  # Cosine collections store unit vectors
+    source.upsert("answers", points=[
+        PointStruct(id=i, vector=vectors[i].tolist(),
+                    payload={"question": f"q{i}?", "answer": f"a{i}", "source": "x.docx",
+                             "kind": "question" if i == 0 else "answer"})
+        for i in range(300)
+    ])
+    path = str(tmp_path / "kb.snapshot")
+    assert export_snapshot(source, "answers", path, page_size=64) == 300
+
+    snapshot = Snapshot(path)
+    assert np.allclose(snapshot.vectors[np.argsort(snapshot.columns["id"])], vectors, atol=1e-6)
+
+    target = QdrantClient(":memory:")
+    monkeypatch.setattr(embed, "get_qdrant_client", lambda: target)
+    monkeypatch.setattr(embed, "get_embeddings", lambda texts: pytest.fail("snapshot restore must not embed"))
+    monkeypatch.setattr(embed, "open_question_index", lambda: None)
+
+    restore_snapshot_to_qdrant(target, path, dimensions=3)
+    restored = target.retrieve(get_settings().collection_name, [7], with_vectors=True)[0]
+    assert restored.payload["answer"] == "a7"
+    assert np.allclose(restored.vector, vectors[7], atol=1e-6)
+
+    assert restore_snapshot_to_local_index(path, str(tmp_path / "local"), dimensions=3) == 299
+    assert LocalVectorIndex(str(tmp_path / "local")).search(vectors[7].tolist(), 1)[0].answer == "a7"
+
+
+def test_truncated_snapshot_is_rejected(tmp_path):
+    path = tmp_path / "kb.snapshot"
+    path.write_bytes(b"RFPSNAP1" + b"\0" * 10)
+    with pytest.raises(ValueError):
+        Snapshot(str(path))
+
+
+def test_legacy_payload_fields_are_exported_under_current_names(tmp_path):
+    client = QdrantClient(":memory:")
+    client.create_collection("answers", vectors_config=VectorParams(size=2, distance=Distance.COSINE))
+    client.upsert("answers", points=[
+        PointStruct(id=1, vector=[1.0, 0.0], payload={"text": "We are SOC 2 certified.", "source_file": "old.docx"}),
+        PointStruct(id=2, vector=[0.0, 1.0], payload={"text_content": "The firm was founded in 1999 in London."}),
+        PointStruct(id=3, vector=[1.0, 1.0], payload={"text": "Do you hold an ISO 27001 certificate?"}),
+    ])
+    path = str(tmp_path / "kb.snapshot")
+    export_snapshot(client, "answers", path)
+
+    payloads = {point_id: payload for point_id, _, payload in Snapshot(path).iter_points()}
+    assert payloads[1]["answer"] == "We are SOC 2 certified."
+    assert payloads[1]["source"] == "old.docx"
+    assert payloads[2]["answer"] == "The firm was founded in 1999 in London."
+    assert payloads[2]["source"] == "Unknown"
+    assert [payloads[i]["kind"] for i in (1, 2, 3)] == ["answer", "answer", "question"]
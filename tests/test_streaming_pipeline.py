@@ -0,0 +1,108 @@
+import threading
+
+import pytest
+from docx import Document
+
+import run_pipeline
+from core.search import SearchError
+
+
+def test_first_answers_stream_before_later_chunks_finish(monkeypatch):
+    release = threading.Event()
+
+    def fake_embeddings(texts):
+        # Every chunk but the first waits until the test has seen a result
+        if texts[0] != "Question 0?":
+            assert release.wait(timeout=5)
+        return [[1.0, 0.0] for _ in texts]
+
+    monkeypatch.setattr(run_pipeline, "STREAM_FIRST_CHUNK_SIZE", 2)
+    monkeypatch.setattr(run_pipeline, "get_embeddings", fake_embeddings)
+    monkeypatch.setattr(run_pipeline, "search_qdrant_batch", lambda vectors: [[] for _ in vectors])
+    monkeypatch.setattr(run_pipeline, "get_draft_cache", lambda: None)
+    monkeypatch.setattr(run_pipeline, "get_question_index", lambda: None)
+
+    questions = [f"Question {n}?" for n in range(20)]
+    stream = run_pipeline.iter_resolved_questions(questions, workers=4)
+
+    first = next(stream)
+    assert first["question"] == "Question 0?"
+    release.set()
+
+    rest = list(stream)
+    assert [r["question"] for r in [first] + rest] == questions
+
+
+def test_chunks_grow_to_embedding_batch_size(monkeypatch):
+    monkeypatch.setattr(run_pipeline, "STREAM_FIRST_CHUNK_SIZE", 8)
+    monkeypatch.setattr(run_pipeline, "EMBEDDING_BATCH_SIZE", 32)
+    sizes = [end - start for start, end in run_pipeline._stream_chunks(100)]
+    assert sizes == [8, 16, 32, 32, 12]
+
+
+def test_cancelled_run_writes_no_output(tmp_path, monkeypatch):
+    rfp = tmp_path / "rfp.docx"
+    doc = Document()
+    doc.add_paragraph("What is your business continuity plan?")
+    doc.save(rfp)
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(run_pipeline, "get_embeddings", lambda texts: [[1.0, 0.0] for _ in texts])
+    monkeypatch.setattr(run_pipeline, "search_qdrant_batch", lambda vectors: [[] for _ in vectors])
+    monkeypatch.setattr(run_pipeline, "get_embedding_cache", lambda: None)
+    monkeypatch.setattr(run_pipeline, "get_draft_cache", lambda: None)
+    monkeypatch.setattr(run_pipeline, "get_question_index", lambda: None)
+
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(run_pipeline.PipelineCancelled):
+        run_pipeline.run_pipeline(str(rfp), output_dir=str(tmp_path / "out"), cancel_event=cancel)
+    assert not (tmp_path / "out" / "generated_rfp_draft.docx").exists()
+
+
+def test_failed_searches_are_reported_in_results_and_summary(tmp_path, monkeypatch):
+    rfp = tmp_path / "rfp.docx"
+    doc = Document()
+    doc.add_paragraph("What is your business continuity plan?")
+    doc.save(rfp)
+
+    def failing_search(vectors):
+        raise SearchError("Collection 'answers' not found in Qdrant.")
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(run_pipeline, "get_embeddings", lambda texts: [[1.0, 0.0] for _ in texts])
+    monkeypatch.setattr(run_pipeline, "search_qdrant_batch", failing_search)
+    monkeypatch.setattr(run_pipeline, "get_embedding_cache", lambda: None)
+    monkeypatch.setattr(run_pipeline, "get_draft_cache", lambda: None)
+    monkeypatch.setattr(run_pipeline, "get_question_index", lambda: None)
+    monkeypatch.setattr(run_pipeline, "log_result", lambda entry: None)
+    monkeypatch.setattr(run_pipeline, "log_run_summary", lambda summary: None)
+
+    results = []
+    summary = run_pipeline.run_pipeline(str(rfp), output_dir=str(tmp_path / "out"),
+                                        progress_callback=lambda done, total, result: results.append(result))
+
+    assert results[0]["needs_review"]
+    assert "not found in Qdrant" in results[0]["draft"]
+    assert summary["search_errors"] == ["Collection 'answers' not found in Qdrant."]
+
+
+def test_embedding_failures_send_a_chunk_to_review_without_stopping_the_run(monkeypatch):
+    def fake_embeddings(texts):
+        if "Question 2?" in texts:
+            raise RuntimeError("OpenAI client is not available.")
+        return [[1.0, 0.0] for _ in texts]
+
+    monkeypatch.setattr(run_pipeline, "STREAM_FIRST_CHUNK_SIZE", 2)
+    monkeypatch.setattr(run_pipeline, "get_embeddings", fake_embeddings)
+    monkeypatch.setattr(run_pipeline, "search_qdrant_batch", lambda vectors: [[] for _ in vectors])
+    monkeypatch.setattr(run_pipeline, "get_draft_cache", lambda: None)
+    monkeypatch.setattr(run_pipeline, "get_question_index", lambda: None)
+
+    questions = [f"Question {n}?" for n in range(6)]
+    results = run_pipeline.resolve_questions(questions, workers=2)
+
+    assert [r["question"] for r in results] == questions
+    failed = [r for r in results if "OpenAI client is not available." in r["draft"]]
+    assert [r["question"] for r in failed] == ["Question 2?", "Question 3?", "Question 4?", "Question 5?"]
+    assert all(r["needs_review"] for r in failed)
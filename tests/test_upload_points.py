@@ -0,0 +1,64 @@
+import threading
+
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, PointStruct, VectorParams
+
+from core.embed import upload_points
+
+
+class FlakyClient:
+    """Fails the first `failures` upserts, recording every batch and the peak number in flight."""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.batches = []
+        self.running = 0
+        self.max_running = 0
+        self.lock = threading.Lock()
+
+    def upsert(self, collection_name, points, wait):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            with self.lock:
+                if self.failures:
+                    self.failures -= 1
+                    raise ConnectionError("connection reset")
+                self.batches.append([point.id for point in points])
+        finally:
+            with self.lock:
+                self.running -= 1
+
+
+def make_points(count):
+    for i in range(count):
+        yield PointStruct(id=i, vector=[1.0, float(i)], payload={"answer": str(i)})
+
+
+def test_points_stream_in_bounded_batches():
+    client = QdrantClient(":memory:")
+    client.create_collection("answers", vectors_config=VectorParams(size=2, distance=Distance.COSINE))
+
+    assert upload_points(client, "answers", make_points(25), batch_size=4, parallel=3) == list(range(25))
+    assert client.count("answers").count == 25
+    assert upload_points(client, "answers", []) == []
+
+
+def test_failed_batches_are_retried_with_backoff(monkeypatch):
+    delays = []
+    monkeypatch.setattr("core.embed.time.sleep", delays.append)
+    client = FlakyClient(failures=2)
+
+    assert upload_points(client, "answers", make_points(9), batch_size=4, parallel=2, retry_delay=0.5) == list(range(9))
+    assert sorted(id for batch in client.batches for id in batch) == list(range(9))
+    assert all(len(batch) <= 4 for batch in client.batches)
+    assert client.max_running <= 2
+    assert delays in ([0.5, 1.0], [0.5, 0.5])  # One batch failing twice, or two batches once each
+
+
+def test_batch_failing_every_attempt_raises(monkeypatch):
+    monkeypatch.setattr("core.embed.time.sleep", lambda seconds: None)
+    with pytest.raises(ConnectionError):
+        upload_points(FlakyClient(failures=3), "answers", make_points(3), max_retries=3)
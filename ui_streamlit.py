@@ -3,11 +3,16 @@
 
 import streamlit as st
 from tempfile import NamedTemporaryFile
-from run_pipeline import run_pipeline
-from core.embed import embed_final_rfp, ensure_correct_collection
+from run_pipeline import build_draft_document
+from core.collection_versions import alias_target, list_versions
+from core.embed import embed_final_rfp, embed_rfp_archive, rebuild_archive
 from core.search import get_qdrant_client
+from core.config import PIPELINE_WORKERS, get_settings
+from core.local_index import build_local_index_from_qdrant
+from core.jobs import get_job_manager, FINISHED, QUEUED, RUNNING, SUCCEEDED, CANCELLED
 import os
 import shutil
+from io import BytesIO
 from pathlib import Path
 
 # Page Configuration
@@ -30,6 +35,101 @@ os.makedirs(PAST_RFPS_DIR, exist_ok=True)
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 os.makedirs("logs", exist_ok=True)
 
+def format_duration(seconds):
+    """Format a duration as '42s' or '3m 05s'."""
+    seconds = int(round(seconds))
+    return f"{seconds // 60}m {seconds % 60:02d}s" if seconds >= 60 else f"{seconds}s"
+
+
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+def partial_draft_bytes(job_id):
+    """Build a Word document from the answers a job has drafted so far."""
+    buffer = BytesIO()
+    build_draft_document(get_job_manager().results(job_id), "RFP Draft Responses (partial)").save(buffer)
+    return buffer.getvalue()
+
+
+def render_job_body(job):
+    """Show a job's status, answers so far and downloads."""
+    job_id = job["id"]
+    manager = get_job_manager()
+    results = manager.results(job_id)
+
+    st.markdown(f"**{job['input_name']}** · job `{job_id}` · {job['status']}")
+
+    if job["status"] == QUEUED:
+        st.progress(0.0, text="Waiting for a free worker...")
+    elif job["status"] == RUNNING:
+        if job["total"]:
+            eta = f" · about {format_duration(job['eta_seconds'])} remaining" if job["eta_seconds"] else ""
+            st.progress(job["done"] / job["total"], text=f"Drafted {job['done']}/{job['total']} questions{eta}")
+        else:
+            st.progress(0.0, text="Extracting questions...")
+
+    if job["status"] not in FINISHED:
+        cancel_col, partial_col = st.columns(2)
+        if cancel_col.button("✖ Cancel", key=f"cancel_{job_id}"):
+            manager.cancel(job_id)
+        if results:
+            partial_col.download_button(
+                f"⬇️ Download Partial Draft ({len(results)} answers)",
+                lambda: partial_draft_bytes(job_id),
+                file_name="partial_rfp_draft.docx",
+                mime=DOCX_MIME,
+                on_click="ignore",
+                key=f"partial_{job_id}"
+            )
+    elif job["status"] == SUCCEEDED:
+        summary = job["summary"]
+        st.success(f"✅ Drafted {summary['questions']} questions in {format_duration(summary['total_ms'] / 1000)}")
+        for error in summary.get("search_errors", []):
+            st.error(f"❌ Some questions could not be searched: {error}")
+        with open(summary["full_draft"], "rb") as f:
+            st.download_button("⬇️ Download Full Draft", f, file_name="generated_rfp_draft.docx",
+                               mime=DOCX_MIME, key=f"full_{job_id}")
+        if summary["review_draft"]:
+            with open(summary["review_draft"], "rb") as f:
+                st.download_button("⚠️ Download Low-Confidence Draft (Needs Review)", f,
+                                   file_name="low_confidence_rfp_draft.docx", mime=DOCX_MIME,
+                                   key=f"review_{job_id}")
+    elif job["status"] == CANCELLED:
+        st.warning("Cancelled. No draft documents were written.")
+    else:
+        st.error(f"❌ An error occurred during processing: {job['error']}")
+        st.info("Please check that your Qdrant database is properly configured.")
+
+    if results:
+        flagged = sum(1 for r in results if r["needs_review"])
+        with st.expander(f"Answers so far: {len(results)} ({flagged} need review)"):
+            for i, result in enumerate(results, 1):
+                flag = "⚠️" if result["needs_review"] else "✅"
+                st.markdown(f"{flag} **Q{i}: {result['question']}**")
+                st.text(result["draft"])
+
+
+@st.fragment(run_every=2)
+def poll_job(job_id):
+    """Re-render an unfinished job every two seconds until it finishes."""
+    job = get_job_manager().status(job_id)
+    if job["status"] in FINISHED:
+        # Hand over to the static rendering so finished jobs stop polling
+        st.rerun()
+    render_job_body(job)
+
+
+def render_job(job_id):
+    job = get_job_manager().status(job_id)
+    with st.container(border=True):
+        if job is None:
+            st.info(f"Job `{job_id}` is no longer available.")
+        elif job["status"] in FINISHED:
+            render_job_body(job)
+        else:
+            poll_job(job_id)
+
+
 # Main Title
 st.title("📄 RFP Draft Assistant")
 st.markdown("---")
@@ -54,44 +154,30 @@ if page == "Process New RFP":
     )
 
     if uploaded_file:
-        with NamedTemporaryFile(delete=False, suffix=".docx") as tmp:
-            tmp.write(uploaded_file.getbuffer())
-            tmp_path = tmp.name
+        workers = st.slider(
+            "Parallel workers",
+            min_value=1,
+            max_value=16,
+            value=PIPELINE_WORKERS,
+            help="Number of question batches embedded and searched at the same time."
+        )
 
         if st.button("Generate Draft Responses", type="primary"):
-            with st.spinner("Analyzing document and searching database... This may take a few minutes."):
-                try:
-                    run_pipeline(tmp_path)
-                    st.success("✅ Draft Generation Complete!")
-
-                    # Provide download links
-                    full_draft_path = os.path.join(OUTPUT_DIR, "generated_rfp_draft.docx")
-                    if os.path.exists(full_draft_path):
-                        with open(full_draft_path, "rb") as f:
-                            st.download_button(
-                                "⬇️ Download Full Draft",
-                                f,
-                                file_name="generated_rfp_draft.docx",
-                                mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-                            )
-
-                    review_draft_path = os.path.join(OUTPUT_DIR, "low_confidence_rfp_draft.docx")
-                    if os.path.exists(review_draft_path):
-                        with open(review_draft_path, "rb") as f:
-                            st.download_button(
-                                "⚠️ Download Low-Confidence Draft (Needs Review)",
-                                f,
-                                file_name="low_confidence_rfp_draft.docx",
-                                mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-                            )
-                            
-                except Exception as e:
-                    st.error(f"❌ An error occurred during processing: {str(e)}")
-                    st.info("Please check that your Qdrant database is properly configured.")
-                finally:
-                    # Clean up temporary file
-                    if os.path.exists(tmp_path):
-                        os.unlink(tmp_path)
+            with NamedTemporaryFile(delete=False, suffix=".docx") as tmp:
+                tmp.write(uploaded_file.getbuffer())
+                tmp_path = tmp.name
+            try:
+                job_id = get_job_manager().submit(tmp_path, input_name=uploaded_file.name, workers=workers)
+                st.session_state.setdefault("job_ids", []).insert(0, job_id)
+            except Exception as e:
+                st.error(f"❌ Could not start processing: {str(e)}")
+            finally:
+                # The job works on its own copy of the file
+                os.unlink(tmp_path)
+
+    # Jobs submitted from this browser session, newest first
+    for job_id in st.session_state.get("job_ids", []):
+        render_job(job_id)
 
 # ============================================================================
 # PAGE 2: Archive Finalized RFP
@@ -105,7 +191,8 @@ elif page == "Archive Finalized RFP":
     
     st.info(
         "📋 **Document Format**: Ensure your document has questions ending with '?' "
-        "followed immediately by their answers in the next paragraph."
+        "followed immediately by their answers in the next paragraph, or in the "
+        "next cell of the same table row."
     )
     
     final_uploaded_file = st.file_uploader(
@@ -122,8 +209,8 @@ elif page == "Archive Finalized RFP":
         if st.button("Add to Knowledge Base", type="primary"):
             with st.spinner("Extracting Q&A pairs and adding to database..."):
                 try:
-                    # Embed and upload to Qdrant
-                    embed_final_rfp(final_tmp_path)
+                    # Embed and upload to Qdrant under the uploaded name, matching the past_rfps/ copy
+                    embed_final_rfp(final_tmp_path, source_name=final_uploaded_file.name)
                     st.success("🧠 Final RFP added to the Qdrant knowledge base successfully!")
 
                     # Save a copy to the local archive folder
@@ -181,18 +268,28 @@ elif page == "Database Management":
         st.success("✅ Connected to Qdrant database")
         
         try:
-            collections = client.get_collections()
-            collection_name = st.secrets.get("COLLECTION_NAME", "past_rfp_answers")
-            
-            collection_exists = any(c.name == collection_name for c in collections.collections)
+            collection_name = get_settings().collection_name
+
+            # The configured name is an alias for the live collection version
+            live = alias_target(client, collection_name)
+            collection_exists = live is not None or client.collection_exists(collection_name)
             
             if collection_exists:
                 st.info(f"📊 Collection '{collection_name}' exists")
+                if live is not None:
+                    st.write(f"**Live version:** {live}")
+                    older = [name for name in list_versions(client, collection_name) if name != live]
+                    st.write(f"**Versions kept for rollback:** {', '.join(older) or 'none'}")
                 
                 # Get collection info
                 collection_info = client.get_collection(collection_name)
                 st.write(f"**Points in database:** {collection_info.points_count}")
-                st.write(f"**Vector dimensions:** {collection_info.config.params.vectors.size}")
+                vectors = collection_info.config.params.vectors
+                if isinstance(vectors, dict):  # Named full and compact vectors (SEARCH_COMPACT_DIMENSIONS)
+                    sizes = ", ".join(f"{name} {params.size}" for name, params in vectors.items())
+                    st.write(f"**Vector dimensions:** {sizes}")
+                else:
+                    st.write(f"**Vector dimensions:** {vectors.size}")
             else:
                 st.warning(f"⚠️ Collection '{collection_name}' does not exist")
                 
@@ -203,17 +300,32 @@ elif page == "Database Management":
         st.write("Please check your Streamlit secrets configuration.")
     
     st.markdown("---")
+
+    # Local Index Section
+    st.subheader("💻 Local Search Index")
+    st.write(
+        f"Active search backend: **{get_settings().search_backend}**. The local backend answers searches "
+        "in-process from a copy of the Qdrant collection, so drafting works offline. "
+        "Refresh it after archiving or rebuilding."
+    )
+
+    if st.button("Refresh Local Index", disabled=client is None):
+        with st.spinner("Copying vectors from Qdrant..."):
+            try:
+                count = build_local_index_from_qdrant(
+                    client, get_settings().collection_name
+                )
+                st.success(f"✅ Local index refreshed with {count} points.")
+            except Exception as e:
+                st.error(f"❌ Could not build local index: {str(e)}")
+
+    st.markdown("---")
     
     # Database Rebuild Section
     st.subheader("🔄 Rebuild Database")
     st.write(
-        "This will delete all existing data and re-embed all documents from your archive "
-        "with proper Q&A extraction. Use this to clean up your database."
-    )
-    
-    st.warning(
-        "⚠️ **Warning**: This action will delete all existing vectors in your database. "
-        "Make sure you have all important documents saved in the 'past_rfps/' folder."
+        "Sync the database with every document in your archive using proper Q&A extraction. "
+        "Only new or changed Q&A pairs are embedded, and pairs that no longer exist are removed."
     )
     
     # Count available documents
@@ -223,42 +335,54 @@ elif page == "Database Management":
     if rfp_count == 0:
         st.warning("No documents to process. Upload some finalized RFPs first.")
     else:
-        # Confirmation checkbox
-        confirm = st.checkbox(
-            "I understand this will delete all existing database content and rebuild it",
-            key="rebuild_confirm"
+        full_rebuild = st.checkbox(
+            "Full rebuild: re-embed everything into a new collection",
+            key="full_rebuild"
         )
+
+        if full_rebuild:
+            st.info(
+                "ℹ️ A full rebuild loads a new copy of the database while the current one keeps "
+                "answering searches, and switches over only once the new copy is complete. "
+                "Previous copies are kept so the switch can be rolled back "
+                "(`python -m scripts.rebuild_qdrant_db --rollback`)."
+            )
         
-        if st.button("Rebuild Database", type="primary", disabled=not confirm):
+        if st.button("Rebuild Database", type="primary"):
             with st.spinner("Rebuilding database... This may take several minutes."):
                 try:
-                    # Step 1: Recreate collection
-                    st.write("🔄 Step 1: Recreating collection...")
-                    ensure_correct_collection()
-                    st.success("✅ Collection recreated")
-                    
-                    # Step 2: Process all documents
-                    st.write(f"🔄 Step 2: Processing {rfp_count} document(s)...")
+                    st.write(f"🔄 Processing {rfp_count} document(s)...")
                     
                     progress_bar = st.progress(0)
                     status_text = st.empty()
                     
                     doc_paths = sorted(Path(PAST_RFPS_DIR).glob("*.docx"))
-                    success_count = 0
-                    error_count = 0
-                    
-                    for idx, doc_path in enumerate(doc_paths, 1):
-                        status_text.write(f"Processing {idx}/{rfp_count}: {doc_path.name}")
-                        
-                        try:
-                            embed_final_rfp(str(doc_path))
-                            success_count += 1
-                            st.write(f"✅ Processed: {doc_path.name}")
-                        except Exception as e:
-                            error_count += 1
-                            st.error(f"❌ Failed: {doc_path.name} - {str(e)}")
-                        
-                        progress_bar.progress(idx / rfp_count)
+                    status_text.write(f"Processing {rfp_count} document(s)...")
+
+                    def on_document(done, total, doc_path, result):
+                        name = Path(doc_path).name
+                        if isinstance(result, Exception):
+                            st.error(f"❌ Failed: {name} - {str(result)}")
+                        else:
+                            st.write(f"✅ Processed: {name} ({result} new Q&A pairs)")
+                        status_text.write(f"Processed {done}/{total}: {name}")
+                        progress_bar.progress(done / total)
+
+                    if full_rebuild:
+                        # Searches keep using the current collection until the new one is verified
+                        results = rebuild_archive(
+                            [str(p) for p in doc_paths],
+                            progress_callback=on_document
+                        )
+                    else:
+                        # New answers from all documents are embedded in shared batches
+                        results = embed_rfp_archive(
+                            [str(p) for p in doc_paths],
+                            progress_callback=on_document,
+                            remove_missing=True
+                        )
+                    error_count = sum(1 for r in results.values() if isinstance(r, Exception))
+                    success_count = len(results) - error_count
                     
                     status_text.write("✅ Database rebuild complete!")
                     